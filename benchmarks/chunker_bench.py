@@ -0,0 +1,132 @@
+"""
+Inspiration Bot - Message Chunker Benchmark
+Compares message_chunker.split_message with the previous concatenating splitter
+
+Usage:
+    python benchmarks/chunker_bench.py [--sizes 10000,100000,1000000] [--runs 3] [--output chunker.json]
+
+Inputs are synthetic idea-style Markdown texts (Korean + emoji, bold/italic,
+code blocks, separator lines). For each size the report shows the median
+wall time of both splitters and how many chunks would break Telegram limits:
+chunks over 4096 UTF-16 units and chunks with unbalanced Markdown markers.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from message_chunker import MAX_MESSAGE_UTF16, split_message, utf16_len  # noqa: E402
+
+SEPARATOR = "━━━━━━━━━━━━━━━"
+WORDS = ["아이디어", "프로젝트", "자동화", "idea", "prototype", "🚀", "💡", "데이터", "pipeline"]
+
+
+def make_text(size: int, seed: int = 7) -> str:
+    """size 글자 이상의 아이디어 형식 Markdown 텍스트"""
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < size:
+        roll = rng.random()
+        if roll < 0.08:
+            part = f"\n\n{SEPARATOR}\n"
+        elif roll < 0.25:
+            part = f"*{' '.join(rng.choices(WORDS, k=rng.randint(1, 6)))}* "
+        elif roll < 0.32:
+            part = f"_{' '.join(rng.choices(WORDS, k=rng.randint(1, 4)))}_ "
+        elif roll < 0.35:
+            part = "```\n" + "".join(f"step_{i} = run({i})\n" for i in range(rng.randint(5, 300))) + "```\n"
+        elif roll < 0.5:
+            part = "\n"
+        else:
+            part = " ".join(rng.choices(WORDS, k=rng.randint(3, 30))) + " "
+        parts.append(part)
+        length += len(part)
+    return "".join(parts)
+
+
+def legacy_split(message: str) -> list:
+    """이전 _send_long_message의 청크 구성 (발송 없이 청크만)"""
+    parts = message.split(SEPARATOR)
+    if len(parts) <= 1:
+        parts = [message[i:i + 4096] for i in range(0, len(message), 4096)]
+
+    chunks = []
+    current_chunk = ""
+    for i, part in enumerate(parts):
+        separator = f"{SEPARATOR}\n" if i > 0 else ""
+        candidate = current_chunk + separator + part
+        if len(candidate) > 4096:
+            if current_chunk.strip():
+                chunks.append(current_chunk.strip())
+            current_chunk = separator + part
+        else:
+            current_chunk = candidate
+    if current_chunk.strip():
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def _visible(chunk: str) -> str:
+    return chunk.replace("```", "").replace("*", "").replace("_", "")
+
+
+def _unbalanced(chunk: str) -> bool:
+    fences = chunk.count("```")
+    if fences % 2:
+        return True
+    outside = "".join(chunk.split("```")[::2])
+    return outside.count("*") % 2 == 1 or outside.count("_") % 2 == 1
+
+
+def _audit(chunks: list) -> dict:
+    return {
+        "chunks": len(chunks),
+        "max_utf16": max((utf16_len(_visible(c)) for c in chunks), default=0),
+        "over_limit": sum(1 for c in chunks if utf16_len(_visible(c)) > MAX_MESSAGE_UTF16),
+        "unbalanced": sum(1 for c in chunks if _unbalanced(c)),
+    }
+
+
+def _time(func, text: str, runs: int) -> float:
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        func(text)
+        samples.append(time.perf_counter() - started)
+    return round(statistics.median(samples) * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspiration Bot message chunker benchmark")
+    parser.add_argument("--sizes", type=str, default="10000,100000,1000000")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "results": []}
+    for size in (int(s) for s in args.sizes.split(",")):
+        text = make_text(size)
+        report["results"].append({
+            "chars": len(text),
+            "utf16": utf16_len(text),
+            "split_message_ms": _time(lambda t: split_message(t, "Markdown"), text, args.runs),
+            "legacy_ms": _time(legacy_split, text, args.runs),
+            "split_message": _audit(split_message(text, "Markdown")),
+            "legacy": _audit(legacy_split(text)),
+        })
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,517 @@
+"""
+Inspiration Bot - Offline End-to-End Benchmark
+Runs InspirationBot.send_daily_inspiration against fake Gemini/Telegram backends
+
+Usage:
+    python benchmarks/e2e_bench.py [--sizes 1000,10000,100000]
+        [--scenarios clean,rejections,parse_failures,long_message] [--runs 3]
+        [--gemini-latency 0.05] [--telegram-latency 0.01] [--seed 7]
+        [--output e2e.json] [--baseline previous.json]
+
+Nothing leaves the machine: genai.Client and telegram.Bot are replaced with
+stand-ins that sleep a configurable (seeded) latency and answer from a fixed
+script per scenario.
+
+- clean: every candidate passes on the first try
+- rejections: candidates are rejected in turn by the exact, title, semantic
+  and search stages before one passes (batch refill also gets a search reject)
+- parse_failures: invalid JSON, schema mismatches and unparsable search
+  verdicts before valid responses
+- long_message: a valid idea big enough to be split into several messages
+
+Every run starts from a fresh copy of the bot modules in a temporary
+directory (all data files live next to the modules), seeded with a synthetic
+idea_summaries.txt of the requested size, and runs in its own subprocess.
+The report has median wall times for the send (until the last Telegram
+message is delivered) and the background buffer refill, the local dedup cost
+on a cold and warm index, Gemini call/attempt/rejection counts, and a
+separate tracemalloc run for peak memory and top allocation sites.
+Counts are deterministic for a given seed; compare timings across commits
+with --baseline.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+
+from korean_summaries import UNRELATED, UNRELATED_TITLES, make_summary, make_title
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = ["clean", "rejections", "parse_failures", "long_message"]
+REJECTION_REASONS = [
+    "timeout", "schema", "title_extraction", "exact_duplicate", "title_similarity",
+    "semantic_similarity", "screen_verdict", "search_verdict", "batch_missing", "batch_duplicate",
+]
+
+# 후보 요약은 손으로 쓴 실제 아이디어 문장, 기존 코퍼스는 겹치지 않는 주제의 합성 문장
+# (같은 상투 표현 때문에 다른 아이디어가 의미 유사도에 걸리면 탈락 수에 그대로 드러남)
+# 단건 생성과 배치 생성은 서로 다른 후보 풀을 사용
+SINGLE_POOL = 24
+SEGMENT_KEY = re.compile(r'- "((?:software|mixed)-\d+)"')
+
+
+# ---------------------------------------------------------------------------
+# 합성 코퍼스 / 작업 디렉터리
+# ---------------------------------------------------------------------------
+
+def candidate(index: int) -> tuple:
+    """index번째 후보의 (제목, 요약): 단건 생성(index < 100)과 배치(100 이상)는 풀이 다름"""
+    if index < 100:
+        pick = (index - 1) % SINGLE_POOL
+    else:
+        pick = SINGLE_POOL + (index - 100) % (len(UNRELATED) - SINGLE_POOL)
+    return UNRELATED_TITLES[pick], UNRELATED[pick]
+
+
+def make_corpus(size: int, seed: int) -> list:
+    """(type, title, summary) size개 (제목은 모두 다름)"""
+    rng = random.Random(seed)
+    entries = []
+    for i in range(size):
+        title = f"{make_title(rng)} {i}"
+        entries.append((rng.choice(["software", "mixed"]), title, make_summary(rng)))
+    return entries
+
+
+def make_workspace(corpus: list) -> Path:
+    """봇 모듈 복사본 + 요약 코퍼스가 있는 임시 디렉터리"""
+    workspace = Path(tempfile.mkdtemp(prefix="inspiration_e2e_"))
+    for path in ROOT.glob("*.py"):
+        shutil.copy2(path, workspace / path.name)
+    lines = [
+        "# Inspiration Bot Idea Summaries\n",
+        "# format: YYYY-MM-DD | type | title | summary\n",
+    ]
+    lines.extend(f"2024-01-01 | {t} | {title} | {summary}\n" for t, title, summary in corpus)
+    (workspace / "idea_summaries.txt").write_text("".join(lines), encoding="utf-8")
+    return workspace
+
+
+# ---------------------------------------------------------------------------
+# Fake backends (워커 프로세스 안에서 사용)
+# ---------------------------------------------------------------------------
+
+class FakeGemini:
+    """
+    시나리오 대본대로 응답하는 genai.Client 대역 (client.aio.models.generate_content)
+
+    호출 종류는 config로 구분: tools -> 검색 검증, list 스키마 -> 배치, 그 외 -> 단건 생성
+    """
+
+    def __init__(self, scenario: str, corpus: list, latency: float, seed: int):
+        self.scenario = scenario
+        self.corpus = corpus
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.counts = {"generate": 0, "batch": 0, "validate": 0, "screen": 0}
+        self.search_rejects = set()
+        self.aio = SimpleNamespace(models=self)
+        self.models = SimpleNamespace(list=lambda: [])
+
+    def _draft(self, index: int, title: str = "", summary: str = "", size: int = 1) -> dict:
+        name, text = candidate(index)
+        return {
+            "title": title or name,
+            "summary": summary or text,
+            "problem": f"**{name}** 없이 사용자가 겪는 불편 {index}. " * size,
+            "solution": f"_{text}_ 방식으로 해결 {index}. " * size,
+            "features": [f"기능 {n}: `{name}` {n}단계 처리" for n in range(1, 3 + size)],
+            "tech_stack": ["FastAPI - 백엔드", "React - 프론트엔드"],
+            "outcome": "주말 2일",
+        }
+
+    def _generate(self, n: int) -> str:
+        """n번째 단건 생성 응답 (1부터)"""
+        step = (n - 1) % 4
+        if self.scenario == "rejections" and step < 3:
+            entry = self.corpus[-1 - step]
+            if step == 0:
+                draft = self._draft(n, title=entry[1])            # exact
+            elif step == 1:
+                draft = self._draft(n, title=entry[1] + "0")      # title
+            else:
+                draft = self._draft(n, summary=entry[2])          # semantic
+            return json.dumps(draft, ensure_ascii=False)
+        if self.scenario == "parse_failures" and step < 2:
+            return "{not json" if step == 0 else json.dumps({"title": f"schema miss {n}"})
+        size = 120 if self.scenario == "long_message" else 1
+        return json.dumps(self._draft(n, size=size), ensure_ascii=False)
+
+    def _batch(self, contents: str) -> str:
+        if self.scenario == "parse_failures":
+            return "[{\"segment\": "
+        items = []
+        for offset, key in enumerate(SEGMENT_KEY.findall(contents)):
+            draft = self._draft(100 + self.counts["batch"] * 10 + offset)
+            if self.scenario == "rejections" and offset == 0:
+                self.search_rejects.add(draft["title"])
+            items.append({"segment": key, "idea": draft})
+        return json.dumps(items, ensure_ascii=False)
+
+    def _validate(self, contents: str) -> str:
+        if self.scenario == "parse_failures" and self.counts["validate"] % 2 == 1:
+            return "검색 결과를 정리하지 못했습니다."
+        rejected = any(title in contents for title in self.search_rejects)
+        return json.dumps(
+            {"is_novel": not rejected, "reason": "기존 서비스와 같음" if rejected else "새로움", "similar_examples": []},
+            ensure_ascii=False,
+        )
+
+    async def generate_content(self, model, contents, config):
+        await asyncio.sleep(self.latency * self.rng.uniform(0.8, 1.2))
+        schema = getattr(config, "response_schema", None)
+        if getattr(config, "tools", None):
+            self.counts["validate"] += 1
+            text = self._validate(contents)
+        elif schema is not None and getattr(schema, "__origin__", None) is list:
+            self.counts["batch"] += 1
+            text = self._batch(contents)
+        elif schema is not None and schema.__name__ == "NoveltyVerdict":
+            self.counts["screen"] += 1
+            text = json.dumps({"is_novel": True, "reason": "ok"})
+        else:
+            self.counts["generate"] += 1
+            text = self._generate(self.counts["generate"])
+        usage = SimpleNamespace(
+            prompt_token_count=len(contents) // 3,
+            candidates_token_count=len(text) // 3,
+            total_token_count=(len(contents) + len(text)) // 3,
+        )
+        return SimpleNamespace(text=text, parsed=None, usage_metadata=usage)
+
+
+class FakeBot:
+    """telegram.Bot 대역 (initialize / send_message / shutdown)"""
+
+    def __init__(self, latency: float, seed: int):
+        self.latency = latency
+        self.rng = random.Random(seed)
+        self.sent = []
+        self.last_sent_at = None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    async def send_message(self, chat_id, text, parse_mode=None, **kwargs):
+        await asyncio.sleep(self.latency * self.rng.uniform(0.8, 1.2))
+        self.sent.append(len(text))
+        self.last_sent_at = time.perf_counter()
+        return SimpleNamespace(message_id=len(self.sent))
+
+
+# ---------------------------------------------------------------------------
+# 워커: 작업 디렉터리 안에서 시나리오 1회 실행
+# ---------------------------------------------------------------------------
+
+def _counter(name: str, labels: dict = None) -> float:
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def _top_allocations(snapshot, workspace: str, limit: int = 5) -> list:
+    top = []
+    for stat in snapshot.statistics("lineno")[:limit]:
+        frame = stat.traceback[0]
+        filename = frame.filename.replace(workspace + os.sep, "")
+        top.append({"site": f"{filename}:{frame.lineno}", "kib": round(stat.size / 1024, 1), "count": stat.count})
+    return top
+
+
+async def _measure_dedup(probes: int) -> dict:
+    """새 IdeaGenerator로 첫 동기화/첫 로컬 검사(콜드)와 이후 로컬 검사(웜) 시간"""
+    from idea_generator import IdeaGenerator
+
+    generator = IdeaGenerator()
+    started = time.perf_counter()
+    await generator._sync_title_index()
+    sync_ms = (time.perf_counter() - started) * 1000
+
+    samples = []
+    for i in range(probes + 1):
+        title, summary = UNRELATED_TITLES[i % len(UNRELATED)], UNRELATED[i % len(UNRELATED)]
+        started = time.perf_counter()
+        await generator._check_locally({"title": title, "summary": summary}, [], "bench")
+        samples.append((time.perf_counter() - started) * 1000)
+    return {
+        "sync_ms": round(sync_ms, 2),
+        "first_check_ms": round(samples[0], 2),
+        "check_ms": round(statistics.median(samples[1:]), 3),
+    }
+
+
+async def run_worker(args) -> dict:
+    import idea_generator
+    import main as bot_main
+    import telegram_notifier
+
+    corpus = []
+    with open("idea_summaries.txt", encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("#"):
+                _, kind, title, summary = [p.strip() for p in line.split("|", 3)]
+                corpus.append((kind, title, summary))
+
+    gemini = FakeGemini(args.scenario, corpus, args.gemini_latency, args.seed)
+    fake_bot = FakeBot(args.telegram_latency, args.seed + 1)
+    idea_generator.genai.Client = lambda api_key=None, **kwargs: gemini
+    telegram_notifier.Bot = lambda token=None, request=None, **kwargs: fake_bot
+
+    bot = bot_main.InspirationBot()
+    await bot.notifier.start()
+    keys = []
+    enqueue_idea = bot.notifier.enqueue_idea
+
+    async def capture(idea, event_id=None):
+        keys.extend(await enqueue_idea(idea, event_id))
+        return keys
+
+    bot.notifier.enqueue_idea = capture
+
+    # 재충전은 발송 직후 백그라운드로 시작되므로 자체 소요 시간을 기록
+    refill_ms = []
+    refill_buffer = bot.refill_buffer
+
+    async def timed_refill():
+        refill_started = time.perf_counter()
+        await refill_buffer()
+        refill_ms.append((time.perf_counter() - refill_started) * 1000)
+
+    bot.refill_buffer = timed_refill
+
+    if args.trace:
+        tracemalloc.start()
+    attempts_before = _counter("inspiration_candidate_attempts_total")
+    rejections_before = {r: _counter("inspiration_candidate_rejections_total", {"reason": r}) for r in REJECTION_REASONS}
+
+    started = time.perf_counter()
+    await bot.send_daily_inspiration()
+    delivered = await bot.notifier.wait_delivered(keys, timeout=120)
+    send_ms = ((fake_bot.last_sent_at or time.perf_counter()) - started) * 1000
+    send_messages = len(fake_bot.sent)
+    # 발송 구간 최대 메모리 (백그라운드 재충전과 겹치는 부분 포함)
+    send_peak = tracemalloc.get_traced_memory()[1] if args.trace else 0
+
+    if args.trace:
+        tracemalloc.reset_peak()
+    if bot._refill_task is not None:
+        await bot._refill_task
+
+    result = {
+        "delivered": delivered,
+        "send_ms": round(send_ms, 2),
+        "refill_ms": round(sum(refill_ms), 2),
+        "gemini_calls": dict(gemini.counts),
+        "attempts": int(_counter("inspiration_candidate_attempts_total") - attempts_before),
+        "rejections": {
+            r: int(_counter("inspiration_candidate_rejections_total", {"reason": r}) - before)
+            for r, before in rejections_before.items()
+            if _counter("inspiration_candidate_rejections_total", {"reason": r}) > before
+        },
+        "buffered": bot.buffer.count(bot.generator.history.get_next_type()),
+        "telegram_messages": send_messages,
+        "telegram_chars": sum(fake_bot.sent),
+    }
+    if args.trace:
+        result["send_peak_kib"] = round(send_peak / 1024, 1)
+        result["refill_peak_kib"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        result["top_allocations"] = _top_allocations(tracemalloc.take_snapshot(), os.getcwd())
+        tracemalloc.stop()
+    else:
+        result["dedup"] = await _measure_dedup(args.dedup_probes)
+
+    await bot.notifier.close()
+    return result
+
+
+def worker_main(args):
+    os.chdir(args.workspace)
+    sys.path.insert(0, args.workspace)
+    result = asyncio.run(run_worker(args))
+    print(json.dumps(result, ensure_ascii=False))
+
+
+# ---------------------------------------------------------------------------
+# 드라이버
+# ---------------------------------------------------------------------------
+
+def _bench_env(args) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "GEMINI_API_KEY": "bench-dummy-key",
+        "TELEGRAM_BOT_TOKEN": "123:bench",
+        "TELEGRAM_CHAT_ID": "1000",
+        "TELEGRAM_SUBSCRIBER_CHAT_IDS": "",
+        # 발송 제한 대기가 아니라 코드 경로를 재도록 한도를 넉넉히
+        "TELEGRAM_GLOBAL_RATE": "100000",
+        "TELEGRAM_PRIVATE_RATE": "100000",
+        "STORAGE_BACKEND": "file",
+        "PARALLEL_CANDIDATES": "1",
+        "NOVELTY_SCREEN_MODEL": "",
+        "DAILY_GEMINI_CALL_BUDGET": "0",
+        "DAILY_GEMINI_TOKEN_BUDGET": "0",
+        "DAILY_GENERATION_SECONDS_BUDGET": "0",
+        # 쿼터 대기/헤지 요청 없이 호출 수가 실행마다 같도록
+        "GEMINI_RPM_LIMIT": "0",
+        "GEMINI_TPM_LIMIT": "0",
+        "GEMINI_RPD_LIMIT": "0",
+        "GEMINI_TPD_LIMIT": "0",
+        "GEMINI_HEDGE_PERCENTILE": "0",
+        "LOG_LEVEL": args.log_level,
+        "PYTHONHASHSEED": "0",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    return env
+
+
+def run_once(args, scenario: str, corpus: list, trace: bool) -> dict:
+    workspace = make_workspace(corpus)
+    try:
+        proc = subprocess.run(
+            [
+                sys.executable, str(Path(__file__).resolve()), "--worker",
+                "--workspace", str(workspace),
+                "--scenario", scenario,
+                "--gemini-latency", str(args.gemini_latency),
+                "--telegram-latency", str(args.telegram_latency),
+                "--seed", str(args.seed),
+                "--dedup-probes", str(args.dedup_probes),
+            ] + (["--trace"] if trace else []),
+            cwd=workspace,
+            env=_bench_env(args),
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{scenario} worker failed:\n{proc.stderr[-4000:]}")
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def _median(values: list):
+    return round(statistics.median(values), 2) if values else None
+
+
+def summarize(scenario: str, size: int, runs: list, traced: dict) -> dict:
+    first = runs[0]
+    counts = ("gemini_calls", "attempts", "rejections", "telegram_messages", "telegram_chars", "buffered")
+    return {
+        "scenario": scenario,
+        "corpus": size,
+        "runs": len(runs),
+        "delivered": all(r["delivered"] for r in runs),
+        "send_ms": _median([r["send_ms"] for r in runs]),
+        "refill_ms": _median([r["refill_ms"] for r in runs]),
+        "send_ms_runs": [r["send_ms"] for r in runs],
+        "dedup": {
+            key: _median([r["dedup"][key] for r in runs])
+            for key in first["dedup"]
+        },
+        **{key: first[key] for key in counts},
+        # 같은 seed면 횟수는 실행마다 같아야 함 (다르면 비결정적 경로가 생긴 것)
+        "deterministic": all(all(r[key] == first[key] for key in counts) for r in runs + [traced]),
+        "send_peak_kib": traced["send_peak_kib"],
+        "refill_peak_kib": traced["refill_peak_kib"],
+        "top_allocations": traced["top_allocations"],
+    }
+
+
+def compare(results: list, baseline_path: str) -> list:
+    """이전 리포트 대비 비율 (1.0보다 크면 느려지거나 늘어남)"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    previous = {(r["scenario"], r["corpus"]): r for r in baseline.get("results", [])}
+    rows = []
+    for result in results:
+        old = previous.get((result["scenario"], result["corpus"]))
+        if old is None:
+            continue
+        row = {"scenario": result["scenario"], "corpus": result["corpus"]}
+        for key in ("send_ms", "refill_ms", "send_peak_kib", "refill_peak_kib"):
+            if old.get(key):
+                row[key] = round(result[key] / old[key], 3)
+        if old["dedup"].get("check_ms"):
+            row["dedup_check_ms"] = round(result["dedup"]["check_ms"] / old["dedup"]["check_ms"], 3)
+        row["attempts_delta"] = result["attempts"] - old["attempts"]
+        rows.append(row)
+    return rows
+
+
+def _git_commit() -> str:
+    proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return proc.stdout.strip() or "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspiration Bot offline end-to-end benchmark")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000")
+    parser.add_argument("--scenarios", type=str, default=",".join(SCENARIOS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--gemini-latency", type=float, default=0.05)
+    parser.add_argument("--telegram-latency", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--dedup-probes", type=int, default=50)
+    parser.add_argument("--log-level", type=str, default="ERROR")
+    parser.add_argument("--output", type=str, default="")
+    parser.add_argument("--baseline", type=str, default="")
+    # 내부용 (워커 프로세스)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workspace", type=str, default="", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", type=str, default="", help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker_main(args)
+        return
+
+    scenarios = [s for s in args.scenarios.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    report = {
+        "python": sys.version.split()[0],
+        "commit": _git_commit(),
+        "params": {
+            "runs": args.runs,
+            "gemini_latency": args.gemini_latency,
+            "telegram_latency": args.telegram_latency,
+            "seed": args.seed,
+            "dedup_probes": args.dedup_probes,
+        },
+        "results": [],
+    }
+    for size in (int(s) for s in args.sizes.split(",")):
+        corpus = make_corpus(size, args.seed)
+        for scenario in scenarios:
+            runs = [run_once(args, scenario, corpus, trace=False) for _ in range(args.runs)]
+            # 할당 추적은 시간을 왜곡하므로 별도 1회 실행
+            traced = run_once(args, scenario, corpus, trace=True)
+            report["results"].append(summarize(scenario, size, runs, traced))
+            print(f"{scenario} corpus={size}: send {report['results'][-1]['send_ms']}ms", file=sys.stderr)
+    if args.baseline:
+        report["vs_baseline"] = compare(report["results"], args.baseline)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
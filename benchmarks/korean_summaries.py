@@ -0,0 +1,194 @@
+"""
+Inspiration Bot - Korean Summary Fixtures
+Realistic Korean idea summaries for the semantic-similarity calibration and the e2e benchmark
+
+- UNRELATED / UNRELATED_TITLES: hand-written summaries (and project names) of
+  different ideas, in the style Gemini returns for IdeaDraft (one sentence,
+  key solution)
+- PARAPHRASES: (original, reworded) pairs of the same idea, i.e. what the
+  semantic stage is supposed to reject
+- make_summary(rng): combinatorial generator for large synthetic corpora.
+  It reuses the same stock phrasing across entries ("~하는 앱", "자동으로
+  추천") on topics disjoint from the hand-written ones, so a hand-written
+  summary scored against a synthetic corpus measures how often stock
+  phrasing alone pushes a different idea over the threshold.
+"""
+import random
+
+UNRELATED = [
+    "냉장고 속 식재료를 사진으로 등록하면 유통기한이 임박한 재료로 만들 수 있는 레시피를 추천해주는 앱",
+    "반려견 산책 경로와 시간을 기록하고 근처 견주들과 산책 메이트를 매칭해주는 위치 기반 커뮤니티",
+    "자취생이 공과금과 월세 납부일을 등록하면 납부 전날 알려주고 월별 고정 지출을 정리해주는 가계부",
+    "회의 녹음을 자동으로 텍스트로 변환하고 결정 사항과 담당자별 할 일을 뽑아 메신저로 공유하는 도구",
+    "토양 수분 센서와 ESP32로 화분 상태를 측정해 물이 부족하면 자동으로 급수하는 스마트 화분",
+    "중고 거래 사기 이력이 있는 계좌와 연락처를 조회해 거래 전에 위험도를 알려주는 확인 서비스",
+    "아이가 그린 그림을 스캔하면 움직이는 애니메이션 캐릭터로 바꿔주는 가족용 창작 앱",
+    "헬스장 기구 사용 현황을 실시간으로 보여줘 붐비는 시간을 피해 운동 계획을 세우게 돕는 서비스",
+    "읽은 책의 밑줄 문장을 카메라로 찍어 모으고 주제별로 묶어 나만의 인용구 노트를 만들어주는 앱",
+    "동네 소상공인이 남은 당일 음식을 할인 가격에 올리면 근처 주민이 예약해 픽업하는 마감 할인 플랫폼",
+    "라즈베리파이와 카메라로 현관 택배 도착을 감지해 도난 위험 시간대에 알림을 보내는 장치",
+    "여러 구독 서비스의 결제일과 금액을 모아 보여주고 잘 안 쓰는 구독은 해지를 제안하는 관리 도구",
+    "외국인 유학생이 병원 증상을 모국어로 입력하면 한국어 문진표로 번역해 접수를 돕는 의료 통역 앱",
+    "수면 중 뒤척임과 코골이를 스마트폰 마이크로 분석해 수면 질 점수와 개선 팁을 주는 앱",
+    "캠핑장 예약 취소표가 나오면 원하는 날짜와 지역 조건에 맞춰 즉시 알려주는 빈자리 알림 봇",
+    "아두이노와 초음파 센서로 책상 앞 자세를 감지해 거북목 자세가 길어지면 진동으로 알려주는 장치",
+    "주식 초보가 관심 종목 뉴스를 한 줄 요약과 호재·악재 태그로 받아보는 투자 뉴스 브리핑 서비스",
+    "중고 의류를 사진으로 올리면 브랜드와 상태를 인식해 적정 판매 가격을 추정해주는 리셀 도우미",
+    "노인 보호자가 부모님 약 복용 여부를 스마트 약통 개폐 기록으로 원격 확인하는 복약 관리 서비스",
+    "개발자가 커밋 메시지와 PR 설명을 변경 코드 기준으로 자동 작성해주는 깃허브 봇",
+    "동아리 회비 입출금 내역을 카드 문자에서 읽어 자동으로 장부를 만들고 회원에게 공개하는 서비스",
+    "출퇴근 지하철 혼잡도를 칸별로 예측해 덜 붐비는 탑승 위치를 알려주는 교통 앱",
+    "우리 집 전기 사용량을 스마트 플러그로 기기별로 측정해 대기 전력 낭비를 찾아주는 에너지 대시보드",
+    "프리랜서가 견적서와 계약서를 템플릿으로 만들고 전자 서명까지 받을 수 있는 업무 도구",
+    "여행지 사진의 위치 정보를 읽어 지도 위에 동선을 그리고 여행기를 자동으로 엮어주는 앱",
+    "초등학생이 받아쓰기 음성을 듣고 쓴 답을 사진으로 찍으면 자동 채점하고 틀린 단어를 복습시키는 앱",
+    "식물 잎 사진으로 병충해를 진단하고 필요한 약제와 관리 방법을 안내하는 텃밭 도우미",
+    "자영업자가 배달앱 리뷰를 한곳에 모아 감정 분석으로 불만 유형을 정리해주는 리뷰 분석 서비스",
+    "러닝 기록과 날씨를 바탕으로 오늘의 적정 페이스와 코스를 제안하는 러닝 코치 앱",
+    "3D 프린터로 출력한 부품과 서보 모터로 만드는 책상 위 자동 고양이 장난감",
+    "이사할 때 짐 목록을 방별 박스 번호와 함께 기록하고 QR 코드로 내용물을 찾게 해주는 이사 정리 앱",
+    "지역 도서관 여러 곳의 대출 가능 여부를 한 번에 검색하고 예약 순번이 오면 알려주는 서비스",
+    "팀 프로젝트 기여도를 깃 커밋과 문서 편집 기록으로 정리해 발표 자료에 넣을 수 있게 해주는 도구",
+    "아기 울음소리를 분석해 배고픔, 졸림, 불편함 중 어떤 상태인지 추정해주는 육아 보조 앱",
+    "버려지는 현수막을 수거해 장바구니로 만드는 업사이클링 공방과 주문 플랫폼",
+    "키보드 타건음을 녹음해 스위치 종류별로 비교해 들어볼 수 있는 커스텀 키보드 커뮤니티",
+    "고시원과 원룸의 소음 민원을 익명으로 기록해 건물별 소음 지도를 보여주는 주거 정보 서비스",
+    "영어 회화 연습 상대가 되어 발음과 문법을 실시간으로 교정해주는 음성 대화 튜터",
+    "쓰레기 분리배출 방법을 물건 사진으로 알려주고 지역별 배출 요일을 알림으로 보내주는 앱",
+    "보드게임 모임에서 점수 계산과 턴 타이머를 대신해주고 전적을 기록하는 테이블 도우미",
+]
+
+# UNRELATED와 같은 순서의 프로젝트 이름
+UNRELATED_TITLES = [
+    "냉장고 털이 셰프", "산책메이트", "자취 고정비 달력", "회의록 비서", "목마른 화분",
+    "거래 전 안심조회", "그림이 살아났다", "헬스장 한산 지도", "밑줄 수집가", "마감 떨이 픽업",
+    "현관 지킴이", "구독 정리함", "진료 통역 문진표", "꿀잠 리포트", "캠핑 빈자리 알리미",
+    "거북목 경보기", "한 줄 증시 브리핑", "리셀 시세 측정기", "효도 약통", "커밋 문장 도우미",
+    "동아리 투명 장부", "덜 붐비는 칸", "대기전력 탐정", "프리랜서 계약함", "발자취 여행기",
+    "받아쓰기 채점기", "잎사귀 주치의", "리뷰 온도계", "오늘의 러닝 코치", "냥냥 자동 장난감",
+    "이삿짐 QR 박스", "도서관 한 번에", "팀플 기여 리포트", "울음 통역기", "현수막 장바구니",
+    "타건음 비교실", "방음 지도", "말벗 영어 튜터", "분리배출 척척", "보드게임 점수판",
+]
+
+PARAPHRASES = [
+    (
+        "냉장고 속 식재료를 사진으로 등록하면 유통기한이 임박한 재료로 만들 수 있는 레시피를 추천해주는 앱",
+        "냉장고 재료를 사진으로 찍어 등록하면 유통기한이 얼마 안 남은 식재료로 만들 레시피를 추천하는 서비스",
+    ),
+    (
+        "반려견 산책 경로와 시간을 기록하고 근처 견주들과 산책 메이트를 매칭해주는 위치 기반 커뮤니티",
+        "강아지 산책 경로와 시간을 기록해 주변 견주와 함께 산책할 메이트를 연결해주는 위치 기반 앱",
+    ),
+    (
+        "회의 녹음을 자동으로 텍스트로 변환하고 결정 사항과 담당자별 할 일을 뽑아 메신저로 공유하는 도구",
+        "회의 녹음 파일을 텍스트로 자동 변환한 뒤 결정 사항과 담당자별 할 일을 정리해 메신저로 보내주는 도구",
+    ),
+    (
+        "토양 수분 센서와 ESP32로 화분 상태를 측정해 물이 부족하면 자동으로 급수하는 스마트 화분",
+        "ESP32와 토양 수분 센서로 화분의 수분을 측정하고 물이 모자라면 펌프로 자동 급수하는 스마트 화분",
+    ),
+    (
+        "여러 구독 서비스의 결제일과 금액을 모아 보여주고 잘 안 쓰는 구독은 해지를 제안하는 관리 도구",
+        "구독 중인 서비스들의 결제일과 금액을 한눈에 모아 보여주고 거의 안 쓰는 구독은 해지를 추천하는 앱",
+    ),
+    (
+        "캠핑장 예약 취소표가 나오면 원하는 날짜와 지역 조건에 맞춰 즉시 알려주는 빈자리 알림 봇",
+        "원하는 날짜와 지역 조건을 등록하면 캠핑장 취소표가 나왔을 때 바로 알려주는 빈자리 알림 서비스",
+    ),
+    (
+        "아두이노와 초음파 센서로 책상 앞 자세를 감지해 거북목 자세가 길어지면 진동으로 알려주는 장치",
+        "초음파 센서와 아두이노로 앉은 자세를 감지하다가 거북목 자세가 오래되면 진동으로 경고하는 장치",
+    ),
+    (
+        "출퇴근 지하철 혼잡도를 칸별로 예측해 덜 붐비는 탑승 위치를 알려주는 교통 앱",
+        "지하철 칸별 혼잡도를 예측해서 출퇴근길에 덜 붐비는 칸과 탑승 위치를 추천하는 교통 앱",
+    ),
+    (
+        "식물 잎 사진으로 병충해를 진단하고 필요한 약제와 관리 방법을 안내하는 텃밭 도우미",
+        "식물 잎을 사진으로 찍으면 병충해를 진단하고 필요한 약제와 관리법을 알려주는 텃밭 관리 앱",
+    ),
+    (
+        "자영업자가 배달앱 리뷰를 한곳에 모아 감정 분석으로 불만 유형을 정리해주는 리뷰 분석 서비스",
+        "여러 배달앱에 흩어진 리뷰를 한곳에 모아 감정 분석으로 고객 불만 유형을 정리해주는 자영업자용 서비스",
+    ),
+    (
+        "지역 도서관 여러 곳의 대출 가능 여부를 한 번에 검색하고 예약 순번이 오면 알려주는 서비스",
+        "여러 지역 도서관의 책 대출 가능 여부를 한 번에 검색하고 예약 차례가 되면 알림을 보내주는 앱",
+    ),
+    (
+        "쓰레기 분리배출 방법을 물건 사진으로 알려주고 지역별 배출 요일을 알림으로 보내주는 앱",
+        "물건 사진을 찍으면 분리배출 방법을 알려주고 우리 동네 쓰레기 배출 요일에 맞춰 알림을 주는 앱",
+    ),
+    (
+        "중고 의류를 사진으로 올리면 브랜드와 상태를 인식해 적정 판매 가격을 추정해주는 리셀 도우미",
+        "중고 옷 사진을 올리면 브랜드와 상태를 인식해서 적당한 판매 가격을 추천해주는 리셀 앱",
+    ),
+    (
+        "노인 보호자가 부모님 약 복용 여부를 스마트 약통 개폐 기록으로 원격 확인하는 복약 관리 서비스",
+        "스마트 약통의 열림 기록으로 부모님이 약을 드셨는지 보호자가 원격으로 확인하는 복약 관리 서비스",
+    ),
+    (
+        "영어 회화 연습 상대가 되어 발음과 문법을 실시간으로 교정해주는 음성 대화 튜터",
+        "음성으로 영어 회화 연습 상대가 되어 주고 발음과 문법을 실시간으로 고쳐주는 AI 튜터",
+    ),
+]
+
+TARGETS = [
+    "자취생", "직장인", "대학생", "1인 가구", "반려인", "자영업자", "프리랜서", "초등학생 부모",
+    "어르신", "신혼부부", "취준생", "개발자", "디자이너", "운동 초보", "캠핑족", "여행자",
+    "외국인 유학생", "동아리 운영진", "텃밭 농부", "소규모 카페 사장", "야간 근무자", "수험생",
+    "육아휴직 중인 부모", "1인 크리에이터", "동네 주민", "편의점 점주", "운전자", "러너",
+]
+# UNRELATED/PARAPHRASES와 겹치지 않는 주제 (합성 코퍼스 대비 손으로 쓴 요약은 "다른 아이디어")
+SUBJECTS = [
+    "반려묘 건강", "주차 공간", "출근길 버스", "여행 경비", "가족 사진", "동네 행사", "카페 재고",
+    "아르바이트 근무표", "식단 칼로리", "악기 연습", "포트폴리오", "면접 질문", "날씨와 옷차림",
+    "빨래 건조", "공동 구매", "세탁소 맡긴 옷", "헌혈 일정", "봉사 활동", "자전거 보관", "와인 기록",
+    "커피 원두", "실내 공기질", "차량 정비 주기", "명함", "우산 대여", "향수 취향", "손글씨 연습",
+    "물 마시기", "화장품 유통기한", "방 온도", "결혼식 축의금", "아이 하원 시간", "등산 코스",
+    "낚시 포인트", "전시회 관람", "사진 필름 현상", "자격증 시험", "청첩장 일정", "분실물",
+    "주말 베이킹", "홈카페 메뉴", "배낭 짐 무게", "반찬 나눔", "헬멧 착용", "배터리 잔량",
+    "복권 번호", "생일 선물", "택시 합승",
+]
+METHODS = [
+    "사진을 찍으면", "음성으로 말하면", "문자 메시지를 읽어", "위치 정보를 바탕으로", "센서 값을 측정해",
+    "캘린더와 연동해", "QR 코드를 스캔하면", "영수증을 인식해", "대화형 챗봇으로", "카메라 영상을 분석해",
+    "블루투스 태그로", "웹 크롤링으로", "스마트 플러그로", "NFC 스티커를 태그하면", "메신저 봇으로",
+]
+ACTIONS = [
+    "자동으로 정리하고", "우선순위를 매겨", "이상 징후를 감지해", "일정에 맞춰", "친구와 나눠",
+    "통계로 보여주고", "요약해서", "비슷한 사람과 매칭해", "기한 전에", "비용을 계산해",
+]
+OUTCOMES = [
+    "알림을 보내주는", "추천해주는", "한눈에 보여주는", "기록을 남겨주는", "절약 방법을 제안하는",
+    "공유할 수 있게 해주는", "대신 예약해주는", "체크리스트로 만들어주는", "점수로 알려주는",
+]
+PRODUCTS = [
+    "앱", "웹 서비스", "텔레그램 봇", "크롬 확장 프로그램", "IoT 장치", "대시보드", "커뮤니티",
+    "라즈베리파이 장치", "아두이노 키트", "플랫폼",
+]
+TEMPLATES = [
+    "{target}이 {subject}을 {method} {action} {outcome} {product}",
+    "{subject} 관리가 번거로운 {target}을 위해 {method} {action} {outcome} {product}",
+    "{method} {subject} 상태를 파악하고 {action} {outcome} {target}용 {product}",
+    "{target}의 {subject} 문제를 {method} {action} 해결하고 {outcome} {product}",
+]
+
+
+def make_summary(rng: random.Random, subject: str = "") -> str:
+    """
+    조합형 합성 요약 1개 (IdeaDraft.summary와 비슷한 한 문장)
+    subject가 다른 두 요약은 다른 아이디어로 봅니다.
+    """
+    return rng.choice(TEMPLATES).format(
+        target=rng.choice(TARGETS),
+        subject=subject or rng.choice(SUBJECTS),
+        method=rng.choice(METHODS),
+        action=rng.choice(ACTIONS),
+        outcome=rng.choice(OUTCOMES),
+        product=rng.choice(PRODUCTS),
+    )
+
+
+def make_title(rng: random.Random) -> str:
+    return f"{rng.choice(SUBJECTS)} {rng.choice(OUTCOMES).split()[0]} {rng.choice(PRODUCTS)}"
@@ -0,0 +1,97 @@
+"""
+Inspiration Bot - Semantic Threshold Calibration
+Checks SEMANTIC_SIMILARITY_THRESHOLD against realistic Korean idea summaries
+
+Usage:
+    python benchmarks/semantic_calibration.py [--sizes 1000,10000,100000]
+        [--thresholds 0.40,0.45,0.50,0.55] [--seed 7] [--output calibration.json]
+
+- duplicates: hand-written paraphrase pairs (same idea, reworded) that the
+  semantic stage must reject
+- unrelated: hand-written summaries of different ideas scored against each
+  other and against a synthetic corpus of each size, built from stock phrasing
+  on topics disjoint from the hand-written ones. The best score per summary
+  grows with the corpus size, so a threshold that is fine at 1k can reject
+  valid candidates at 100k.
+
+A good threshold rejects every paraphrase and no unrelated summary at the
+largest size, with margin on both sides.
+"""
+import argparse
+import itertools
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from korean_summaries import PARAPHRASES, UNRELATED, make_summary  # noqa: E402
+from semantic_index import SemanticIndex, vectorize  # noqa: E402
+
+
+def _stats(values) -> dict:
+    values = np.asarray(values, dtype=np.float32)
+    return {
+        "min": round(float(values.min()), 3),
+        "p50": round(float(np.percentile(values, 50)), 3),
+        "p90": round(float(np.percentile(values, 90)), 3),
+        "max": round(float(values.max()), 3),
+    }
+
+
+def calibrate(sizes: list, thresholds: list, seed: int) -> dict:
+    duplicates = [float(vectorize(a) @ vectorize(b)) for a, b in PARAPHRASES]
+    hand = np.stack([vectorize(text) for text in UNRELATED])
+    pairwise = [float(hand[i] @ hand[j]) for i, j in itertools.combinations(range(len(UNRELATED)), 2)]
+
+    rng = random.Random(seed)
+    index = SemanticIndex()
+    corpus = []
+    for size in sorted(sizes):
+        started = time.perf_counter()
+        index.add_many([make_summary(rng) for _ in range(size - len(index))])
+        best = index.similarities(UNRELATED).max(axis=1)
+        corpus.append({
+            "size": size,
+            "build_s": round(time.perf_counter() - started, 1),
+            "best_unrelated": _stats(best),
+            "false_rejects": {
+                f"{t:.2f}": int((best >= t).sum()) for t in thresholds
+            },
+        })
+
+    return {
+        "duplicates": _stats(duplicates),
+        "missed_duplicates": {f"{t:.2f}": sum(score < t for score in duplicates) for t in thresholds},
+        "unrelated_pairs": _stats(pairwise),
+        "corpus": corpus,
+        "counts": {"duplicates": len(duplicates), "unrelated": len(UNRELATED)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의미 유사도 탈락 기준 보정")
+    parser.add_argument("--sizes", type=str, default="1000,10000,100000")
+    parser.add_argument("--thresholds", type=str, default="0.40,0.45,0.50,0.55")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    report = calibrate(
+        [int(s) for s in args.sizes.split(",") if s],
+        [float(t) for t in args.thresholds.split(",") if t],
+        args.seed,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Inspiration Bot - Startup Benchmark
+Measures import cost (-X importtime), time-to-health and time-to-first-send
+
+Usage:
+    python benchmarks/startup_bench.py [--runs 5] [--output startup.json]
+
+Runs `python main.py` in a subprocess with dummy credentials, polls /health
+until it answers, and reads the "time-to-first-send" line the bot logs after
+its startup message attempt. No real Telegram/Gemini access is needed; with
+dummy credentials the first send fails fast, which still marks the point
+where the bot is fully up.
+
+Every run happens in a temporary copy of the bot modules (plus the tracked
+idea_summaries.txt), so the data files the bot writes on startup
+(subscribers.json, outbox.db, ...) never land in the real bot directory.
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# 시작 경로에서 import 비용을 따로 보고 싶은 모듈
+IMPORT_TARGETS = ["main", "idea_generator", "telegram_notifier"]
+
+
+def make_workspace() -> Path:
+    """봇 모듈 복사본 + 요약 파일이 있는 임시 디렉터리 (.env와 기존 데이터 파일은 복사하지 않음)"""
+    workspace = Path(tempfile.mkdtemp(prefix="inspiration_startup_"))
+    for path in ROOT.glob("*.py"):
+        shutil.copy2(path, workspace / path.name)
+    summaries = ROOT / "idea_summaries.txt"
+    if summaries.exists():
+        shutil.copy2(summaries, workspace / summaries.name)
+    return workspace
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _bench_env(port: int) -> dict:
+    env = dict(os.environ)
+    env.update({
+        "PORT": str(port),
+        "TELEGRAM_BOT_TOKEN": env.get("BENCH_TELEGRAM_BOT_TOKEN", ""),
+        "TELEGRAM_CHAT_ID": env.get("BENCH_TELEGRAM_CHAT_ID", "0"),
+        "GEMINI_API_KEY": env.get("BENCH_GEMINI_API_KEY", "bench-dummy-key"),
+        "LOG_LEVEL": "INFO",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    })
+    return env
+
+
+def measure_import_time(workspace: Path, module: str) -> dict:
+    """-X importtime 출력에서 모듈의 누적 import 시간과 상위 의존성 추출"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=workspace,
+        env=_bench_env(0),
+        capture_output=True,
+        text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = re.match(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)", line)
+        if match:
+            rows.append({
+                "module": match.group(4),
+                "self_us": int(match.group(1)),
+                "cumulative_us": int(match.group(2)),
+                "depth": len(match.group(3)) // 2,
+            })
+    total = next((r["cumulative_us"] for r in rows if r["module"] == module and r["depth"] == 0), 0)
+    top = sorted((r for r in rows if r["depth"] == 1), key=lambda r: r["cumulative_us"], reverse=True)[:8]
+    return {
+        "module": module,
+        "total_ms": round(total / 1000, 1),
+        "top_dependencies_ms": {r["module"]: round(r["cumulative_us"] / 1000, 1) for r in top},
+    }
+
+
+def measure_startup(timeout: float = 60.0) -> dict:
+    """
+    새 임시 작업 디렉터리에서 main.py를 실행해 /health 응답 시각과 첫 발송 시도 시각을 측정
+    (실행마다 새 디렉터리라 이전 실행이 남긴 구독/아웃박스 없이 콜드 스타트)
+    """
+    workspace = make_workspace()
+    port = _free_port()
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "main.py"],
+        cwd=workspace,
+        env=_bench_env(port),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    result = {"time_to_health_s": None, "time_to_first_send_s": None, "logged": {}}
+    try:
+        url = f"http://127.0.0.1:{port}/health"
+        while time.perf_counter() - started < timeout:
+            if proc.poll() is not None:
+                break
+            try:
+                with urllib.request.urlopen(url, timeout=0.5) as resp:
+                    if resp.status == 200:
+                        result["time_to_health_s"] = round(time.perf_counter() - started, 3)
+                        break
+            except OSError:
+                time.sleep(0.01)
+
+        # 봇이 스스로 기록한 측정값 (인터프리터 시작 이후 기준)
+        deadline = started + timeout
+        for line in proc.stderr:
+            match = re.search(r"⏱️ (time-to-[a-z-]+)=([\d.]+)s", line)
+            if match:
+                result["logged"][match.group(1)] = float(match.group(2))
+                if match.group(1) == "time-to-first-send":
+                    result["time_to_first_send_s"] = round(time.perf_counter() - started, 3)
+                    break
+            if time.perf_counter() > deadline:
+                break
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        shutil.rmtree(workspace, ignore_errors=True)
+    return result
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspiration Bot startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", type=str, default="")
+    args = parser.parse_args()
+
+    workspace = make_workspace()
+    try:
+        imports = [measure_import_time(workspace, m) for m in IMPORT_TARGETS]
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+    report = {
+        "python": sys.version.split()[0],
+        "imports": imports,
+        "runs": [],
+    }
+    for _ in range(args.runs):
+        report["runs"].append(measure_startup())
+    report["median_time_to_health_s"] = _median(r["time_to_health_s"] for r in report["runs"])
+    report["median_time_to_first_send_s"] = _median(r["time_to_first_send_s"] for r in report["runs"])
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    print(text)
+
+
+if __name__ == "__main__":
+    main()
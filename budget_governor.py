@@ -0,0 +1,98 @@
+"""
+Inspiration Bot - Daily Budget Governor
+Per-day Gemini spend limits (calls, tokens, generation wall time) persisted to disk
+"""
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import pytz
+from loguru import logger
+
+from transport import data_path
+
+BUDGET_FILE = "gemini_budget.json"
+
+# 예산 항목 (설정값 0 = 무제한)
+RESOURCES = ("calls", "tokens", "seconds")
+
+
+class BudgetGovernor:
+    """
+    하루 단위 Gemini 사용 예산
+
+    - record_call: 호출 1회 + 응답 토큰 수 누적
+    - record_time: 생성 루프 소요 시간(초) 누적
+    - exhausted: 한도를 넘은 항목 이름 (없으면 None)
+    날짜(설정 타임존 기준)가 바뀌면 사용량을 0부터 다시 셉니다.
+    """
+
+    def __init__(self, max_calls: int, max_tokens: int, max_seconds: float, timezone: str):
+        self.file_path = data_path(BUDGET_FILE, seed=False)
+        self.limits = {"calls": max_calls, "tokens": max_tokens, "seconds": max_seconds}
+        self.timezone = pytz.timezone(timezone)
+        self._lock = threading.Lock()
+        self._usage = self._load_usage()
+
+    def _today(self) -> str:
+        return datetime.now(self.timezone).strftime("%Y-%m-%d")
+
+    def _empty(self) -> dict:
+        return {"date": self._today(), "calls": 0, "tokens": 0, "seconds": 0.0}
+
+    def _load_usage(self) -> dict:
+        if not self.file_path.exists():
+            return self._empty()
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("date") != self._today():
+                return self._empty()
+            return {**self._empty(), **{key: data.get(key, 0) for key in RESOURCES}}
+        except Exception as e:
+            logger.error(f"일일 예산 사용량 로드 실패: {e}")
+            return self._empty()
+
+    def _save_usage(self):
+        tmp_path = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._usage, f)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            logger.error(f"일일 예산 사용량 저장 실패: {e}")
+
+    def _roll_over(self):
+        """날짜가 바뀌었으면 사용량 초기화 (lock 안에서 호출)"""
+        if self._usage["date"] != self._today():
+            self._usage = self._empty()
+
+    def record_call(self, tokens: int):
+        with self._lock:
+            self._roll_over()
+            self._usage["calls"] += 1
+            self._usage["tokens"] += max(0, tokens)
+            self._save_usage()
+
+    def record_time(self, seconds: float):
+        with self._lock:
+            self._roll_over()
+            self._usage["seconds"] = round(self._usage["seconds"] + max(0.0, seconds), 3)
+            self._save_usage()
+
+    def exhausted(self) -> Optional[str]:
+        """한도를 다 쓴 항목 (calls | tokens | seconds), 여유가 있으면 None"""
+        with self._lock:
+            self._roll_over()
+            for key in RESOURCES:
+                limit = self.limits[key]
+                if limit and self._usage[key] >= limit:
+                    return key
+        return None
+
+    def get_usage(self) -> Dict:
+        with self._lock:
+            self._roll_over()
+            return dict(self._usage)
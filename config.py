@@ -12,16 +12,63 @@ class Settings(BaseSettings):
     # Telegram
     telegram_bot_token: str = Field(default="", description="Telegram Bot Token")
     telegram_chat_id: str = Field(default="", description="Telegram Chat ID")
+    telegram_subscriber_chat_ids: str = Field(default="", description="추가 구독 채팅 ID (쉼표 구분)")
+    telegram_global_rate: float = Field(default=30.0, description="전체 초당 발송 한도")
+    telegram_private_rate: float = Field(default=1.0, description="개인 채팅당 초당 발송 한도")
+    telegram_group_rate_per_minute: float = Field(default=20.0, description="그룹/채널당 분당 발송 한도")
+    telegram_pool_size: int = Field(default=32, description="Telegram HTTP 커넥션 풀 크기")
+    telegram_connect_timeout: float = Field(default=5.0, description="Telegram 연결 타임아웃 (초)")
+    telegram_read_timeout: float = Field(default=10.0, description="Telegram 응답 읽기 타임아웃 (초)")
+    telegram_write_timeout: float = Field(default=10.0, description="Telegram 요청 쓰기 타임아웃 (초)")
+    telegram_pool_timeout: float = Field(default=5.0, description="커넥션 풀에서 연결을 기다리는 최대 시간 (초)")
+    telegram_keepalive_seconds: float = Field(default=30.0, description="유휴 keep-alive 연결 유지 시간 (초)")
+    outbox_path: str = Field(default="outbox.db", description="발송 대기열 SQLite 파일 경로 (봇 폴더 기준)")
+    outbox_retry_base_seconds: float = Field(default=5.0, description="발송 재시도 첫 대기 시간 (초, 시도마다 2배)")
+    outbox_retry_max_seconds: float = Field(default=1800.0, description="발송 재시도 최대 대기 시간 (초)")
+    outbox_max_attempts: int = Field(default=12, description="발송 포기 전 최대 시도 횟수")
     
     # Gemini AI
     gemini_api_key: str = Field(default="", description="Google Gemini API Key")
     gemini_model: str = Field(default="gemini-1.5-pro", description="Gemini 모델 (gemini-1.5-pro, gemini-1.5-flash, gemini-2.0-flash-exp)")
+    model_cache_ttl_hours: float = Field(default=24, description="모델 목록 캐시 유효 시간 (시간)")
+    gemini_timeout_seconds: float = Field(default=60.0, description="Gemini 호출 1회 타임아웃 (초)")
+    gemini_rpm_limit: int = Field(default=15, description="Gemini 분당 요청 수 한도 (0=무제한)")
+    gemini_tpm_limit: int = Field(default=1_000_000, description="Gemini 분당 토큰 수 한도 (0=무제한)")
+    gemini_rpd_limit: int = Field(default=1500, description="Gemini 일일 요청 수 한도 (0=무제한)")
+    gemini_tpd_limit: int = Field(default=0, description="Gemini 일일 토큰 수 한도 (0=무제한)")
+    gemini_fallback_models: str = Field(default="", description="장애/지연 시 사용할 폴백 모델 (쉼표 구분, 비우면 flash-lite 계열)")
+    gemini_hedge_percentile: float = Field(default=0.95, description="이 지연 percentile을 넘으면 폴백 모델로 헤지 요청 (0=사용 안 함)")
+    gemini_hedge_min_samples: int = Field(default=20, description="헤지 기준 계산에 필요한 최소 성공 표본 수")
+    gemini_circuit_failure_threshold: int = Field(default=5, description="연속 429/5xx/타임아웃 횟수가 이만큼이면 서킷 차단")
+    gemini_circuit_reset_seconds: float = Field(default=60.0, description="차단 후 시험 요청까지 대기 시간 (초)")
+    parallel_candidates: int = Field(default=1, description="라운드당 병렬 생성할 후보 아이디어 수 (1=순차)")
+    semantic_similarity_threshold: float = Field(default=0.5, description="요약 본문 코사인 유사도 탈락 기준 (benchmarks/semantic_calibration.py로 보정)")
+    prompt_context_token_budget: int = Field(default=1500, description="프롬프트에 넣을 기존 아이디어 컨텍스트 토큰 예산")
+    novelty_cache_ttl_hours: float = Field(default=720, description="검색 신규성 판정 캐시 유효 시간 (시간)")
+    novelty_cache_max_entries: int = Field(default=500, description="검색 신규성 판정 캐시 최대 항목 수")
+    novelty_screen_model: str = Field(default="", description="검색 검증 전 저비용 사전 심사 모델 (비우면 생략)")
+    daily_gemini_call_budget: int = Field(default=0, description="하루 Gemini 호출 한도 (0=무제한)")
+    daily_gemini_token_budget: int = Field(default=0, description="하루 Gemini 토큰 한도 (0=무제한)")
+    daily_generation_seconds_budget: float = Field(default=0, description="하루 아이디어 생성 소요 시간 한도 (초, 0=무제한)")
+    transport_mode: str = Field(default="live", description="Gemini/Telegram 호출 모드 (live | record | replay)")
+    cassette_path: str = Field(default="cassette.jsonl", description="기록/재생 파일 경로 (봇 폴더 기준, .gz면 압축)")
+    replay_speed: float = Field(default=1.0, description="재생 속도 배율 (1=기록된 지연 그대로, 0=대기 없음)")
     
     # Schedule - Idea Bot
     send_hour: int = Field(default=23, description="발송 시간 (시) - 23시")
     send_minute: int = Field(default=0, description="발송 시간 (분) - 0분")
     timezone: str = Field(default="Asia/Seoul", description="타임존")
     
+    # Pre-generation buffer
+    idea_buffer_size: int = Field(default=2, description="미리 생성해 둘 아이디어 수")
+    prefill_lead_hours: int = Field(default=3, description="발송 몇 시간 전에 버퍼를 채울지")
+    
+    # Storage
+    history_max_items: int = Field(default=1000, description="히스토리에 보관할 최대 아이디어 수")
+    history_compact_every: int = Field(default=50, description="히스토리 저널을 스냅샷으로 합치는 기록 간격")
+    storage_backend: str = Field(default="file", description="저장소 백엔드 (file | sqlite)")
+    sqlite_path: str = Field(default="inspiration_bot.db", description="SQLite 파일 경로 (봇 폴더 기준)")
+    
     # Server
     port: int = Field(default=8080, description="HTTP 포트")
     log_level: str = Field(default="INFO", description="로그 레벨")
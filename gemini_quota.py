@@ -0,0 +1,244 @@
+"""
+Inspiration Bot - Gemini Quota Manager
+Client-side RPM/TPM/RPD/TPD token buckets shared by every Gemini call, with a priority queue
+"""
+import asyncio
+import contextvars
+import heapq
+import itertools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+from loguru import logger
+
+import metrics
+from prompt_context import estimate_tokens
+from rate_limiter import TokenBucket
+from transport import data_path
+
+# 우선순위 (작을수록 먼저): 발송 시각 생성 > 버퍼 사전 생성
+PRIORITY_SEND = 0
+PRIORITY_PREFILL = 1
+PRIORITY_NAMES = {PRIORITY_SEND: "send", PRIORITY_PREFILL: "prefill"}
+
+# 응답 사용량이 쌓이기 전 스테이지별 출력 토큰 추정값
+DEFAULT_OUTPUT_TOKENS = 1024
+# 출력 토큰 이동 평균 가중치 (최근 응답 반영 비율)
+OUTPUT_EMA_ALPHA = 0.2
+# 이보다 오래 기다린 호출은 로그로 남김 (초)
+WAIT_LOG_SECONDS = 1.0
+# 일일 한도(RPD/TPD) 사용량 기록 파일 (설정 타임존 기준 날짜별, 재시작해도 유지)
+QUOTA_FILE = "gemini_quota.json"
+DAY_RESOURCES = ("requests", "tokens")
+
+_priority: contextvars.ContextVar[int] = contextvars.ContextVar("gemini_quota_priority", default=PRIORITY_SEND)
+
+
+class QuotaExhaustedError(RuntimeError):
+    """오늘 일일 한도(RPD/TPD)를 다 써서 호출하지 않음 (다른 모델도 같은 API 키라 재시도하지 않음)"""
+
+
+@contextmanager
+def quota_priority(priority: int):
+    """블록 안(및 그 안에서 만든 태스크)의 Gemini 호출 우선순위 지정"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def _bucket(limit: float, period: float) -> Optional[TokenBucket]:
+    """limit 0 = 제한 없음"""
+    return TokenBucket(limit / period, limit) if limit > 0 else None
+
+
+class GeminiQuota:
+    """
+    API 키 하나를 공유하는 Gemini 호출 쿼터
+
+    - 분당 요청/토큰(RPM/TPM) 버킷을 모두 통과해야 호출
+    - 일일 요청/토큰(RPD/TPD)은 오늘(설정 타임존 기준) 누적 사용량이 한도 미만일 때만 호출
+      (하루 안에서는 다시 채워지지 않고, 사용량은 파일에 남아 재시작해도 이어짐)
+    - 대기 중인 호출은 우선순위 → 도착 순서로 하나씩 발급 (앞 호출이 막히면 뒤 호출도 대기)
+    - 호출 전 토큰을 추정해 차감하고, 응답 usage_metadata로 실제 사용량과의 차이를 보정
+    """
+
+    def __init__(self, rpm: int, tpm: int, rpd: int, tpd: int, timezone: str = "UTC"):
+        self.request_buckets: Dict[str, TokenBucket] = {
+            name: bucket for name, bucket in (("rpm", _bucket(rpm, 60)),) if bucket is not None
+        }
+        self.token_buckets: Dict[str, TokenBucket] = {
+            name: bucket for name, bucket in (("tpm", _bucket(tpm, 60)),) if bucket is not None
+        }
+        self.day_limits: Dict[str, int] = {
+            key: limit for key, limit in (("requests", rpd), ("tokens", tpd)) if limit > 0
+        }
+        self._waiters: List[Tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self._output_tokens: Dict[str, float] = {}
+        self.file_path = data_path(QUOTA_FILE, seed=False)
+        self.timezone = pytz.timezone(timezone)
+        self._file_lock = threading.Lock()
+        self._usage = self._load_usage()
+        if self.day_limits and (self._usage["requests"] or self._usage["tokens"]):
+            logger.info(
+                f"📅 오늘 Gemini 사용량 복원: 요청 {self._usage['requests']}건, 토큰 {self._usage['tokens']}"
+            )
+        self._publish()
+
+    def _today(self) -> str:
+        return datetime.now(self.timezone).strftime("%Y-%m-%d")
+
+    def _empty(self) -> dict:
+        return {"date": self._today(), "requests": 0, "tokens": 0}
+
+    def _load_usage(self) -> dict:
+        if not self.file_path.exists():
+            return self._empty()
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("date") != self._today():
+                return self._empty()
+            return {**self._empty(), **{key: data.get(key, 0) for key in DAY_RESOURCES}}
+        except Exception as e:
+            logger.error(f"Gemini 일일 쿼터 사용량 로드 실패: {e}")
+            return self._empty()
+
+    def _save_usage(self):
+        """최신 사용량을 원자적으로 저장 (asyncio.to_thread에서 호출)"""
+        with self._file_lock:
+            tmp_path = self.file_path.with_suffix(".tmp")
+            try:
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(dict(self._usage), f)
+                os.replace(tmp_path, self.file_path)
+            except Exception as e:
+                logger.error(f"Gemini 일일 쿼터 사용량 저장 실패: {e}")
+
+    def _roll_over(self):
+        """날짜가 바뀌었으면 일일 사용량 초기화"""
+        if self._usage["date"] != self._today():
+            self._usage = self._empty()
+
+    def _record(self, requests: int, tokens: int) -> bool:
+        """일일 사용량 누적 (일일 한도가 없으면 기록하지 않음). 저장이 필요하면 True"""
+        if not self.day_limits:
+            return False
+        self._roll_over()
+        self._usage["requests"] += requests
+        self._usage["tokens"] = max(0, self._usage["tokens"] + tokens)
+        return True
+
+    def day_exhausted(self) -> Optional[str]:
+        """오늘 한도를 다 쓴 일일 항목 이름 (requests | tokens, 없으면 None)"""
+        self._roll_over()
+        for key, limit in self.day_limits.items():
+            if self._usage[key] >= limit:
+                return key
+        return None
+
+    def estimate(self, stage: str, contents: str, config) -> int:
+        """호출 1회 예상 토큰 (프롬프트 추정 + 스테이지 평균 출력, max_output_tokens 이내)"""
+        output = self._output_tokens.get(stage, DEFAULT_OUTPUT_TOKENS)
+        max_output = getattr(config, "max_output_tokens", None)
+        if max_output:
+            output = min(output, max_output)
+        return math.ceil(estimate_tokens(contents) + output)
+
+    def _wait_time(self, tokens: int) -> float:
+        waits = [bucket.wait_time(1) for bucket in self.request_buckets.values()]
+        waits += [bucket.wait_time(tokens) for bucket in self.token_buckets.values()]
+        return max(waits, default=0.0)
+
+    def has_headroom(self, tokens: int) -> bool:
+        """대기열 없이 지금 바로 발급 가능한지 (헤지처럼 없어도 되는 호출용)"""
+        return not self._waiters and self.day_exhausted() is None and self._wait_time(tokens) == 0
+
+    async def acquire(self, stage: str, tokens: int):
+        """
+        발급될 때까지 대기 후 요청 1건과 추정 토큰을 차감
+        오늘 일일 한도를 다 썼으면 기다리지 않고 QuotaExhaustedError
+        """
+        priority = _priority.get()
+        entry = (priority, next(self._sequence))
+        started = time.monotonic()
+        async with self._condition:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    # 맨 앞 호출만 버킷을 확인, 나머지는 앞 호출이 발급/취소될 때까지 대기
+                    if self._waiters[0] == entry:
+                        resource = self.day_exhausted()
+                        if resource is not None:
+                            raise QuotaExhaustedError(
+                                f"Gemini 일일 한도 소진 ({resource} {self._usage[resource]}/{self.day_limits[resource]})"
+                            )
+                    wait = self._wait_time(tokens) if self._waiters[0] == entry else None
+                    if wait == 0:
+                        break
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                for bucket in self.request_buckets.values():
+                    bucket.take(1)
+                for bucket in self.token_buckets.values():
+                    bucket.take(tokens)
+                changed = self._record(1, tokens)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+        waited = time.monotonic() - started
+        metrics.GEMINI_QUOTA_WAIT.labels(priority=PRIORITY_NAMES.get(priority, str(priority))).observe(waited)
+        if waited >= WAIT_LOG_SECONDS:
+            logger.info(f"⏳ Gemini 쿼터 대기 {waited:.1f}초 ({stage}, {PRIORITY_NAMES.get(priority, priority)})")
+        self._publish()
+        if changed:
+            await asyncio.to_thread(self._save_usage)
+
+    async def settle(self, stage: str, estimated: int, response):
+        """
+        응답 usage_metadata로 추정 토큰 보정
+        (사용량이 없는 실패 응답은 추정치를 그대로 사용한 것으로 둠)
+        """
+        usage = getattr(response, "usage_metadata", None)
+        total = getattr(usage, "total_token_count", None)
+        if total is None:
+            return
+        for bucket in self.token_buckets.values():
+            bucket.give(estimated - total)
+        changed = self._record(0, total - estimated)
+        output = getattr(usage, "candidates_token_count", None)
+        if output is not None:
+            previous = self._output_tokens.get(stage, output)
+            self._output_tokens[stage] = previous + OUTPUT_EMA_ALPHA * (output - previous)
+        self._publish()
+        if changed:
+            await asyncio.to_thread(self._save_usage)
+
+    def throttled(self):
+        """쿼터 설정보다 서버 한도가 낮아 429를 받은 경우, 요청 버킷을 비워 다음 발급을 늦춤"""
+        metrics.GEMINI_QUOTA_THROTTLES.inc()
+        bucket = self.request_buckets.get("rpm")
+        if bucket is not None:
+            bucket.block_for(1 / bucket.rate)
+            logger.warning(f"🚦 Gemini 429 수신, 다음 요청까지 {1 / bucket.rate:.1f}초 대기")
+
+    def _publish(self):
+        for name, bucket in {**self.request_buckets, **self.token_buckets}.items():
+            metrics.GEMINI_QUOTA_AVAILABLE.labels(bucket=name).set(max(0.0, bucket.tokens))
+        for key, name in (("requests", "rpd"), ("tokens", "tpd")):
+            if key in self.day_limits:
+                metrics.GEMINI_QUOTA_AVAILABLE.labels(bucket=name).set(max(0, self.day_limits[key] - self._usage[key]))
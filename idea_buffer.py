@@ -0,0 +1,73 @@
+"""
+Inspiration Bot - Idea Buffer
+Persists pre-generated, already validated ideas so the scheduled send is instant
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from transport import data_path
+
+BUFFER_FILE = "idea_buffer.json"
+
+
+class IdeaBuffer:
+    """
+    발송 전에 미리 생성/검증해 둔 아이디어 대기열 (FIFO)
+    """
+
+    def __init__(self):
+        self.file_path = data_path(BUFFER_FILE)
+        self.items: List[Dict[str, str]] = self._load_items()
+
+    def _load_items(self) -> List[Dict[str, str]]:
+        """Load buffered ideas from JSON file"""
+        if not self.file_path.exists():
+            return []
+
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return [item for item in data.get("items", []) if item.get("idea") and item.get("title")]
+        except Exception as e:
+            logger.error(f"Failed to load idea buffer: {e}")
+            return []
+
+    def _save_items(self):
+        """Save buffered ideas (임시 파일 + rename으로 원자적 저장)"""
+        tmp_path = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"items": self.items}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            logger.error(f"Failed to save idea buffer: {e}")
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def count(self, idea_type: str) -> int:
+        return sum(1 for item in self.items if item.get("type") == idea_type)
+
+    def push(self, candidate: Dict[str, str]):
+        """검증을 통과한 후보를 버퍼 끝에 추가"""
+        item = dict(candidate)
+        item["generated_at"] = datetime.now().isoformat(timespec="seconds")
+        self.items.append(item)
+        self._save_items()
+        logger.info(f"📦 아이디어 버퍼 추가: {item['title']} (대기 {len(self.items)}개)")
+
+    def pop(self, idea_type: str) -> Optional[Dict[str, str]]:
+        """해당 타입의 가장 오래된 아이디어를 꺼냅니다."""
+        for i, item in enumerate(self.items):
+            if item.get("type") == idea_type:
+                del self.items[i]
+                self._save_items()
+                return item
+        return None
+
+    def get_titles(self) -> List[str]:
+        return [item["title"] for item in self.items]
@@ -3,18 +3,85 @@ Inspiration Bot - AI Idea Generator
 Uses Google Gemini API to generate creative project ideas
 Auto-detects latest available model
 """
-import json
+import asyncio
+import math
 import random
-import re
-from difflib import SequenceMatcher
+import time
+from typing import Iterable, Optional
 
 from google import genai
 from google.genai import types
 from loguru import logger
+from pydantic import TypeAdapter, ValidationError
 
+import metrics
+from budget_governor import BudgetGovernor
 from config import settings
-from idea_history import IdeaHistory
-from idea_summary_store import IdeaSummaryStore
+from idea_schema import (
+    BatchIdea,
+    IdeaDraft,
+    NoveltyVerdict,
+    clean_title,
+    parse_verdict,
+    render_idea,
+    short_summary,
+)
+from model_registry import ModelRegistry
+from gemini_quota import GeminiQuota
+from model_router import CircuitOpenError, ModelRouter, is_transient
+from novelty_cache import NoveltyCache, fingerprint
+from prompt_context import PromptContextBuilder
+from semantic_index import vectorize
+from storage import create_storage
+from title_index import SIMILARITY_THRESHOLD, TitleIndex, normalize_title, title_similarity
+from transport import REPLAY, decode_gemini, encode_gemini, gemini_request, open_transport
+
+
+# 아이디어 응답 필드 안내 (IdeaDraft 스키마, 단건/배치 생성 공용)
+SOFTWARE_FIELDS = """- title: 프로젝트 이름
+- summary: 핵심 해결 방식을 한 문장으로 (180자 이내)
+- problem: 타겟의 불편함 (구체적인 상황 묘사와 실제 겪는 문제점)
+- solution: 해결 솔루션 (웹/앱으로 어떻게 해결하는지)
+- features: 핵심 기능 (2개 이상)
+- tech_stack: 프론트엔드/모바일, 백엔드/DB, 주요 API/라이브러리
+- outcome: 기대 효과 (사용자가 얻는 이득)"""
+
+MAKER_FIELDS = """- title: 프로젝트 이름
+- summary: 이 프로젝트가 무엇인지 한 문장으로 설명
+- problem: 왜 이걸 만들어? 재미있거나 공감가는 동기 설명
+- solution: 어떻게 작동해? 구체적인 작동 원리 설명 (2-4문장)
+- features: 주요 구성 요소/기능
+- tech_stack: 기술 3개 내외 (각각 용도 포함)
+- outcome: 예상 개발 시간 (예: 12시간)"""
+
+# 소프트웨어 아이디어 타겟 연령대 (배치 생성 시 세그먼트 단위)
+SOFTWARE_AGE_GROUPS = ["20대", "30대"]
+
+# 배치 생성 응답 파서 (response.parsed가 없을 때 사용)
+BATCH_ADAPTER = TypeAdapter(list[BatchIdea])
+
+# 신규성 검사 단계 (비용이 싼 순서, 앞 단계에서 탈락하면 뒤 단계는 실행하지 않음)
+# budget: 예산 소진으로 원격 검증을 건너뛴 후보 (어느 단계에서도 중복 판정을 받지 않음)
+NOVELTY_STAGES = ("exact", "title", "semantic", "screen", "search", "budget")
+
+
+class IdeaGenerationError(RuntimeError):
+    """아이디어 생성 실패 (메시지는 에러 내용이 들어간 관리자용 알림이라 구독자에게는 보내지 않음)"""
+
+
+def build_segments(idea_type: str, count: int) -> list[dict]:
+    """
+    배치 생성용 세그먼트 목록 {"key", "type", "target_age"}
+    software는 연령대를 돌아가며 배정합니다. (시작 연령대는 무작위)
+    """
+    offset = random.randrange(len(SOFTWARE_AGE_GROUPS))
+    segments = []
+    for i in range(count):
+        target_age = ""
+        if idea_type == "software":
+            target_age = SOFTWARE_AGE_GROUPS[(offset + i) % len(SOFTWARE_AGE_GROUPS)]
+        segments.append({"key": f"{idea_type}-{i + 1}", "type": idea_type, "target_age": target_age})
+    return segments
 
 
 class IdeaGenerator:
@@ -25,48 +92,74 @@ class IdeaGenerator:
     
     def __init__(self):
         self.client = genai.Client(api_key=settings.gemini_api_key)
-        self.model = self._get_best_model()
-        self.history = IdeaHistory()
-        self.summary_store = IdeaSummaryStore()
+        # 모델 목록 조회는 시작을 막지 않도록 캐시 + 백그라운드 갱신으로 처리
+        self.model_registry = ModelRegistry(
+            self.client,
+            ttl_seconds=settings.model_cache_ttl_hours * 3600,
+        )
+        self.storage = create_storage()
+        self.history = self.storage.history
+        self.summary_store = self.storage.summaries
+        self.title_index = TitleIndex()
+        self._indexed_summary_count = 0
+        self.context_builder = PromptContextBuilder(
+            self.summary_store,
+            token_budget=settings.prompt_context_token_budget,
+        )
+        self.novelty_cache = NoveltyCache(
+            ttl_seconds=settings.novelty_cache_ttl_hours * 3600,
+            max_entries=settings.novelty_cache_max_entries,
+        )
+        # API 키 공유 쿼터 (모든 generate_content 호출이 통과)
+        self.quota = GeminiQuota(
+            rpm=settings.gemini_rpm_limit,
+            tpm=settings.gemini_tpm_limit,
+            rpd=settings.gemini_rpd_limit,
+            tpd=settings.gemini_tpd_limit,
+            timezone=settings.timezone,
+        )
+        # 서킷 브레이커 / 지연 헤지 / 폴백 모델 체인
+        self.router = ModelRouter(
+            fallback_models=[m.strip() for m in settings.gemini_fallback_models.split(",") if m.strip()],
+            failure_threshold=settings.gemini_circuit_failure_threshold,
+            reset_seconds=settings.gemini_circuit_reset_seconds,
+            hedge_percentile=settings.gemini_hedge_percentile,
+            hedge_min_samples=settings.gemini_hedge_min_samples,
+        )
+        # 기록/재생 모드에서는 generate_content 호출을 기록 파일로 대체
+        self.transport = open_transport("gemini")
+        self.budget = BudgetGovernor(
+            max_calls=settings.daily_gemini_call_budget,
+            max_tokens=settings.daily_gemini_token_budget,
+            max_seconds=settings.daily_generation_seconds_budget,
+            timezone=settings.timezone,
+        )
         logger.info(f"💡 IdeaGenerator 초기화 완료 (모델: {self.model})")
     
-    def _get_best_model(self) -> str:
-        """
-        사용 가능한 최신 flash 모델 자동 감지
-        우선순위: gemini-2.0-flash > gemini-1.5-flash > 기타 flash
-        """
-        try:
-            models = self.client.models.list()
-            model_names = [m.name for m in models]
-            
-            # 우선순위 순으로 체크
-            priority_models = [
-                'gemini-2.0-flash',
-                'gemini-1.5-flash', 
-                'gemini-1.5-flash-latest',
-                'gemini-2.0-flash-lite',
-            ]
-            
-            for preferred in priority_models:
-                for name in model_names:
-                    clean_name = name.replace('models/', '')
-                    if clean_name == preferred:
-                        logger.info(f"🔍 자동 감지된 최신 모델: {clean_name}")
-                        return clean_name
-            
-            # 우선순위에 없으면 아무 flash 모델이나 사용
-            for name in model_names:
-                clean_name = name.replace('models/', '')
-                if 'flash' in clean_name.lower() and 'exp' not in clean_name.lower():
-                    logger.info(f"🔍 감지된 flash 모델: {clean_name}")
-                    return clean_name
-            
-        except Exception as e:
-            logger.warning(f"모델 목록 조회 실패: {e}")
-        
-        # 폴백: 설정된 모델 사용
-        return settings.gemini_model
-    
+    @property
+    def model(self) -> str:
+        """현재 사용 중인 모델 (404 시 자동 전환됨)"""
+        return self.model_registry.current
+
+    def start_background_tasks(self):
+        """모델 목록 백그라운드 갱신 시작 (이벤트 루프 안에서 호출, 재생 모드는 네트워크 없이 동작하므로 생략)"""
+        if self.transport.mode != REPLAY:
+            self.model_registry.start_background_refresh()
+
+    def stop_background_tasks(self):
+        self.model_registry.stop()
+
+    def _quota_applies(self) -> bool:
+        """재생 모드는 네트워크 호출이 없으므로 쿼터 대기 없음"""
+        return self.transport.mode != REPLAY
+
+    @staticmethod
+    def _is_model_not_found(error: Exception) -> bool:
+        if getattr(error, "code", None) == 404:
+            return True
+        error_msg = str(error)
+        return "404" in error_msg or "not found" in error_msg.lower()
+
     def get_available_models_info(self) -> str:
         """사용 가능한 모델 목록 조회"""
         try:
@@ -87,11 +180,278 @@ class IdeaGenerator:
             idea_type: "mixed" (하드웨어+SW) or "software" (한국인 페인포인트 SW)
 
         Returns:
-            포맷팅된 아이디어 문자열
+            포맷팅된 아이디어 문자열 (새 아이디어를 확정하지 못한 날은 구독자용 안내 문구)
+
+        Raises:
+            IdeaGenerationError: 생성 중 오류 (메시지는 관리자 채팅용)
+        """
+        try:
+            candidate = await self.generate_candidate(idea_type)
+            if candidate is None:
+                return (
+                    "⚠️ 오늘은 기존 아이디어와 겹치지 않는 새 아이디어를 확정하지 못했습니다.\n\n"
+                    "내일 다시 더 엄격한 기준으로 새로운 아이디어를 탐색해보겠습니다."
+                )
+            await self.record_candidate(candidate)
+            return candidate["idea"]
+
+        except Exception as e:
+            error_msg = str(e)
+            logger.error(f"❌ 아이디어 생성 실패: {error_msg}")
+
+            if self._is_model_not_found(e):
+                # 사용 가능한 후보 모델을 모두 시도한 경우에만 여기까지 옴
+                raise IdeaGenerationError(
+                    f"⚠️ 아이디어 생성 중 오류가 발생했습니다!\n\n"
+                    f"에러: 404 NOT_FOUND\n"
+                    f"현재 모델 '{self.model}'을(를) 찾을 수 없고, 전환할 다른 모델도 없습니다.\n\n"
+                    f"📝 .env 파일의 GEMINI_MODEL 설정을 확인해주세요."
+                ) from e
+
+            raise IdeaGenerationError(f"⚠️ 아이디어 생성 중 오류가 발생했습니다: {e}") from e
+
+    async def generate_candidate(
+        self,
+        idea_type: str,
+        exclude_titles: Optional[list[str]] = None,
+        target_age: Optional[str] = None,
+    ) -> Optional[dict]:
+        """
+        검증을 통과한 아이디어 후보를 생성만 하고 기록하지는 않습니다.
+        (사전 생성 버퍼용 - 발송 시점에 record_candidate로 기록)
+
+        Args:
+            idea_type: 아이디어 타입
+            exclude_titles: 히스토리 외에 추가로 피해야 할 제목 (예: 버퍼에 대기 중인 아이디어)
+            target_age: software 타겟 연령대 (미지정 시 무작위)
+
+        Returns:
+            {"idea", "title", "summary", "type"} 또는 확정 실패 시 None
+        """
+        if idea_type == "software" and not target_age:
+            target_age = random.choice(SOFTWARE_AGE_GROUPS)
+        prompt = await self._build_prompt(idea_type, target_age)
+        return await self._generate_with_novelty_checks(
+            base_prompt=prompt,
+            idea_type=idea_type,
+            target_age=target_age or "",
+            exclude_titles=exclude_titles or [],
+        )
+
+    async def generate_ideas_batch(
+        self,
+        segments: list[dict],
+        exclude_titles: Optional[list[str]] = None,
+    ) -> dict[str, Optional[dict]]:
+        """
+        여러 세그먼트의 아이디어를 한 번의 Gemini 호출로 생성합니다.
+        기존 기록 + 같은 배치의 다른 아이디어와 로컬로 중복 검사하고,
+        통과한 후보만 검색 검증을 동시에 수행합니다.
+        배치에서 확정되지 못한 세그먼트는 단건 생성(generate_candidate)으로 보충합니다.
+
+        Args:
+            segments: build_segments()가 만든 세그먼트 목록
+            exclude_titles: 히스토리 외에 추가로 피해야 할 제목
+
+        Returns:
+            {세그먼트 key: 후보 dict 또는 확정 실패 시 None}
+        """
+        results: dict[str, Optional[dict]] = {seg["key"]: None for seg in segments}
+        if not segments:
+            return results
+        if self._budget_exhausted("배치 생성"):
+            return results
+
+        started = time.perf_counter()
+        try:
+            return await self._generate_batch(segments, exclude_titles, results)
+        finally:
+            await asyncio.to_thread(self.budget.record_time, time.perf_counter() - started)
+
+    async def _generate_batch(
+        self,
+        segments: list[dict],
+        exclude_titles: Optional[list[str]],
+        results: dict[str, Optional[dict]],
+    ) -> dict[str, Optional[dict]]:
+        await self._sync_title_index()
+        reserved_titles = list(exclude_titles or [])
+        drafts = await self._generate_batch_drafts(segments)
+
+        # 1~2차 로컬 검사 (배치 내부 제목/요약 중복 포함)
+        survivors: list[tuple[dict, dict]] = []
+        batch_vectors = []
+        for seg in segments:
+            label = f"배치 {seg['key']}"
+            candidate = drafts.get(seg["key"])
+            if candidate is None:
+                metrics.CANDIDATE_REJECTIONS.labels(reason="batch_missing").inc()
+                logger.warning(f"아이디어 재시도 {label}: 배치 응답에 없음")
+                continue
+            metrics.CANDIDATE_ATTEMPTS.inc()
+            checked = await self._check_locally(candidate, reserved_titles, label)
+            if checked["reason"] is not None:
+                continue
+            vector = vectorize(checked["summary"])
+            if any(float(vector @ other) >= settings.semantic_similarity_threshold for other in batch_vectors):
+                metrics.CANDIDATE_REJECTIONS.labels(reason="batch_duplicate").inc()
+                logger.warning(f"아이디어 재시도 {label}: 같은 배치 아이디어와 내용 유사")
+                continue
+            batch_vectors.append(vector)
+            reserved_titles.append(checked["title"])
+            survivors.append((seg, checked))
+
+        # 사전 심사 + 검색 검증은 후보별로 동시에
+        verdicts = await asyncio.gather(
+            *[self._check_remotely(checked, f"배치 {seg['key']}") for seg, checked in survivors]
+        )
+        for (seg, _), verdict in zip(survivors, verdicts):
+            if verdict["reason"] is None:
+                results[seg["key"]] = {**self._strip_internal(verdict), "segment": seg["key"]}
+        logger.info(
+            f"📚 배치 생성: {sum(1 for r in results.values() if r)}/{len(segments)}개 세그먼트 확정"
+        )
+
+        # 남은 세그먼트는 단건 생성으로 보충 (확정된 제목은 피하도록 순차 진행)
+        for seg in segments:
+            if results[seg["key"]] is not None:
+                continue
+            if self._budget_exhausted("배치 보충 생성"):
+                break
+            candidate = await self.generate_candidate(
+                seg["type"],
+                exclude_titles=reserved_titles,
+                target_age=seg["target_age"] or None,
+            )
+            if candidate is not None:
+                candidate["segment"] = seg["key"]
+                reserved_titles.append(candidate["title"])
+            results[seg["key"]] = candidate
+        return results
+
+    async def _generate_batch_drafts(self, segments: list[dict]) -> dict[str, dict]:
+        """배치 프롬프트 1회 호출 (BatchIdea 배열 스키마) -> {세그먼트 key: 검증 전 후보}"""
+        prompt = await self._build_batch_prompt(segments)
+        try:
+            response = await self._call_model(
+                stage="generate_batch",
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    temperature=0.9,
+                    response_mime_type="application/json",
+                    response_schema=list[BatchIdea],
+                ),
+            )
+        except asyncio.TimeoutError:
+            logger.warning("📚 배치 생성 시간 초과, 세그먼트별 단건 생성으로 보충")
+            return {}
+        except Exception as e:
+            if self._is_model_not_found(e):
+                raise
+            logger.warning(f"📚 배치 생성 실패({type(e).__name__}), 세그먼트별 단건 생성으로 보충")
+            return {}
+
+        try:
+            items = response.parsed
+            if not isinstance(items, list):
+                items = BATCH_ADAPTER.validate_json(response.text or "")
+        except ValidationError as e:
+            logger.warning(
+                f"📚 배치 응답 스키마 불일치({e.error_count()}건), 세그먼트별 단건 생성으로 보충: "
+                f"{e.errors()[0]['msg']}"
+            )
+            return {}
+
+        by_key = {seg["key"]: seg for seg in segments}
+        drafts: dict[str, dict] = {}
+        for item in items:
+            seg = by_key.get(item.segment.strip())
+            if seg is not None and seg["key"] not in drafts:
+                drafts[seg["key"]] = self._to_candidate(item.idea, seg["type"], seg["target_age"])
+        return drafts
+
+    async def _build_batch_prompt(self, segments: list[dict]) -> str:
+        """세그먼트 여러 개를 한 번에 요청하는 프롬프트"""
+        queries = dict.fromkeys(self._segment_query(seg["type"], seg["target_age"]) for seg in segments)
+        recent_context, summary_file_context = await self._build_context_sections(" ".join(queries))
+
+        segment_lines = []
+        for seg in segments:
+            if seg["type"] == "software":
+                segment_lines.append(
+                    f'- "{seg["key"]}": {seg["target_age"]} 한국인의 실제 불편함(Pain Point)을 해결하는 '
+                    f"웹/앱 서비스. 하드웨어 없이 주말에 혼자 MVP 가능, 한국 특화, "
+                    f"수익화 가능성이나 유저 확보 전략 포함 -> [소프트웨어 필드]"
+                )
+            else:
+                segment_lines.append(
+                    f'- "{seg["key"]}": 재미있고 신박한 토이 프로젝트 (하드웨어, IoT, SW 결합 환영), '
+                    f"유머러스하거나 실용적인 동기 포함 -> [Maker 필드]"
+                )
+
+        fields = []
+        if any(seg["type"] == "software" for seg in segments):
+            fields.append("[소프트웨어 필드]\n" + SOFTWARE_FIELDS)
+        if any(seg["type"] != "software" for seg in segments):
+            fields.append("[Maker 필드]\n" + MAKER_FIELDS)
+        field_text = "\n\n".join(fields)
+        segment_text = "\n".join(segment_lines)
+
+        return f"""당신은 개발자들에게 영감을 주는 프로젝트 아이디어 기획 전문가입니다.
+아래 {len(segments)}개 세그먼트마다 아이디어를 하나씩 기획하세요.
+{recent_context}
+{summary_file_context}
+
+**세그먼트:**
+{segment_text}
+
+**공통 규칙:**
+1. 기존 아이디어 요약 파일과 제목/핵심 해결 방식이 겹치면 안 됨
+2. 이미 널리 알려진 기존 서비스(국내/해외 상용 서비스)를 단순 복제한 아이디어는 금지
+3. 같은 응답 안의 다른 세그먼트 아이디어와도 주제/해결 방식이 겹치면 안 됨
+
+**idea 필드 안내:**
+
+{field_text}
+
+---
+세그먼트마다 segment(세그먼트 키)와 idea를 담아 배열로 응답하세요."""
+
+    async def record_candidate(self, candidate: dict):
+        """발송할 아이디어를 히스토리 + 요약 파일에 기록 (파일 I/O는 스레드에서)"""
+        title = candidate["title"]
+        idea_type = candidate["type"]
+        await asyncio.to_thread(self.storage.record, title, idea_type, candidate["summary"])
+        self.title_index.add(title)
+
+    async def is_still_novel(self, candidate: dict) -> bool:
+        """
+        사전 생성된 후보를 생성 이후 기록된 아이디어들과 다시 비교합니다.
+        (즉시 생성과 같은 네트워크 호출 없는 로컬 검사: 정확 일치 -> 제목 유사도 -> 요약 본문 유사도)
+        """
+        await self._sync_title_index()
+        result = await self._check_locally(
+            {**candidate, "summary": candidate.get("summary", "")}, (), "(버퍼)"
+        )
+        return result["reason"] is None
+
+    @staticmethod
+    def _segment_query(idea_type: str, target_age: str) -> str:
+        """관련 기존 요약을 고를 때 쓰는 세그먼트 질의"""
+        if idea_type == "software":
+            return f"{target_age} 한국인 생활 불편함 해결 웹 앱 서비스"
+        return "하드웨어 IoT 자동화 센서 AI 토이 프로젝트"
+
+    async def _build_context_sections(self, segment_query: str) -> tuple[str, str]:
+        """
+        최근 아이디어 목록 + 질의와 관련도 높은 기존 요약 (중복 방지용, 토큰 예산 내)
+
+        Returns:
+            (최근 제목 섹션, 기존 요약 섹션)
         """
-        # 최근 아이디어 목록 가져오기 (중복 방지용)
         recent_ideas = self.history.get_recent_titles()
-        summary_context = self.summary_store.get_recent_context(limit=80)
+        context = await asyncio.to_thread(self.context_builder.build, segment_query)
+        summary_context = context["text"]
         recent_context = ""
         if recent_ideas:
             recent_context = f"\n**제외할 이전 아이디어들 (중복 절대 금지):**\n" + "\n".join([f"- {t}" for t in recent_ideas])
@@ -101,12 +461,20 @@ class IdeaGenerator:
                 "\n**기존 아이디어 요약 파일 내용 (유사/중복 절대 금지):**\n"
                 f"{summary_context}\n"
             )
+        return recent_context, summary_file_context
+
+    async def _build_prompt(self, idea_type: str, target_age: Optional[str] = None) -> str:
+        """아이디어 타입별 생성 프롬프트를 만듭니다. (software는 target_age 미지정 시 무작위)"""
+        if idea_type == "software":
+            target_age = target_age or random.choice(SOFTWARE_AGE_GROUPS)
+        else:
+            target_age = ""
+        recent_context, summary_file_context = await self._build_context_sections(
+            self._segment_query(idea_type, target_age)
+        )
         
         if idea_type == "software":
             # SW 전용 (한국인 페인포인트)
-            age_groups = ["20대", "30대"]
-            target_age = random.choice(age_groups)
-            
             prompt = f"""당신은 한국인의 실제 불편함을 해결하는 소프트웨어 서비스 기획 전문가입니다.
 
 **타겟 유저:** {target_age} 한국인
@@ -125,31 +493,11 @@ class IdeaGenerator:
 5. 기존 아이디어 요약 파일과 제목/핵심 해결 방식이 겹치면 안 됨
 6. 이미 널리 알려진 기존 서비스(국내/해외 상용 서비스)를 단순 복제한 아이디어는 금지
 
-**응답 형식:**
-
-영감봇 (소프트웨어 ver.)
-**프로젝트 이름:** "프로젝트명" ({target_age} 타겟)
-
-**타겟의 불편함:**
-(구체적인 상황 묘사와 실제 겪는 문제점)
-
-**해결 솔루션:**
-(웹/앱으로 어떻게 해결하는지)
-
-**핵심 기능:**
-1. 기능1
-2. 기능2
-
-**기술 스택:**
-- 프론트엔드/모바일:
-- 백엔드/DB:
-- 주요 API/라이브러리:
-
-**기대 효과:**
-(사용자가 얻는 이득)
+**응답 필드:**
+{SOFTWARE_FIELDS}
 
 ---
-위 형식으로 아이디어를 생성해주세요."""
+위 필드로 아이디어를 생성해주세요."""
 
         else:
             # 기존 Mixed (하드웨어+SW)
@@ -167,97 +515,262 @@ class IdeaGenerator:
 5. 기존 아이디어 요약 파일과 겹치거나 핵심 메커니즘이 유사하면 안 됨
 6. 이미 상용화/대중화된 서비스의 단순 모방은 금지
 
-**응답 형식:**
-
-영감봇 (Maker ver.)
-**프로젝트 이름:** "프로젝트명"
+**응답 필드:**
+{MAKER_FIELDS}
 
-**한 줄 설명:** 이 프로젝트가 무엇인지 한 문장으로 설명
-
-**왜 이걸 만들어?** 재미있거나 공감가는 동기 설명
+---
+아이디어를 생성해주세요."""
 
-**어떻게 작동해?** 구체적인 작동 원리 설명 (2-4문장)
+        return prompt
 
-**기술 스택:**
-- 기술1 (용도)
-- 기술2 (용도)
-- 기술3 (용도)
+    @staticmethod
+    def _to_candidate(draft: IdeaDraft, idea_type: str, target_age: str) -> dict:
+        """구조화된 응답 -> 후보 dict (발송 텍스트는 필드로부터 로컬 렌더링)"""
+        return {
+            "idea": render_idea(draft, idea_type, target_age),
+            "title": clean_title(draft.title),
+            "summary": short_summary(draft),
+            "type": idea_type,
+        }
 
-**예상 개발 시간:** N시간
+    @staticmethod
+    def _strip_internal(result: dict) -> dict:
+        """검사용 내부 필드(reason, stage)를 뺀 후보 dict"""
+        return {key: value for key, value in result.items() if key not in ("reason", "stage")}
 
----
-아이디어를 생성해주세요."""
-
-        return await self._generate_with_novelty_checks(
-            base_prompt=prompt,
-            idea_type=idea_type,
-            summary_context=summary_context,
-        )
+    def _budget_exhausted(self, step: str) -> bool:
+        """일일 예산 또는 Gemini 일일 쿼터(RPD/TPD)를 다 썼으면 로그/메트릭을 남기고 True"""
+        resource = self.budget.exhausted()
+        if resource is None and self._quota_applies():
+            resource = {"requests": "rpd", "tokens": "tpd"}.get(self.quota.day_exhausted())
+        if resource is None:
+            return False
+        metrics.GEMINI_BUDGET_STOPS.labels(resource=resource).inc()
+        logger.warning(f"💸 일일 예산({resource}) 소진: {step} 생략")
+        return True
 
-    def _normalize_text(self, value: str) -> str:
-        cleaned = re.sub(r"\s+", "", value.lower())
-        return re.sub(r"[^\w가-힣]", "", cleaned)
-
-    def _extract_title(self, idea: str) -> str:
-        match = re.search(r'\*\*프로젝트 이름:\*\*\s*"([^"]+)"', idea)
-        if match:
-            return match.group(1).strip()
-        fallback = re.search(r"\*\*프로젝트 이름:\*\*\s*(.+)", idea)
-        if fallback:
-            return fallback.group(1).strip().strip('"')
-        return ""
-
-    def _extract_short_summary(self, idea: str) -> str:
-        one_line = re.search(r"\*\*한 줄 설명:\*\*\s*(.+)", idea)
-        if one_line:
-            return one_line.group(1).strip()[:180]
-
-        solution = re.search(
-            r"\*\*해결 솔루션:\*\*\s*(.+?)(?:\n\s*\n|\n\*\*)",
-            idea,
-            flags=re.DOTALL,
+    async def _sync_title_index(self):
+        """
+        제목 인덱스를 히스토리 + 요약 파일과 동기화합니다.
+        요약 파일은 마지막 동기화 이후 추가된 항목만 인덱싱합니다.
+        """
+        total = await asyncio.to_thread(self.summary_store.get_entry_count)
+        if total < self._indexed_summary_count:
+            # 요약 파일이 줄어들었으면 (수동 편집 등) 전체 재구성
+            self.title_index = TitleIndex()
+            self._indexed_summary_count = 0
+        new_entries = await asyncio.to_thread(
+            self.summary_store.get_entries, self._indexed_summary_count
         )
-        if solution:
-            text = " ".join(solution.group(1).split())
-            return text[:180]
+        self.title_index.add_many(self.history.get_recent_titles(limit=120))
+        self.title_index.add_many(e["title"] for e in new_entries)
+        self._indexed_summary_count += len(new_entries)
 
-        lines = [ln.strip() for ln in idea.splitlines() if ln.strip()]
-        if len(lines) > 3:
-            return lines[3][:180]
-        return idea[:180]
+    def _is_too_similar(self, title: str, extra_titles: Iterable[str] = ()) -> bool:
+        """인덱스된 기존 제목 + 추가 제목(버퍼 대기 중 등)과의 유사 여부"""
+        if self.title_index.find_similar(title) is not None:
+            return True
 
-    def _is_too_similar(self, title: str, candidates: list[str]) -> bool:
-        norm_title = self._normalize_text(title)
+        norm_title = normalize_title(title)
         if not norm_title:
             return False
-
-        for existing in candidates:
-            norm_existing = self._normalize_text(existing)
-            if not norm_existing:
-                continue
-            if norm_title == norm_existing:
-                return True
-            ratio = SequenceMatcher(None, norm_title, norm_existing).ratio()
-            if ratio >= 0.82:
+        for existing in extra_titles:
+            norm_existing = normalize_title(existing)
+            if norm_existing and title_similarity(norm_title, norm_existing) >= SIMILARITY_THRESHOLD:
                 return True
         return False
 
-    def _extract_json_object(self, text: str) -> dict:
-        content = text.strip()
-        block = re.search(r"\{.*\}", content, flags=re.DOTALL)
-        if block:
-            content = block.group(0)
-        return json.loads(content)
+    async def _call_model(
+        self,
+        contents: str,
+        config: types.GenerateContentConfig,
+        stage: str,
+        model: Optional[str] = None,
+    ):
+        """
+        비동기 Gemini 클라이언트로 호출합니다. (이벤트 루프 블로킹 없음)
+
+        - 현재 모델이 느리면(스테이지별 지연 percentile 초과) 폴백 모델로 헤지 요청을 보내 먼저 온 응답 사용
+        - 429/5xx/타임아웃이면 폴백 체인의 다음 모델로 재시도 (반복되면 해당 모델 서킷 차단)
+        - 모델 404 시 ModelRegistry의 다음 후보 모델로 전환해 재시도
+        - model을 직접 지정한 호출은 헤지/전환 없이 예외 발생
+        모든 모델이 실패하면 마지막 예외(타임아웃이면 asyncio.TimeoutError)를 그대로 발생시킵니다.
+        stage(generate | screen | validate)별 지연 시간과 토큰 사용량을 기록합니다.
+        """
+        started = time.perf_counter()
+        try:
+            if model is not None:
+                response = await self._send_request(model, contents, config, stage)
+            else:
+                response = await self._call_with_fallback(contents, config, stage)
+        finally:
+            metrics.GEMINI_LATENCY.labels(stage=stage).observe(time.perf_counter() - started)
+        metrics.record_usage(stage, response)
+        return response
+
+    async def _call_with_fallback(self, contents: str, config: types.GenerateContentConfig, stage: str):
+        """현재 모델 -> 폴백 모델 순서로 호출 (서킷이 차단한 모델은 건너뜀)"""
+        chain = self.router.chain(self.model)
+        if not chain:
+            raise CircuitOpenError(f"모든 Gemini 서킷이 열려 있음 ({self.model})")
+        index = 0
+        last_error: Optional[Exception] = None
+        while index < len(chain):
+            model = chain[index]
+            hedge = chain[index + 1] if index + 1 < len(chain) else None
+            try:
+                response, served_by = await self._hedged_request(model, hedge, contents, config, stage)
+                if served_by != self.model:
+                    metrics.GEMINI_FALLBACKS.labels(stage=stage, model=served_by).inc()
+                return response
+            except Exception as e:
+                last_error = e
+                # 현재 모델이 사라진 경우 다음 후보 모델을 기준으로 체인을 다시 구성
+                if self._is_model_not_found(e) and model == self.model:
+                    next_model = self.model_registry.next_model(failed=model)
+                    if next_model:
+                        chain, index = self.router.chain(next_model), 0
+                        if not chain:
+                            raise CircuitOpenError(f"모든 Gemini 서킷이 열려 있음 ({next_model})")
+                        continue
+                    raise
+                if not (is_transient(e) or self._is_model_not_found(e)):
+                    raise
+                if index + 1 < len(chain):
+                    logger.warning(f"🔀 {model} 호출 실패({type(e).__name__}), {chain[index + 1]}로 재시도")
+                index += 1
+        raise last_error
+
+    async def _hedged_request(
+        self,
+        model: str,
+        hedge: Optional[str],
+        contents: str,
+        config: types.GenerateContentConfig,
+        stage: str,
+    ) -> tuple:
+        """
+        model로 요청하고, 스테이지 지연 percentile 안에 응답이 없으면 hedge 모델로 같은 요청을 추가로 보냅니다.
+        먼저 성공한 응답을 쓰고 나머지 요청은 취소합니다.
+
+        Returns:
+            (응답, 응답한 모델)
+        """
+        delay = self.router.hedge_delay(stage) if hedge else None
+        tasks = {asyncio.create_task(self._send_request(model, contents, config, stage)): model}
+        try:
+            if delay is not None:
+                done, _ = await asyncio.wait(set(tasks), timeout=delay)
+                if not done and self._quota_applies() and not self.quota.has_headroom(
+                    self.quota.estimate(stage, contents, config)
+                ):
+                    # 헤지는 없어도 되는 호출이므로 쿼터 여유가 없으면 보내지 않음
+                    logger.debug(f"⏱️ {stage} 헤지 생략 (Gemini 쿼터 여유 없음)")
+                elif not done:
+                    metrics.GEMINI_HEDGES.labels(stage=stage, result="launched").inc()
+                    logger.info(f"⏱️ {stage} 응답이 {delay:.1f}초(p{settings.gemini_hedge_percentile * 100:.0f})를 넘어 {hedge}로 헤지 요청")
+                    tasks[asyncio.create_task(self._send_request(hedge, contents, config, stage))] = hedge
+
+            pending = set(tasks)
+            first_error: Optional[Exception] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if tasks[task] == hedge:
+                            metrics.GEMINI_HEDGES.labels(stage=stage, result="won").inc()
+                        return task.result(), tasks[task]
+                    first_error = first_error or task.exception()
+            raise first_error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
-    def _validate_novelty_with_search(
+    async def _send_request(self, model: str, contents: str, config: types.GenerateContentConfig, stage: str):
+        """
+        단일 모델 요청 1회 (타임아웃 초과 시 asyncio.TimeoutError)
+        쿼터 발급을 기다린 뒤 호출하고, 결과를 서킷/지연 통계에 반영하며,
+        호출 수/토큰은 일일 예산에 누적합니다.
+        """
+        # half_open 모델은 실제로 보내는 요청만 시험 요청 자리를 차지
+        if not self.router.begin(model):
+            raise CircuitOpenError(f"{model} 서킷이 요청을 허용하지 않음")
+        use_quota = self._quota_applies()
+        estimated = self.quota.estimate(stage, contents, config)
+        try:
+            if use_quota:
+                await self.quota.acquire(stage, estimated)
+        except BaseException:
+            self.router.release(model)
+            raise
+        started = time.perf_counter()
+        response = None
+        try:
+            response = await self.transport.call(
+                stage,
+                gemini_request(contents, config),
+                lambda: asyncio.wait_for(
+                    self.client.aio.models.generate_content(
+                        model=model,
+                        contents=contents,
+                        config=config,
+                    ),
+                    timeout=settings.gemini_timeout_seconds,
+                ),
+                encode=encode_gemini,
+                decode=decode_gemini,
+            )
+        except asyncio.CancelledError:
+            # 헤지에서 진 요청 등: 모델 상태와 무관
+            self.router.release(model)
+            raise
+        except Exception as e:
+            metrics.GEMINI_ERRORS.labels(stage=stage, error=type(e).__name__).inc()
+            self.router.record_failure(model, e)
+            if use_quota and getattr(e, "code", None) == 429:
+                self.quota.throttled()
+            raise
+        finally:
+            if use_quota:
+                await self.quota.settle(stage, estimated, response)
+            usage = getattr(response, "usage_metadata", None)
+            await asyncio.to_thread(
+                self.budget.record_call, getattr(usage, "total_token_count", None) or 0
+            )
+            for resource, used in self.budget.get_usage().items():
+                if resource != "date":
+                    metrics.GEMINI_BUDGET_USED.labels(resource=resource).set(used)
+        self.router.record_success(model, stage, time.perf_counter() - started)
+        return response
+
+    async def _validate_novelty_with_search(
         self,
         idea: str,
         title: str,
-        summary_context: str,
+        summary: str,
     ) -> dict:
         """
         Gemini 검색 도구를 사용해 중복/기존 서비스 여부를 검증합니다.
+        이미 판정한 적 있는 후보(제목+요약 지문)는 캐시된 판정을 사용합니다.
+
+        검색 도구(grounding)와 응답 스키마는 함께 쓸 수 없어 JSON은 텍스트로 받고,
+        NoveltyVerdict 모델로 검증합니다.
         """
+        cache_key = fingerprint(title, summary)
+        cached = self.novelty_cache.get(cache_key)
+        stats = self.novelty_cache.get_stats()
+        if cached is not None:
+            metrics.NOVELTY_CACHE_LOOKUPS.labels(result="hit").inc()
+            logger.info(f"🗃️ 신규성 판정 캐시 적중: {title} (hit {stats['hits']} / miss {stats['misses']})")
+            return cached
+        metrics.NOVELTY_CACHE_LOOKUPS.labels(result="miss").inc()
+
+        # 검증 대상과 관련도 높은 기존 요약만 토큰 예산 내에서 포함
+        context = await asyncio.to_thread(self.context_builder.build, f"{title} {summary}")
+        summary_context = context["text"]
+
         validate_prompt = f"""아래 프로젝트 아이디어가 '새로운 아이디어'인지 엄격히 심사하세요.
 
 검사 기준:
@@ -278,8 +791,8 @@ class IdeaGenerator:
 {{"is_novel": true/false, "reason": "판정 이유", "similar_examples": ["유사 서비스1", "유사 서비스2"]}}"""
 
         try:
-            response = self.client.models.generate_content(
-                model=self.model,
+            response = await self._call_model(
+                stage="validate",
                 contents=validate_prompt,
                 config=types.GenerateContentConfig(
                     temperature=0.1,
@@ -290,17 +803,17 @@ class IdeaGenerator:
                     ],
                 ),
             )
-            parsed = self._extract_json_object(response.text or "")
-            is_novel = bool(parsed.get("is_novel", False))
-            reason = str(parsed.get("reason", "")).strip()
-            examples = parsed.get("similar_examples", [])
-            if not isinstance(examples, list):
-                examples = []
-            return {
-                "is_novel": is_novel,
-                "reason": reason or "검증 결과 사유 미제공",
-                "similar_examples": [str(x) for x in examples][:5],
+            parsed = parse_verdict(response.text or "")
+            if parsed is None:
+                raise ValueError("응답에서 판정 JSON을 찾을 수 없음")
+            verdict = {
+                "is_novel": parsed.is_novel,
+                "reason": parsed.reason.strip() or "검증 결과 사유 미제공",
+                "similar_examples": [str(x) for x in parsed.similar_examples][:5],
             }
+            # 폴백 판정은 캐시하지 않음 (실제 검색 결과만 저장)
+            await asyncio.to_thread(self.novelty_cache.put, cache_key, verdict)
+            return verdict
         except Exception as e:
             # 검색 검증 실패 시, 발송 중단보다는 생성 흐름 유지
             logger.warning(f"검색 기반 신규성 검증 실패(폴백): {e}")
@@ -310,94 +823,304 @@ class IdeaGenerator:
                 "similar_examples": [],
             }
 
+    async def _try_candidate(
+        self,
+        prompt: str,
+        extra_titles: list[str],
+        label: str,
+        idea_type: str,
+        target_age: str,
+    ) -> dict:
+        """
+        후보 아이디어 1개를 생성(IdeaDraft 스키마)하고 로컬/검색 검증까지 수행합니다.
+        반환 dict의 reason이 None이면 통과, 아니면 탈락 사유입니다.
+        """
+        metrics.CANDIDATE_ATTEMPTS.inc()
+        try:
+            response = await self._call_model(
+                stage="generate",
+                contents=prompt,
+                config=types.GenerateContentConfig(
+                    temperature=0.9,
+                    response_mime_type="application/json",
+                    response_schema=IdeaDraft,
+                ),
+            )
+        except asyncio.TimeoutError:
+            metrics.CANDIDATE_REJECTIONS.labels(reason="timeout").inc()
+            logger.warning(f"아이디어 재시도 {label}: 생성 시간 초과")
+            return {"idea": "", "title": "", "reason": "생성 응답 시간 초과", "stage": None}
+        except Exception as e:
+            if self._is_model_not_found(e):
+                raise
+            # 폴백 체인까지 모두 실패 (429/5xx 등) -> 이번 후보만 탈락
+            metrics.CANDIDATE_REJECTIONS.labels(reason="model_error").inc()
+            logger.warning(f"아이디어 재시도 {label}: 모델 호출 실패 - {type(e).__name__}")
+            return {"idea": "", "title": "", "reason": "모델 호출 오류", "stage": None}
+
+        try:
+            draft = response.parsed
+            if not isinstance(draft, IdeaDraft):
+                draft = IdeaDraft.model_validate_json(response.text or "")
+        except ValidationError as e:
+            metrics.CANDIDATE_REJECTIONS.labels(reason="schema").inc()
+            logger.warning(f"아이디어 재시도 {label}: 응답 스키마 불일치 - {e.errors()[0]['msg']}")
+            return {"idea": "", "title": "", "reason": "응답 형식 오류", "stage": None}
+
+        candidate = self._to_candidate(draft, idea_type, target_age)
+        result = await self._check_locally(candidate, extra_titles, label)
+        if result["reason"] is not None:
+            return result
+        return await self._check_remotely(result, label)
+
+    async def _check_locally(
+        self,
+        candidate: dict,
+        extra_titles: Iterable[str],
+        label: str,
+    ) -> dict:
+        """
+        네트워크 호출 없는 단계: 정확 일치(해시) -> 제목 유사도 -> 요약 본문 유사도
+        반환 dict의 stage는 탈락한 단계 (통과 시 마지막 로컬 단계)
+        """
+        title = candidate["title"]
+
+        if not title:
+            metrics.CANDIDATE_REJECTIONS.labels(reason="title_extraction").inc()
+            logger.warning(f"아이디어 재시도 {label}: 프로젝트 이름 없음")
+            return {**candidate, "reason": "프로젝트 이름 없음", "stage": None}
+
+        # 1차: 정확히 같은 제목 / 이미 검색 검증에서 탈락한 후보 (해시 조회)
+        norm_title = normalize_title(title)
+        if title in self.title_index or any(normalize_title(t) == norm_title for t in extra_titles):
+            metrics.CANDIDATE_REJECTIONS.labels(reason="exact_duplicate").inc()
+            logger.warning(f"아이디어 재시도 {label}: 같은 제목 존재")
+            return {**candidate, "reason": f"기존 아이디어와 같은 제목: {title}", "stage": "exact"}
+        cached = self.novelty_cache.peek(fingerprint(title, candidate["summary"]))
+        if cached is not None and not cached["is_novel"]:
+            metrics.CANDIDATE_REJECTIONS.labels(reason="exact_duplicate").inc()
+            logger.warning(f"아이디어 재시도 {label}: 이미 탈락 판정된 후보")
+            return {**candidate, "reason": cached["reason"], "stage": "exact"}
+
+        # 2차: 제목 유사도 검사
+        if self._is_too_similar(title, extra_titles):
+            metrics.CANDIDATE_REJECTIONS.labels(reason="title_similarity").inc()
+            logger.warning(f"아이디어 재시도 {label}: 제목 유사도 탈락")
+            return {**candidate, "reason": f"기존 아이디어와 제목 유사: {title}", "stage": "title"}
+
+        # 3차: 요약 본문 의미 유사도 검사 (오프라인)
+        duplicate = await asyncio.to_thread(
+            self.summary_store.find_similar_summary,
+            candidate["summary"],
+            settings.semantic_similarity_threshold,
+        )
+        if duplicate:
+            metrics.CANDIDATE_REJECTIONS.labels(reason="semantic_similarity").inc()
+            logger.warning(f"아이디어 재시도 {label}: 내용 유사도 탈락 ({duplicate['title']}, {duplicate['score']})")
+            return {
+                **candidate,
+                "reason": f"기존 아이디어와 해결 방식 유사: {duplicate['title']}",
+                "stage": "semantic",
+            }
+
+        return {**candidate, "reason": None, "stage": "semantic"}
+
+    async def _check_remotely(self, result: dict, label: str) -> dict:
+        """
+        로컬 검사를 통과한 후보의 원격 단계: 저비용 사전 심사 -> 검색 검증
+        일일 예산이 떨어지면 남은 단계를 건너뛰고 stage="budget"으로 표시합니다.
+        (탈락은 아니므로 reason은 채우되 예산 소진 시 대체 후보로 사용 가능)
+        """
+        for stage, check in (("screen", self._check_with_screen), ("search", self._check_with_search)):
+            if self._budget_exhausted(f"{label} {stage} 단계"):
+                return {**result, "reason": "일일 예산 소진으로 검증 생략", "stage": "budget"}
+            result = await check(result, label)
+            if result["reason"] is not None:
+                return result
+        return result
+
+    async def _check_with_screen(self, result: dict, label: str) -> dict:
+        """
+        4차: 저비용 모델 사전 심사 (NOVELTY_SCREEN_MODEL 설정 시)
+        검색 없이 널리 알려진 서비스의 복제인지만 빠르게 거르고, 실패하면 통과시킵니다.
+        """
+        if not settings.novelty_screen_model:
+            return {**result, "stage": "screen"}
+
+        screen_prompt = f"""아래 프로젝트 아이디어가 이미 널리 알려진 서비스/제품의 단순 복제인지 판정하세요.
+확실히 알려진 서비스와 본질적으로 같을 때만 is_novel=false로 판정하세요.
+
+제목: {result["title"]}
+요약: {result["summary"]}"""
+
+        try:
+            response = await self._call_model(
+                stage="screen",
+                model=settings.novelty_screen_model,
+                contents=screen_prompt,
+                config=types.GenerateContentConfig(
+                    temperature=0.1,
+                    max_output_tokens=256,
+                    response_mime_type="application/json",
+                    response_schema=NoveltyVerdict,
+                ),
+            )
+            verdict = response.parsed
+            if not isinstance(verdict, NoveltyVerdict):
+                verdict = NoveltyVerdict.model_validate_json(response.text or "")
+        except Exception as e:
+            logger.warning(f"사전 심사 실패(통과 처리): {e}")
+            return {**result, "stage": "screen"}
+
+        if not verdict.is_novel:
+            examples = ", ".join(verdict.similar_examples) if verdict.similar_examples else "없음"
+            reason = f"{verdict.reason.strip() or '사전 심사 탈락'} (유사 예시: {examples})"
+            metrics.CANDIDATE_REJECTIONS.labels(reason="screen_verdict").inc()
+            logger.warning(f"아이디어 재시도 {label}: 사전 심사 탈락 - {reason}")
+            return {**result, "reason": reason, "stage": "screen"}
+        return {**result, "stage": "screen"}
+
+    async def _check_with_search(self, result: dict, label: str) -> dict:
+        """5차: 검색 기반 신규성 검사 (앞 단계를 모두 통과한 후보)"""
+        novelty = await self._validate_novelty_with_search(
+            idea=result["idea"],
+            title=result["title"],
+            summary=result["summary"],
+        )
+        if not novelty["is_novel"]:
+            examples = ", ".join(novelty["similar_examples"]) if novelty["similar_examples"] else "없음"
+            reason = f"{novelty['reason']} (유사 예시: {examples})"
+            metrics.CANDIDATE_REJECTIONS.labels(reason="search_verdict").inc()
+            logger.warning(f"아이디어 재시도 {label}: 검색 검증 탈락 - {reason}")
+            return {**result, "reason": reason, "stage": "search"}
+
+        return {**result, "reason": None, "stage": "search"}
+
+    async def _run_candidate_round(
+        self,
+        prompt: str,
+        extra_titles: list[str],
+        count: int,
+        round_label: str,
+        rejected: list[dict],
+        idea_type: str,
+        target_age: str,
+    ) -> Optional[dict]:
+        """
+        후보 count개를 동시에 생성/검증하고 가장 먼저 통과한 후보를 반환합니다.
+        승자가 나오면 나머지 후보는 취소하며, 탈락한 후보는 rejected에 누적합니다.
+        """
+        tasks = [
+            asyncio.create_task(
+                self._try_candidate(
+                    prompt,
+                    extra_titles,
+                    label=f"{round_label} #{i + 1}" if count > 1 else round_label,
+                    idea_type=idea_type,
+                    target_age=target_age,
+                )
+            )
+            for i in range(count)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result["reason"] is None:
+                    return result
+                rejected.append(result)
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     async def _generate_with_novelty_checks(
         self,
         base_prompt: str,
         idea_type: str,
-        summary_context: str,
+        target_age: str,
+        exclude_titles: list[str],
         max_attempts: int = 4,
-    ) -> str:
-        rejected_reasons: list[str] = []
+    ) -> Optional[dict]:
+        """
+        라운드 단위로 후보를 생성하고 단계별 신규성 검사를 통과한 첫 후보를 반환합니다.
 
-        try:
-            for attempt in range(1, max_attempts + 1):
-                retry_context = ""
-                if rejected_reasons:
-                    retry_context = (
-                        "\n\n**이전 시도 탈락 사유 (반드시 회피):**\n"
-                        + "\n".join([f"- {r}" for r in rejected_reasons[-5:]])
-                    )
-
-                response = self.client.models.generate_content(
-                    model=self.model,
-                    contents=base_prompt + retry_context,
-                    config=types.GenerateContentConfig(temperature=0.9),
-                )
-                idea = (response.text or "").strip()
-                title = self._extract_title(idea)
-
-                if not title:
-                    rejected_reasons.append("프로젝트 이름 추출 실패")
-                    logger.warning(f"아이디어 재시도 {attempt}/{max_attempts}: 제목 추출 실패")
-                    continue
-
-                # 1차: 로컬 유사도 검사
-                history_titles = self.history.get_recent_titles(limit=120)
-                summary_titles = self.summary_store.get_all_titles()
-                title_pool = list(set(history_titles + summary_titles))
-                if self._is_too_similar(title, title_pool):
-                    rejected_reasons.append(f"기존 아이디어와 제목 유사: {title}")
-                    logger.warning(f"아이디어 재시도 {attempt}/{max_attempts}: 제목 유사도 탈락")
-                    continue
-
-                # 2차: 검색 기반 신규성 검사
-                novelty = self._validate_novelty_with_search(
-                    idea=idea,
-                    title=title,
-                    summary_context=summary_context,
+        일일 예산(호출/토큰/소요 시간)이 떨어지면 다음 라운드를 시작하지 않고,
+        로컬 중복 검사를 통과한 후보 중 가장 멀리 간 후보를 대신 반환합니다.
+        (첫 라운드는 발송할 아이디어가 있어야 하므로 예산과 무관하게 실행)
+        """
+        rejected: list[dict] = []
+        # 라운드마다 후보 K개를 병렬 생성 (전체 후보 수는 max_attempts 기준 유지)
+        parallel = max(1, settings.parallel_candidates)
+        max_rounds = max(1, math.ceil(max_attempts / parallel))
+
+        launched = 0
+        budget_stopped = False
+
+        for round_no in range(1, max_rounds + 1):
+            if round_no > 1 and self._budget_exhausted(f"{round_no}/{max_rounds} 라운드"):
+                budget_stopped = True
+                break
+
+            retry_context = ""
+            if rejected:
+                retry_context = (
+                    "\n\n**이전 시도 탈락 사유 (반드시 회피):**\n"
+                    + "\n".join([f"- {r['reason']}" for r in rejected[-5:]])
                 )
-                if not novelty["is_novel"]:
-                    examples = ", ".join(novelty["similar_examples"]) if novelty["similar_examples"] else "없음"
-                    reason = f"{novelty['reason']} (유사 예시: {examples})"
-                    rejected_reasons.append(reason)
-                    logger.warning(f"아이디어 재시도 {attempt}/{max_attempts}: 검색 검증 탈락 - {reason}")
-                    continue
-
-                # 통과: 히스토리 + 요약 파일 저장
-                self.history.record_idea(title, idea_type)
-                summary = self._extract_short_summary(idea)
-                self.summary_store.append_summary(title, idea_type, summary)
-                logger.success(f"💡 새로운 아이디어 생성 완료 ({idea_type})")
-                return idea
-
-            return (
-                "⚠️ 오늘은 기존 아이디어와 겹치지 않는 새 아이디어를 확정하지 못했습니다.\n\n"
-                "내일 다시 더 엄격한 기준으로 새로운 아이디어를 탐색해보겠습니다."
-            )
 
-        except Exception as e:
-            error_msg = str(e)
-            logger.error(f"❌ 아이디어 생성 실패: {error_msg}")
+            await self._sync_title_index()
 
-            if "404" in error_msg or "not found" in error_msg.lower():
-                best_model = self._get_best_model()
-                return (
-                    f"⚠️ 아이디어 생성 중 오류가 발생했습니다!\n\n"
-                    f"에러: 404 NOT_FOUND\n"
-                    f"현재 모델 '{self.model}'을(를) 찾을 수 없습니다.\n\n"
-                    f"🔄 최신 모델 '{best_model}'(으)로 변경해주세요!\n\n"
-                    f"📝 .env 파일 수정 필요:\n"
-                    f"GEMINI_MODEL={best_model}"
+            launched += parallel
+            started = time.perf_counter()
+            try:
+                winner = await self._run_candidate_round(
+                    prompt=base_prompt + retry_context,
+                    extra_titles=exclude_titles,
+                    count=parallel,
+                    round_label=f"{round_no}/{max_rounds}",
+                    rejected=rejected,
+                    idea_type=idea_type,
+                    target_age=target_age,
                 )
+            finally:
+                await asyncio.to_thread(self.budget.record_time, time.perf_counter() - started)
+            if winner is None:
+                if any(r["stage"] == "budget" for r in rejected):
+                    budget_stopped = True
+                    break
+                continue
+
+            metrics.ATTEMPTS_PER_IDEA.observe(launched)
+            logger.success(f"💡 새로운 아이디어 생성 완료 ({idea_type})")
+            return self._strip_internal(winner)
 
-            return f"⚠️ 아이디어 생성 중 오류가 발생했습니다: {e}"
+        metrics.ATTEMPTS_PER_IDEA.observe(launched)
+        if budget_stopped:
+            best = self._unverified_candidate(rejected)
+            if best is not None:
+                logger.warning(f"💸 예산 소진으로 원격 검증 전 후보 사용: {best['title']}")
+                return self._strip_internal(best)
+        return None
+
+    @staticmethod
+    def _unverified_candidate(rejected: list[dict]) -> Optional[dict]:
+        """
+        예산 소진으로 원격 검증만 건너뛴 첫 후보 (stage="budget")
+        사전 심사/검색 검증에서 중복 판정을 받은 후보는 대신 보내지 않습니다.
+        """
+        return next((r for r in rejected if r.get("stage") == "budget"), None)
 
 
 # Test
 async def test_generator():
     """테스트 함수"""
     generator = IdeaGenerator()
-    idea = await generator.generate_idea()
+    try:
+        idea = await generator.generate_idea()
+    except IdeaGenerationError as e:
+        idea = str(e)
     print(idea)
 
 
@@ -1,22 +1,57 @@
 """
 Inspiration Bot - Idea History Manager
 Manages duplicate checks and alternates between idea types
+
+Storage layout: idea_history.json is a compacted snapshot, and every
+recorded idea is appended to idea_history.journal.jsonl. Loading replays
+journal records newer than the snapshot's sequence number.
 """
 import json
 import os
-from pathlib import Path
 from typing import List, Optional
 from loguru import logger
 
+from config import settings
+from transport import data_path
+
 HISTORY_FILE = "idea_history.json"
+JOURNAL_FILE = "idea_history.journal.jsonl"
+
+
+class HistoryStore:
+    """
+    아이디어 히스토리 인터페이스
+    (파일: IdeaHistory, SQLite: sqlite_storage.SQLiteIdeaHistory)
+    """
+
+    def get_next_type(self) -> str:
+        """Get the next idea type to generate (software only)"""
+        # 소프트웨어 아이디어만 발송 (하드웨어/mixed 제외)
+        return "software"
 
-class IdeaHistory:
+    def record_idea(self, title: str, idea_type: str):
+        raise NotImplementedError
+
+    def is_duplicate(self, title: str) -> bool:
+        raise NotImplementedError
+
+    def get_recent_titles(self, limit: int = 20) -> List[str]:
+        raise NotImplementedError
+
+
+class IdeaHistory(HistoryStore):
     def __init__(self):
-        self.file_path = Path(__file__).parent / HISTORY_FILE
+        self.file_path = data_path(HISTORY_FILE)
+        self.journal_path = data_path(JOURNAL_FILE)
         self.data = self._load_data()
+        self._torn_journal = False
+        self._journal_count = self._replay_journal()
+        if self._torn_journal:
+            # 잘린 줄 뒤에 이어쓰지 않도록 스냅샷으로 정리
+            self._compact()
     
     def _load_data(self) -> dict:
-        """Load history from JSON file"""
+        """Load history snapshot from JSON file"""
         if not self.file_path.exists():
             return {
                 "last_type": "software",  # Start with hardware (next will be mixed -> actually let's toggle) 
@@ -25,47 +60,103 @@ class IdeaHistory:
                 # Or 'mixed' so first is 'software'? User wants new SW ideas. Let's start with mixed so next is software?
                 # Actually user complained about current hardware ideas. Let's make the NEXT one Software.
                 # So set last_type = 'mixed'.
-                "history": []
+                "history": [],
+                "seq": 0,
             }
         
         try:
             with open(self.file_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                data = json.load(f)
+            data.setdefault("seq", 0)
+            return data
         except Exception as e:
             logger.error(f"Failed to load history: {e}")
-            return {"last_type": "mixed", "history": []}
+            return {"last_type": "mixed", "history": [], "seq": 0}
+    
+    def _replay_journal(self) -> int:
+        """Apply journal records newer than the snapshot, returns journal line count"""
+        if not self.journal_path.exists():
+            return 0
+        
+        count = 0
+        try:
+            with open(self.journal_path, "r", encoding="utf-8") as f:
+                for raw in f:
+                    try:
+                        record = json.loads(raw)
+                    except json.JSONDecodeError:
+                        # 기록 도중 중단된 마지막 줄은 무시
+                        logger.warning("History journal: skipping torn record")
+                        self._torn_journal = True
+                        continue
+                    count += 1
+                    if record.get("seq", 0) > self.data["seq"]:
+                        self._apply(record)
+        except Exception as e:
+            logger.error(f"Failed to replay history journal: {e}")
+        return count
+    
+    def _apply(self, record: dict):
+        """Apply one journal record to in-memory data"""
+        self.data["last_type"] = record["type"]
+        self.data["seq"] = record["seq"]
+        history = self.data.setdefault("history", [])
+        history.append({
+            "title": record["title"],
+            "type": record["type"]
+        })
+        
+        # Keep only the last history_max_items
+        excess = len(history) - settings.history_max_items
+        if excess > 0:
+            del history[:excess]
     
     def _save_data(self):
-        """Save history to JSON file"""
+        """Write snapshot atomically (temp file + fsync + rename)"""
+        tmp_path = self.file_path.with_suffix(".json.tmp")
         try:
-            with open(self.file_path, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(self.data, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.file_path)
         except Exception as e:
             logger.error(f"Failed to save history: {e}")
-
-    def get_next_type(self) -> str:
-        """Get the next idea type to generate (software only)"""
-        # 소프트웨어 아이디어만 발송 (하드웨어/mixed 제외)
-        return "software"
+            return False
+        return True
+    
+    def _compact(self):
+        """Fold the journal into the snapshot and truncate it"""
+        if not self._save_data():
+            return
+        # 스냅샷의 seq가 저널보다 앞서므로, 여기서 중단되어도 재생 시 중복되지 않음
+        try:
+            with open(self.journal_path, "w", encoding="utf-8"):
+                pass
+            self._journal_count = 0
+        except Exception as e:
+            logger.error(f"Failed to truncate history journal: {e}")
 
     def record_idea(self, title: str, idea_type: str):
-        """Record a new idea and update last type"""
-        self.data["last_type"] = idea_type
-        
-        # Add to history
-        if "history" not in self.data:
-            self.data["history"] = []
-            
-        self.data["history"].append({
+        """Record a new idea and update last type (journal append, constant cost)"""
+        record = {
+            "seq": self.data["seq"] + 1,
             "title": title,
             "type": idea_type
-        })
+        }
+        self._apply(record)
+        
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._journal_count += 1
+        except Exception as e:
+            logger.error(f"Failed to append history journal: {e}")
         
-        # Keep only last 100 items
-        if len(self.data["history"]) > 100:
-            self.data["history"] = self.data["history"][-100:]
-            
-        self._save_data()
+        if self._journal_count >= settings.history_compact_every:
+            self._compact()
 
     def is_duplicate(self, title: str) -> bool:
         """Check if idea title already exists"""
@@ -0,0 +1,94 @@
+"""
+Inspiration Bot - Idea Schema
+Typed Gemini response schemas and local rendering of idea messages
+"""
+import json
+from typing import List, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+# 요약(중복 검사/요약 파일용) 최대 길이
+SUMMARY_MAX_CHARS = 180
+
+
+class IdeaDraft(BaseModel):
+    """아이디어 생성 응답 스키마 (software / mixed 공용)"""
+
+    title: str = Field(description="프로젝트 이름 (따옴표 없이)")
+    summary: str = Field(description="핵심 해결 방식을 한 문장으로 요약 (180자 이내)")
+    problem: str = Field(description="software: 타겟의 불편함 / mixed: 왜 이걸 만들어?")
+    solution: str = Field(description="software: 해결 솔루션 / mixed: 어떻게 작동해?")
+    features: List[str] = Field(description="핵심 기능 목록")
+    tech_stack: List[str] = Field(description="기술 스택 (항목별 용도 포함)")
+    outcome: str = Field(description="software: 기대 효과 / mixed: 예상 개발 시간")
+
+
+class BatchIdea(BaseModel):
+    """배치 생성 응답의 세그먼트별 항목"""
+
+    segment: str = Field(description="세그먼트 키")
+    idea: IdeaDraft
+
+
+class NoveltyVerdict(BaseModel):
+    """검색 기반 신규성 판정"""
+
+    is_novel: bool
+    reason: str = ""
+    similar_examples: List[str] = Field(default_factory=list)
+
+
+def clean_title(title: str) -> str:
+    return title.strip().strip('"“”').strip()
+
+
+def short_summary(draft: IdeaDraft) -> str:
+    return " ".join(draft.summary.split())[:SUMMARY_MAX_CHARS]
+
+
+def render_idea(draft: IdeaDraft, idea_type: str, target_age: str = "") -> str:
+    """
+    구조화된 아이디어를 발송용 Markdown 텍스트로 변환
+    (기존 응답 형식과 같은 모양, 발송 시 markdown_renderer가 HTML로 변환)
+    """
+    title = clean_title(draft.title)
+    stack = "\n".join(f"- {item}" for item in draft.tech_stack)
+
+    if idea_type == "software":
+        features = "\n".join(f"{i}. {item}" for i, item in enumerate(draft.features, start=1))
+        target = f" ({target_age} 타겟)" if target_age else ""
+        return (
+            "영감봇 (소프트웨어 ver.)\n"
+            f'**프로젝트 이름:** "{title}"{target}\n\n'
+            f"**타겟의 불편함:**\n{draft.problem.strip()}\n\n"
+            f"**해결 솔루션:**\n{draft.solution.strip()}\n\n"
+            f"**핵심 기능:**\n{features}\n\n"
+            f"**기술 스택:**\n{stack}\n\n"
+            f"**기대 효과:**\n{draft.outcome.strip()}"
+        )
+
+    return (
+        "영감봇 (Maker ver.)\n"
+        f'**프로젝트 이름:** "{title}"\n\n'
+        f"**한 줄 설명:** {draft.summary.strip()}\n\n"
+        f"**왜 이걸 만들어?** {draft.problem.strip()}\n\n"
+        f"**어떻게 작동해?** {draft.solution.strip()}\n\n"
+        f"**기술 스택:**\n{stack}\n\n"
+        f"**예상 개발 시간:** {draft.outcome.strip()}"
+    )
+
+
+def parse_verdict(text: str) -> Optional[NoveltyVerdict]:
+    """
+    검색 검증 응답에서 NoveltyVerdict JSON을 찾아 파싱
+    (앞뒤 설명문이 붙어도 '{' 위치마다 JSON 디코딩을 시도해 스키마에 맞는 첫 객체를 사용)
+    """
+    decoder = json.JSONDecoder()
+    index = text.find("{")
+    while index != -1:
+        try:
+            value, _ = decoder.raw_decode(text, index)
+            return NoveltyVerdict.model_validate(value)
+        except (json.JSONDecodeError, ValidationError):
+            index = text.find("{", index + 1)
+    return None
@@ -4,25 +4,37 @@ Stores concise summaries of generated ideas in a local text file.
 """
 from __future__ import annotations
 
+import threading
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple
 
 from loguru import logger
 
+from semantic_index import SemanticIndex
+from transport import data_path
+
 SUMMARY_FILE = "idea_summaries.txt"
 SUMMARY_HEADER = (
     "# Inspiration Bot Idea Summaries\n"
     "# format: YYYY-MM-DD | type | title | summary\n"
 )
+# 파일이 이어쓰기만 되었는지 확인할 때 비교하는 마지막 바이트 수
+TAIL_CHECK_BYTES = 64
 
 
 class IdeaSummaryStore:
-    """간략한 아이디어 요약을 파일로 관리"""
+    """
+    간략한 아이디어 요약을 파일로 관리
+
+    파싱된 항목은 메모리에 유지하고, 파일 크기/mtime이 바뀐 경우에만 갱신합니다.
+    파일 뒤에 이어쓰기된 경우에는 추가된 부분(tail)만 읽습니다.
+    """
 
     def __init__(self):
-        self.file_path = Path(__file__).parent / SUMMARY_FILE
+        self.file_path = data_path(SUMMARY_FILE)
         self._ensure_file()
+        self._lock = threading.RLock()
+        self._reset_cache()
 
     def _ensure_file(self):
         if self.file_path.exists():
@@ -45,33 +57,97 @@ class IdeaSummaryStore:
             "summary": parts[3],
         }
 
-    def get_entries(self) -> List[Dict[str, str]]:
-        if not self.file_path.exists():
-            return []
+    def _reset_cache(self):
+        self._entries: List[Dict[str, str]] = []
+        self._titles: Set[str] = set()
+        self._offset = 0
+        self._tail_bytes = b""
+        self._signature: Optional[Tuple[int, int]] = None
+        # 요약 본문 벡터 인덱스 (첫 사용 시 구성, 이후 새 항목만 증분 추가)
+        self.semantic_index: Optional[SemanticIndex] = None
+
+    def _is_appended(self, f, size: int) -> bool:
+        """이전에 읽은 부분이 그대로이고 뒤에만 추가되었는지 확인"""
+        if self._offset == 0 or size < self._offset:
+            return False
+        f.seek(self._offset - len(self._tail_bytes))
+        return f.read(len(self._tail_bytes)) == self._tail_bytes
+
+    def _refresh(self):
+        """파일이 바뀐 경우에만 메모리 캐시를 갱신"""
+        try:
+            stat = self.file_path.stat()
+        except FileNotFoundError:
+            if self._signature is not None:
+                self._reset_cache()
+            return
+        except Exception as e:
+            logger.error(f"요약 파일 읽기 실패: {e}")
+            return
+
+        signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return
 
-        entries: List[Dict[str, str]] = []
         try:
-            with open(self.file_path, "r", encoding="utf-8") as f:
-                for raw in f:
-                    line = raw.strip()
-                    if not line or line.startswith("#"):
-                        continue
-                    parsed = self._parse_line(line)
-                    if parsed:
-                        entries.append(parsed)
+            with open(self.file_path, "rb") as f:
+                if not self._is_appended(f, stat.st_size):
+                    self._reset_cache()
+                f.seek(self._offset)
+                chunk = f.read()
         except Exception as e:
             logger.error(f"요약 파일 읽기 실패: {e}")
-        return entries
+            return
+
+        # 마지막 줄이 아직 쓰는 중(개행 없음)이면 다음 갱신 때 읽음
+        end = chunk.rfind(b"\n") + 1
+        new_entries: List[Dict[str, str]] = []
+        for raw in chunk[:end].decode("utf-8", errors="replace").splitlines():
+            line = raw.strip()
+            if not line or line.startswith("#"):
+                continue
+            parsed = self._parse_line(line)
+            if parsed:
+                new_entries.append(parsed)
+
+        if end:
+            consumed = chunk[:end]
+            self._tail_bytes = (self._tail_bytes + consumed)[-TAIL_CHECK_BYTES:]
+            self._offset += end
+        self._signature = signature if end == len(chunk) else None
+        self._ingest(new_entries)
+
+    def _ingest(self, new_entries: List[Dict[str, str]]):
+        if not new_entries:
+            return
+        self._entries.extend(new_entries)
+        self._titles.update(e["title"] for e in new_entries if e.get("title"))
+        if self.semantic_index is not None:
+            self.semantic_index.add_many([e["summary"] for e in new_entries])
+
+    def get_entries(self, start: int = 0) -> List[Dict[str, str]]:
+        with self._lock:
+            self._refresh()
+            return self._entries[start:]
+
+    def get_entry_count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._entries)
+
+    def get_recent_entries(self, limit: int = 60) -> List[Dict[str, str]]:
+        with self._lock:
+            self._refresh()
+            return self._entries[-limit:] if limit > 0 else []
 
     def get_recent_context(self, limit: int = 60) -> str:
         """
         프롬프트 주입용 컨텍스트를 반환합니다.
         """
-        entries = self.get_entries()
-        if not entries:
+        recent = self.get_recent_entries(limit)
+        if not recent:
             return ""
 
-        recent = entries[-limit:]
         lines = [
             f"- {e['date']} | {e['type']} | {e['title']} | {e['summary']}"
             for e in recent
@@ -81,6 +157,64 @@ class IdeaSummaryStore:
     def get_all_titles(self) -> List[str]:
         return [e["title"] for e in self.get_entries() if e.get("title")]
 
+    def get_title_set(self) -> Set[str]:
+        """전체 제목 집합 (읽기 전용으로 사용)"""
+        with self._lock:
+            self._refresh()
+            return self._titles
+
+    def has_title(self, title: str) -> bool:
+        return title in self.get_title_set()
+
+    def find_entries(
+        self,
+        idea_type: Optional[str] = None,
+        since: Optional[str] = None,
+    ) -> List[Dict[str, str]]:
+        """
+        타입/날짜(YYYY-MM-DD 이상) 조건으로 항목 조회 (파일 백엔드는 전체 스캔)
+        """
+        return [
+            e for e in self.get_entries()
+            if (idea_type is None or e["type"] == idea_type)
+            and (since is None or e["date"] >= since)
+        ]
+
+    def _ensure_semantic_index(self) -> SemanticIndex:
+        self._refresh()
+        if self.semantic_index is None:
+            index = SemanticIndex()
+            index.add_many([e["summary"] for e in self._entries])
+            self.semantic_index = index
+            logger.info(f"🧭 요약 벡터 인덱스 구성: {len(self._entries)}건")
+        return self.semantic_index
+
+    def find_similar_summary(self, summary: str, threshold: float) -> Optional[Dict[str, str]]:
+        """
+        요약 본문이 threshold 이상으로 유사한 기존 항목을 반환합니다. (오프라인 코사인 유사도)
+        """
+        with self._lock:
+            index = self._ensure_semantic_index()
+            best = index.most_similar(summary)
+            if best is None:
+                return None
+            row, score = best
+            if score < threshold:
+                return None
+            entry = dict(self._entries[row])
+        entry["score"] = f"{score:.2f}"
+        return entry
+
+    def rank_entries(self, query: str) -> List[Tuple[Dict[str, str], float]]:
+        """질의와 요약 본문 유사도 내림차순으로 전체 항목을 정렬해 반환"""
+        with self._lock:
+            index = self._ensure_semantic_index()
+            if len(index) == 0:
+                return []
+            scores = index.similarities([query])[0]
+            order = scores.argsort()[::-1]
+            return [(self._entries[int(i)], float(scores[i])) for i in order]
+
     def append_summary(self, title: str, idea_type: str, summary: str):
         safe_title = title.replace("\n", " ").replace("|", "/").strip()
         safe_summary = summary.replace("\n", " ").replace("|", "/").strip()
@@ -88,9 +222,13 @@ class IdeaSummaryStore:
             f"{datetime.now().strftime('%Y-%m-%d')} | "
             f"{idea_type} | {safe_title} | {safe_summary}\n"
         )
-        try:
-            with open(self.file_path, "a", encoding="utf-8") as f:
-                f.write(line)
-            logger.info(f"🗂️ 아이디어 요약 저장: {safe_title}")
-        except Exception as e:
-            logger.error(f"요약 파일 저장 실패: {e}")
+        with self._lock:
+            try:
+                with open(self.file_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                logger.info(f"🗂️ 아이디어 요약 저장: {safe_title}")
+            except Exception as e:
+                logger.error(f"요약 파일 저장 실패: {e}")
+                return
+            # 방금 쓴 줄만 tail로 읽어 캐시/벡터 인덱스에 반영
+            self._refresh()
@@ -1,24 +1,31 @@
 """
 Inspiration Bot - Main Entry Point
 Daily creative project idea bot
+
+Startup order: the health server binds first, then the heavy SDKs
+(google-genai, python-telegram-bot, apscheduler) are imported and the
+bot is built in a worker thread so /health keeps answering meanwhile.
 """
+import time
+
+# time-to-health / time-to-first-send 측정 기준 시각
+STARTED_AT = time.perf_counter()
+
 import asyncio
 import os
 import sys
-import pytz
 from pathlib import Path
+from typing import Optional
 
-from aiohttp import web
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
 
 # Add current dir to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from config import settings
-from idea_generator import IdeaGenerator
-from telegram_notifier import TelegramNotifier
+
+# 테스트 발송 시 대기열 발송 완료를 기다리는 최대 시간 (초)
+TEST_DELIVERY_TIMEOUT = 120
 
 
 # Configure logging
@@ -33,16 +40,29 @@ class InspirationBot:
     """
     
     def __init__(self):
+        # 무거운 SDK는 헬스 서버가 뜬 뒤 여기서 처음 import
+        import pytz
+        from apscheduler.schedulers.asyncio import AsyncIOScheduler
+        from idea_buffer import IdeaBuffer
+        from idea_generator import IdeaGenerator
+        from telegram_notifier import TelegramNotifier
+        
         self.generator = IdeaGenerator()
         self.notifier = TelegramNotifier()
+        self.buffer = IdeaBuffer()
         self.scheduler = AsyncIOScheduler(timezone=pytz.timezone(settings.timezone))
         self.running = False
+        self._refill_lock = asyncio.Lock()
+        self._refill_task: Optional[asyncio.Task] = None
         
         logger.info("💡 InspirationBot 초기화 완료")
     
     async def start(self):
         """봇 시작"""
+        from apscheduler.triggers.cron import CronTrigger
+        
         await self.notifier.start()
+        self.generator.start_background_tasks()
         
         # 스케줄러 설정 1: 영감봇 (매일 23:00)
         self.scheduler.add_job(
@@ -55,7 +75,20 @@ class InspirationBot:
             name="Daily Inspiration Sender"
         )
         
+        # 스케줄러 설정 2: 발송 N시간 전 아이디어 버퍼 사전 생성
+        prefill_hour = (settings.send_hour - settings.prefill_lead_hours) % 24
+        self.scheduler.add_job(
+            self.refill_buffer,
+            CronTrigger(
+                hour=prefill_hour,
+                minute=settings.send_minute
+            ),
+            id="idea_prefill",
+            name="Idea Buffer Prefill"
+        )
+        
         self.scheduler.start()
+        self._schedule_refill()
         
         logger.success(
             f"🚀 영감봇 시작! "
@@ -68,11 +101,17 @@ class InspirationBot:
             f"💡 소프트웨어 아이디어: 매일 {settings.send_hour:02d}:{settings.send_minute:02d}\n\n"
             f"📅 시작 시각: {self.notifier.get_now().strftime('%Y-%m-%d %H:%M:%S')}"
         )
+        logger.info(f"⏱️ time-to-first-send={time.perf_counter() - STARTED_AT:.3f}s")
     
     async def stop(self):
         """봇 종료"""
         self.scheduler.shutdown()
+        self.generator.stop_background_tasks()
+        if self._refill_task and not self._refill_task.done():
+            self._refill_task.cancel()
         await self.notifier.close()
+        from transport import close_cassette
+        close_cassette()
         logger.info("⏹️ 영감봇 종료")
     
     async def send_daily_inspiration(self):
@@ -80,22 +119,35 @@ class InspirationBot:
         일일 영감 발송 (스케줄러에 의해 호출)
         """
         logger.info("💡 일일 영감 생성 중...")
+        from idea_generator import IdeaGenerationError
         
         try:
+            # 같은 날 발송이 다시 실행돼도 대기열에는 한 번만 (멱등 키: 날짜 + chat_id)
+            event_id = f"daily:{self.notifier.get_now().strftime('%Y-%m-%d')}"
+            if await self.notifier.has_event(event_id):
+                logger.info(f"📮 오늘 일일 영감은 이미 대기열에 있습니다 ({event_id}), 생성 생략")
+                return
+            
             # 다음 발송할 아이디어 타입 결정 (히스토리 기반)
             next_type = self.generator.history.get_next_type()
             logger.info(f"💡 이번 발송 타입: {next_type}")
             
-            idea = await self.generator.generate_idea(idea_type=next_type)
-            result = await self.notifier.send_idea(idea)
+            idea = await self._next_idea(next_type)
+            result = await self.notifier.send_idea(idea, event_id)
             
             if result:
-                logger.success(f"✅ 일일 영감 발송 완료! ({next_type})")
+                logger.success(f"✅ 일일 영감 발송 대기열 등록 완료! ({next_type})")
             else:
-                logger.error("❌ 일일 영감 발송 실패")
+                logger.error("❌ 일일 영감 발송 대기열 등록 실패")
                 
+        except IdeaGenerationError as e:
+            # 에러 내용은 구독자 전체가 아니라 관리자 채팅에만
+            await self.notifier.notify_admin(str(e))
         except Exception as e:
             logger.error(f"❌ 일일 영감 발송 에러: {e}")
+        finally:
+            # 발송 경로 밖에서 버퍼 재충전
+            self._schedule_refill()
     
     async def send_test_inspiration(self):
         """
@@ -104,13 +156,85 @@ class InspirationBot:
         next_type = self.generator.history.get_next_type()
         logger.info(f"🧪 테스트 영감 생성 중... (타입: {next_type})")
         
-        idea = await self.generator.generate_idea(idea_type=next_type)
-        result = await self.notifier.send_idea(idea)
-        return result
+        from idea_generator import IdeaGenerationError
+        try:
+            idea = await self._next_idea(next_type)
+        except IdeaGenerationError as e:
+            await self.notifier.notify_admin(str(e))
+            return False
+        keys = await self.notifier.enqueue_idea(idea)
+        # 테스트 모드는 바로 종료하므로 대기열 발송이 끝날 때까지 기다림
+        return await self.notifier.wait_delivered(keys, timeout=TEST_DELIVERY_TIMEOUT)
+    
+    async def _next_idea(self, idea_type: str) -> str:
+        """
+        버퍼에서 사전 생성된 아이디어를 꺼내고, 없으면 즉시 생성합니다.
+        버퍼 아이디어는 생성 이후 기록된 아이디어와 로컬로 재검사합니다.
+        """
+        while True:
+            candidate = self.buffer.pop(idea_type)
+            if candidate is None:
+                break
+            if await self.generator.is_still_novel(candidate):
+                await self.generator.record_candidate(candidate)
+                logger.info(f"📦 버퍼 아이디어 사용: {candidate['title']}")
+                return candidate["idea"]
+            logger.warning(f"📦 버퍼 아이디어 폐기 (이후 기록과 유사): {candidate['title']}")
+        
+        logger.info("📦 버퍼가 비어 있어 즉시 생성합니다")
+        return await self.generator.generate_idea(idea_type=idea_type)
+    
+    def _schedule_refill(self):
+        """버퍼 재충전을 백그라운드 태스크로 실행"""
+        if self._refill_task and not self._refill_task.done():
+            return
+        self._refill_task = asyncio.create_task(self.refill_buffer())
+    
+    async def refill_buffer(self):
+        """
+        버퍼가 idea_buffer_size개가 될 때까지 아이디어를 사전 생성합니다.
+        """
+        if self._refill_lock.locked():
+            return
+        
+        async with self._refill_lock:
+            next_type = self.generator.history.get_next_type()
+            needed = settings.idea_buffer_size - self.buffer.count(next_type)
+            if needed <= 0:
+                return
+            
+            from gemini_quota import PRIORITY_PREFILL, quota_priority
+            from idea_generator import build_segments
+            
+            # 부족한 수만큼 세그먼트를 나눠 한 번의 호출로 생성
+            # (Gemini 쿼터 대기열에서는 발송 시각의 즉시 생성보다 뒤로)
+            segments = build_segments(next_type, needed)
+            try:
+                with quota_priority(PRIORITY_PREFILL):
+                    results = await self.generator.generate_ideas_batch(
+                        segments,
+                        exclude_titles=self.buffer.get_titles(),
+                    )
+            except Exception as e:
+                logger.warning(f"📦 버퍼 사전 생성 실패: {e}")
+                return
+            
+            filled = 0
+            for segment in segments:
+                candidate = results.get(segment["key"])
+                if candidate is not None:
+                    self.buffer.push(candidate)
+                    filled += 1
+            if filled < needed:
+                logger.warning(
+                    f"📦 버퍼 사전 생성: {needed}개 중 {filled}개만 확정, 다음 주기에 재시도"
+                )
 
 
 async def health_check(request):
     """Railway 헬스체크용"""
+    from aiohttp import web
+    
     return web.Response(text="OK", status=200)
 
 
@@ -123,12 +247,14 @@ async def main():
     # 테스트 모드 체크
     test_mode = "--test" in sys.argv
     
-    bot = InspirationBot()
+    # HTTP 서버 (Railway 헬스체크용) - 봇 구성보다 먼저 바인딩
+    from aiohttp import web
+    import metrics
     
-    # HTTP 서버 (Railway 헬스체크용)
     app = web.Application()
     app.router.add_get("/", health_check)
     app.router.add_get("/health", health_check)
+    app.router.add_get("/metrics", metrics.metrics_handler)
     
     port = int(os.environ.get("PORT", settings.port))
     runner = web.AppRunner(app)
@@ -136,7 +262,10 @@ async def main():
     site = web.TCPSite(runner, "0.0.0.0", port)
     await site.start()
     logger.info(f"🌐 HTTP 서버 시작 (포트: {port})")
+    logger.info(f"⏱️ time-to-health={time.perf_counter() - STARTED_AT:.3f}s")
     
+    # SDK import + 봇 구성은 스레드에서 (그동안 /health 응답 유지)
+    bot = await asyncio.to_thread(InspirationBot)
     await bot.start()
     
     # 테스트 모드: 아이디어 즉시 발송 후 종료
@@ -0,0 +1,108 @@
+"""
+Inspiration Bot - Markdown Renderer
+Converts Gemini-style Markdown into Telegram-safe HTML before sending
+"""
+import html
+import re
+from typing import List
+
+_FENCE = re.compile(r"^\s*```\s*([\w+#.-]*)\s*$")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+(.+?)\s*#*\s*$")
+_BULLET = re.compile(r"^(\s*)[*+-]\s+")
+_HR = re.compile(r"^\s*(?:[-*_]\s*){3,}$")
+
+_CODE_SPAN = re.compile(r"`([^`\n]+)`")
+_LINK = re.compile(r"\[([^\]\n]+)\]\((https?://[^)\s]+)\)")
+# 여는 기호 뒤와 닫는 기호 앞은 공백이 아니어야 짝으로 인정 (나머지는 문자 그대로 둠)
+_BOLD_DOUBLE = re.compile(r"(\*\*|__)(?=\S)(.+?)(?<=\S)\1")
+_STRIKE = re.compile(r"~~(?=\S)([^<\n]+?)(?<=\S)~~")
+_BOLD_SINGLE = re.compile(r"(?<![*\w])\*(?=[^\s*])([^*<\n]+?)(?<=[^\s*])\*(?![*\w])")
+_ITALIC = re.compile(r"(?<![_\w])_(?=[^\s_])([^_<\n]+?)(?<=[^\s_])_(?![_\w])")
+_PLACEHOLDER = re.compile("\x00(\\d+)\x00")
+_TAG = re.compile(r"<[^>]+>")
+
+
+def _escape(text: str) -> str:
+    return html.escape(text, quote=False)
+
+
+def render_inline(line: str) -> str:
+    """
+    한 줄의 인라인 Markdown -> HTML
+
+    코드/링크는 먼저 자리표시자로 빼 두고, 나머지를 이스케이프한 뒤
+    짝이 맞는 강조 기호만 태그로 바꿉니다. 짝 없는 *, _ 는 글자 그대로 남습니다.
+    """
+    protected: List[str] = []
+
+    def protect(rendered: str) -> str:
+        protected.append(rendered)
+        return f"\x00{len(protected) - 1}\x00"
+
+    line = _CODE_SPAN.sub(lambda m: protect(f"<code>{_escape(m.group(1))}</code>"), line)
+    line = _LINK.sub(
+        lambda m: protect(
+            f'<a href="{html.escape(m.group(2), quote=True)}">{_escape(m.group(1))}</a>'
+        ),
+        line,
+    )
+    line = _escape(line)
+    line = _BOLD_DOUBLE.sub(lambda m: f"<b>{m.group(2)}</b>", line)
+    line = _STRIKE.sub(r"<s>\1</s>", line)
+    line = _BOLD_SINGLE.sub(r"<b>\1</b>", line)
+    line = _ITALIC.sub(r"<i>\1</i>", line)
+    return _PLACEHOLDER.sub(lambda m: protected[int(m.group(1))], line)
+
+
+def _render_pre(lines: List[str], language: str) -> str:
+    body = _escape("\n".join(lines))
+    if language:
+        return f'<pre><code class="language-{_escape(language)}">{body}</code></pre>'
+    return f"<pre>{body}</pre>"
+
+
+def _render_line(line: str) -> str:
+    heading = _HEADING.match(line)
+    if heading:
+        # 제목 줄은 통째로 굵게 (안쪽 굵게 태그는 중복되므로 제거)
+        inner = render_inline(heading.group(1)).replace("<b>", "").replace("</b>", "")
+        return f"<b>{inner}</b>"
+    if _HR.match(line):
+        return "━━━━━━━━━━━━━━━"
+    bullet = _BULLET.match(line)
+    if bullet:
+        return f"{bullet.group(1)}• {render_inline(line[bullet.end():])}"
+    return render_inline(line)
+
+
+def render_html(text: str) -> str:
+    """
+    Gemini 응답(Markdown)을 Telegram HTML(parse_mode="HTML")로 변환
+
+    - **굵게**, *굵게*, __굵게__ -> <b>, _기울임_ -> <i>, ~~취소선~~ -> <s>
+    - `코드` -> <code>, ``` 블록 -> <pre>, [텍스트](http...) -> <a>
+    - # 제목 -> 굵은 줄, "* 항목" / "- 항목" -> "• 항목"
+    - <, >, & 는 이스케이프하고 짝이 맞지 않는 기호는 글자 그대로 둡니다
+    """
+    lines = text.split("\n")
+    output: List[str] = []
+    index = 0
+    while index < len(lines):
+        fence = _FENCE.match(lines[index])
+        if fence:
+            closing = next(
+                (j for j in range(index + 1, len(lines)) if _FENCE.match(lines[j])),
+                None,
+            )
+            if closing is not None:
+                output.append(_render_pre(lines[index + 1:closing], fence.group(1)))
+                index = closing + 1
+                continue
+        output.append(_render_line(lines[index]))
+        index += 1
+    return "\n".join(output)
+
+
+def html_to_text(rendered: str) -> str:
+    """render_html 결과에서 태그를 빼고 일반 텍스트로 (최후의 fallback용)"""
+    return html.unescape(_TAG.sub("", rendered))
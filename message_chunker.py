@@ -0,0 +1,262 @@
+"""
+Inspiration Bot - Message Chunker
+Single-pass, entity-aware splitting of long Telegram messages (UTF-16 lengths)
+"""
+import re
+from typing import List, Optional, Tuple
+
+# Telegram 메시지 최대 길이 (엔티티 파싱 후 UTF-16 코드 유닛 기준)
+MAX_MESSAGE_UTF16 = 4096
+# 청크가 이 비율 이상 찼을 때만 우선순위 높은 경계(문단 등)를 고집
+MIN_FILL_RATIO = 0.5
+# 한 단어 조각의 최대 길이 (공백 없는 긴 문자열은 이 단위로 강제 분할)
+MAX_WORD_CHARS = 64
+# 구분선 (이 줄 앞은 문단 경계로 취급)
+SEPARATOR_CHAR = "━"
+
+# 분할 우선순위: 문단 > 줄 > 공백 > 단어 조각 사이, -1은 분할 금지
+BREAK_PARAGRAPH = 3
+BREAK_LINE = 2
+BREAK_SPACE = 1
+BREAK_HARD = 0
+BREAK_NEVER = -1
+
+_MARKDOWN_TOKEN = re.compile(
+    r"(?P<pre>```)"
+    r"|(?P<escape>\\[*_`\[])"
+    r"|(?P<link>\[[^\]\n]*\]\([^)\n]*\))"
+    r"|(?P<marker>[*_`])"
+    r"|(?P<nl>\n)"
+    r"|(?P<space>[^\S\n]+)"
+    rf"|(?P<word>[^\s*_`\[\\]{{1,{MAX_WORD_CHARS}}}[^\S\n]*)"
+    r"|(?P<other>.)",
+    re.DOTALL,
+)
+_HTML_TOKEN = re.compile(
+    r"(?P<tag></?[a-zA-Z][\w-]*(?:\s[^>]*)?>)"
+    r"|(?P<escape>&(?:#\d+|#x[0-9a-fA-F]+|\w+);)"
+    r"|(?P<nl>\n)"
+    r"|(?P<space>[^\S\n]+)"
+    rf"|(?P<word>[^\s<&]{{1,{MAX_WORD_CHARS}}}[^\S\n]*)"
+    r"|(?P<other>.)",
+    re.DOTALL,
+)
+_PLAIN_TOKEN = re.compile(
+    r"(?P<nl>\n)"
+    r"|(?P<space>[^\S\n]+)"
+    rf"|(?P<word>[^\s]{{1,{MAX_WORD_CHARS}}}[^\S\n]*)",
+    re.DOTALL,
+)
+_TAG_NAME = re.compile(r"</?([a-zA-Z][\w-]*)")
+
+# 열린 엔티티 스택: ((여는 표기, 닫는 표기), ...)
+Stack = Tuple[Tuple[str, str], ...]
+
+
+def utf16_len(text: str) -> int:
+    """Telegram이 세는 방식(UTF-16 코드 유닛)의 길이"""
+    return len(text.encode("utf-16-le")) // 2
+
+
+class _Atoms:
+    """
+    분할할 수 없는 최소 단위(단어 조각, 공백, 줄바꿈, 엔티티 표기) 목록
+
+    각 단위 뒤에서 끊을 때의 우선순위와 그 시점의 열린 엔티티 스택을 함께 보관합니다.
+    """
+
+    def __init__(self):
+        self.texts: List[str] = []
+        self.widths: List[int] = []
+        self.kinds: List[str] = []
+        self.stacks: List[Stack] = []
+        self.breaks: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+
+def _in_code(stack: Stack) -> bool:
+    """코드/pre 엔티티 안인지 (공백을 그대로 보존해야 함)"""
+    return bool(stack) and stack[-1][1] in ("`", "```", "</code>", "</pre>")
+
+
+def _markdown_atom(kind: str, text: str, stack: Stack) -> Tuple[str, int, Stack]:
+    """Markdown(legacy) 토큰 -> (종류, 표시 길이, 새 스택). 엔티티는 중첩되지 않음"""
+    in_code = _in_code(stack)
+    if kind in ("pre", "marker"):
+        if stack and stack[-1][1] == text:
+            return "close", 0, ()
+        if not stack:
+            # pre 블록을 다시 열 때 첫 줄이 언어 이름으로 읽히지 않도록 줄바꿈 포함
+            opening = "```\n" if kind == "pre" else text
+            return "open", 0, ((opening, text),)
+        return "text", utf16_len(text), stack
+    if kind == "escape":
+        return "text", 2 if in_code else 1, stack
+    if kind == "link" and not in_code:
+        label = text[1:text.index("](")]
+        return "text", utf16_len(label), stack
+    return kind, utf16_len(text), stack
+
+
+def _html_atom(kind: str, text: str, stack: Stack) -> Tuple[str, int, Stack]:
+    """HTML 토큰 -> (종류, 표시 길이, 새 스택). 태그는 중첩 가능"""
+    if kind == "tag":
+        name = _TAG_NAME.match(text).group(1).lower()
+        if text.startswith("</"):
+            for depth in range(len(stack) - 1, -1, -1):
+                if stack[depth][1] == f"</{name}>":
+                    return "close", 0, stack[:depth]
+            return "close", 0, stack
+        return "open", 0, stack + ((text, f"</{name}>"),)
+    if kind == "escape":
+        return "text", 1, stack
+    return kind, utf16_len(text), stack
+
+
+def _width(token: str) -> int:
+    return len(token) if token.isascii() else utf16_len(token)
+
+
+def _tokenize(text: str, parse_mode: Optional[str]) -> _Atoms:
+    mode = (parse_mode or "").lower()
+    if mode == "markdown":
+        pattern, resolve = _MARKDOWN_TOKEN, _markdown_atom
+    elif mode == "html":
+        pattern, resolve = _HTML_TOKEN, _html_atom
+    else:
+        pattern, resolve = _PLAIN_TOKEN, None
+
+    atoms = _Atoms()
+    # 토큰 수만큼 반복하므로 리스트 append를 지역 변수로
+    add_text, add_width, add_kind = atoms.texts.append, atoms.widths.append, atoms.kinds.append
+    add_stack, add_break = atoms.stacks.append, atoms.breaks.append
+    breaks = atoms.breaks
+    stack: Stack = ()
+    line_has_content = False
+    line_is_separator = True
+    prev_nl = -1
+
+    for match in pattern.finditer(text):
+        kind = match.lastgroup
+        token = match.group()
+        if kind == "word":
+            # 단어(+뒤 공백)는 엔티티 상태와 무관
+            width = _width(token)
+            brk = BREAK_SPACE if token[-1].isspace() else BREAK_HARD
+            line_has_content = True
+            if line_is_separator and token.strip().strip(SEPARATOR_CHAR):
+                line_is_separator = False
+        elif kind == "nl":
+            width = 1
+            brk = BREAK_LINE if line_has_content else BREAK_PARAGRAPH
+            if line_has_content and line_is_separator and prev_nl >= 0:
+                # 구분선 앞에서 끊어 다음 청크가 구분선으로 시작하도록
+                breaks[prev_nl] = BREAK_PARAGRAPH
+            prev_nl = len(breaks)
+            line_has_content = False
+            line_is_separator = True
+        elif kind == "space":
+            width = _width(token)
+            brk = BREAK_SPACE
+        else:
+            if resolve is not None:
+                kind, width, stack = resolve(kind, token, stack)
+            else:
+                width = _width(token)
+            brk = BREAK_NEVER if kind == "open" else BREAK_HARD
+            line_has_content = True
+            line_is_separator = False
+        add_text(token)
+        add_width(width)
+        add_kind(kind)
+        add_stack(stack)
+        add_break(brk)
+    return atoms
+
+
+def _choose_break(candidates: dict, limit: int) -> Optional[int]:
+    """
+    후보 중 끊을 위치 선택
+    점수가 높은 경계(문단 > 줄 > 공백, 엔티티 밖 우선)부터, 충분히 채워진 것을 고릅니다.
+    """
+    for score in sorted(candidates, reverse=True):
+        index, size = candidates[score]
+        if size >= limit * MIN_FILL_RATIO:
+            return index
+    if candidates:
+        return max(index for index, _ in candidates.values())
+    return None
+
+
+def split_message(
+    text: str,
+    parse_mode: Optional[str] = None,
+    limit: int = MAX_MESSAGE_UTF16,
+) -> List[str]:
+    """
+    메시지를 limit(UTF-16) 이하 청크로 분할 (발송 전 전체 계획을 한 번에 생성)
+
+    - 문단/구분선 > 줄 > 공백 경계 순으로 끊고, 공백 없는 긴 문자열만 강제 분할
+    - 엔티티 안에서 끊어야 하면 청크 끝에서 닫고 다음 청크 앞에서 다시 엽니다
+    - parse_mode: "Markdown" | "HTML" | None
+    """
+    # 엔티티 표기까지 세어도 한도 안이면 그대로 (대부분의 메시지)
+    if utf16_len(text) <= limit:
+        text = text.strip()
+        return [text] if text else []
+
+    atoms = _tokenize(text, parse_mode)
+    total = len(atoms)
+    chunks: List[str] = []
+    reopen: Stack = ()
+    start = 0
+
+    while start < total:
+        # 청크 앞 공백은 버림 (코드 블록 안이면 들여쓰기 유지)
+        if not _in_code(reopen):
+            while start < total and atoms.kinds[start] in ("space", "nl"):
+                start += 1
+            if start >= total:
+                break
+
+        # 점수 -> (마지막 후보 위치, 그 시점까지 길이)
+        candidates: dict = {}
+        size = 0
+        index = start
+        while index < total:
+            size += atoms.widths[index]
+            if size > limit:
+                break
+            brk = atoms.breaks[index]
+            if brk >= 0:
+                score = brk * 2 + (0 if atoms.stacks[index] else 1)
+                candidates[score] = (index, size)
+            index += 1
+
+        if index >= total:
+            end = total - 1
+        else:
+            end = _choose_break(candidates, limit)
+            if end is None:
+                # 후보가 전혀 없으면 넘친 단위 바로 앞에서 끊음 (최소 1단위는 포함)
+                end = max(index - 1, start)
+                while end > start and atoms.kinds[end] == "open":
+                    end -= 1
+
+        closing = atoms.stacks[end]
+        body = "".join(atoms.texts[start:end + 1])
+        if not _in_code(closing):
+            body = body.rstrip()
+        chunk = (
+            "".join(opening for opening, _ in reopen)
+            + body
+            + "".join(close for _, close in reversed(closing))
+        )
+        if chunk.strip():
+            chunks.append(chunk)
+        reopen = closing
+        start = end + 1
+
+    return chunks
@@ -0,0 +1,147 @@
+"""
+Inspiration Bot - Metrics
+Prometheus metrics for generation, validation and Telegram delivery
+"""
+from aiohttp import web
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Gemini 호출 (stage: generate | screen | validate)
+GEMINI_LATENCY = Histogram(
+    "inspiration_gemini_call_seconds",
+    "Gemini generate_content latency",
+    ["stage"],
+    buckets=(0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+GEMINI_TOKENS = Counter(
+    "inspiration_gemini_tokens_total",
+    "Tokens reported in Gemini usage metadata",
+    ["stage", "kind"],
+)
+GEMINI_ERRORS = Counter(
+    "inspiration_gemini_errors_total",
+    "Gemini calls that raised or timed out",
+    ["stage", "error"],
+)
+
+# 후보 생성/탈락
+CANDIDATE_ATTEMPTS = Counter(
+    "inspiration_candidate_attempts_total",
+    "Candidate ideas generated",
+)
+CANDIDATE_REJECTIONS = Counter(
+    "inspiration_candidate_rejections_total",
+    "Rejected candidate ideas by reason",
+    ["reason"],
+)
+ATTEMPTS_PER_IDEA = Histogram(
+    "inspiration_attempts_per_idea",
+    "Candidates generated per generation run",
+    buckets=(1, 2, 3, 4, 6, 8, 12),
+)
+# 모델 라우팅 (서킷 상태: 0=closed, 1=half_open, 2=open)
+GEMINI_CIRCUIT_STATE = Gauge(
+    "inspiration_gemini_circuit_state",
+    "Gemini circuit breaker state per model",
+    ["model"],
+)
+GEMINI_CIRCUIT_FAILURES = Gauge(
+    "inspiration_gemini_circuit_failures",
+    "Consecutive transient failures per model",
+    ["model"],
+)
+GEMINI_HEDGE_DELAY = Gauge(
+    "inspiration_gemini_hedge_delay_seconds",
+    "Latency percentile after which a hedged request is sent",
+    ["stage"],
+)
+GEMINI_HEDGES = Counter(
+    "inspiration_gemini_hedges_total",
+    "Hedged Gemini requests (result: launched | won)",
+    ["stage", "result"],
+)
+GEMINI_FALLBACKS = Counter(
+    "inspiration_gemini_fallbacks_total",
+    "Gemini calls answered by a model other than the current one",
+    ["stage", "model"],
+)
+
+# 일일 예산 (resource: calls | tokens | seconds)
+GEMINI_BUDGET_USED = Gauge(
+    "inspiration_gemini_budget_used",
+    "Gemini usage counted against today's budget",
+    ["resource"],
+)
+GEMINI_BUDGET_STOPS = Counter(
+    "inspiration_gemini_budget_stops_total",
+    "Generation steps skipped because the daily budget ran out",
+    ["resource"],
+)
+# 클라이언트 측 쿼터 (bucket: rpm | tpm | rpd | tpd, priority: send | prefill)
+GEMINI_QUOTA_AVAILABLE = Gauge(
+    "inspiration_gemini_quota_available",
+    "Remaining capacity in each Gemini quota bucket",
+    ["bucket"],
+)
+GEMINI_QUOTA_WAIT = Histogram(
+    "inspiration_gemini_quota_wait_seconds",
+    "Time Gemini calls spent queued for quota",
+    ["priority"],
+    buckets=(0.01, 0.1, 0.5, 1, 2, 5, 10, 30, 60, 120),
+)
+GEMINI_QUOTA_THROTTLES = Counter(
+    "inspiration_gemini_quota_throttles_total",
+    "429 responses received despite the client-side quota",
+)
+NOVELTY_CACHE_LOOKUPS = Counter(
+    "inspiration_novelty_cache_lookups_total",
+    "Novelty verdict cache lookups",
+    ["result"],
+)
+
+# Telegram 발송
+TELEGRAM_SEND_LATENCY = Histogram(
+    "inspiration_telegram_send_seconds",
+    "Telegram send_message latency",
+    buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10),
+)
+TELEGRAM_SEND_FAILURES = Counter(
+    "inspiration_telegram_send_failures_total",
+    "Failed Telegram send_message calls",
+    ["error"],
+)
+
+# 발송 대기열 (result: sent | retry | dead)
+OUTBOX_DELIVERIES = Counter(
+    "inspiration_outbox_deliveries_total",
+    "Outbox delivery attempts by result",
+    ["result"],
+)
+OUTBOX_EVENT_RECIPIENTS = Counter(
+    "inspiration_outbox_event_recipients_total",
+    "Final per-chat result of each completed send event",
+    ["result"],
+)
+OUTBOX_PENDING = Gauge(
+    "inspiration_outbox_pending",
+    "Messages waiting in the outbox",
+)
+
+
+def record_usage(stage: str, response):
+    """응답의 usage_metadata에서 토큰 수를 집계"""
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    for kind, attr in (
+        ("prompt", "prompt_token_count"),
+        ("candidates", "candidates_token_count"),
+        ("total", "total_token_count"),
+    ):
+        value = getattr(usage, attr, None)
+        if value:
+            GEMINI_TOKENS.labels(stage=stage, kind=kind).inc(value)
+
+
+async def metrics_handler(request):
+    """Prometheus scrape endpoint"""
+    return web.Response(body=generate_latest(), headers={"Content-Type": CONTENT_TYPE_LATEST})
@@ -0,0 +1,134 @@
+"""
+Inspiration Bot - Gemini Model Registry
+Disk-cached model discovery with background refresh and 404 failover
+"""
+import asyncio
+import json
+import os
+import time
+from typing import List, Optional, Set
+
+from loguru import logger
+
+from config import settings
+from transport import data_path
+
+CACHE_FILE = "model_cache.json"
+
+# 우선순위 순 (앞쪽일수록 선호)
+PRIORITY_MODELS = [
+    'gemini-2.0-flash',
+    'gemini-1.5-flash',
+    'gemini-1.5-flash-latest',
+    'gemini-2.0-flash-lite',
+]
+
+
+def rank_models(model_names: List[str]) -> List[str]:
+    """
+    사용 가능한 모델을 선호 순서로 정렬
+    우선순위 목록 -> 기타 flash 모델 (exp 제외)
+    """
+    clean_names = [name.replace('models/', '') for name in model_names]
+    ranked = [m for m in PRIORITY_MODELS if m in clean_names]
+    for name in clean_names:
+        if 'flash' in name.lower() and 'exp' not in name.lower() and name not in ranked:
+            ranked.append(name)
+    return ranked
+
+
+class ModelRegistry:
+    """
+    사용할 Gemini 모델 선택
+
+    - 시작 시: 디스크 캐시의 1순위 모델, 캐시가 없으면 settings.gemini_model
+    - 백그라운드: TTL이 지나면 모델 목록을 다시 조회해 캐시 갱신
+    - 404 발생 시: next_model()로 다음 후보 모델로 전환
+    """
+
+    def __init__(self, client, ttl_seconds: float):
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.file_path = data_path(CACHE_FILE)
+        self.available: List[str] = []
+        self.updated_at = 0.0
+        self._failed: Set[str] = set()
+        self._load_cache()
+        self.current = self.available[0] if self.available else settings.gemini_model
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def _load_cache(self):
+        if not self.file_path.exists():
+            return
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.available = list(data.get("models", []))
+            self.updated_at = float(data.get("updated_at", 0))
+        except Exception as e:
+            logger.warning(f"모델 캐시 로드 실패: {e}")
+
+    def _save_cache(self):
+        tmp_path = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"models": self.available, "updated_at": self.updated_at}, f)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            logger.warning(f"모델 캐시 저장 실패: {e}")
+
+    def is_stale(self) -> bool:
+        return time.time() - self.updated_at > self.ttl_seconds
+
+    async def refresh(self):
+        """모델 목록 조회 후 캐시/현재 모델 갱신"""
+        try:
+            pager = await self.client.aio.models.list()
+            names = [m.name async for m in pager]
+        except Exception as e:
+            logger.warning(f"모델 목록 조회 실패: {e}")
+            return
+
+        ranked = rank_models(names)
+        if not ranked:
+            logger.warning("사용 가능한 flash 모델을 찾지 못해 현재 모델 유지")
+            return
+
+        self.available = ranked
+        self.updated_at = time.time()
+        self._failed.clear()
+        self._save_cache()
+        if self.current != ranked[0]:
+            logger.info(f"🔍 자동 감지된 최신 모델: {ranked[0]} (이전: {self.current})")
+            self.current = ranked[0]
+
+    async def _refresh_loop(self):
+        while True:
+            if self.is_stale():
+                await self.refresh()
+            await asyncio.sleep(max(60.0, self.ttl_seconds / 4))
+
+    def start_background_refresh(self):
+        """이벤트 루프에서 주기적 모델 목록 갱신 시작"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    def stop(self):
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+
+    def next_model(self, failed: str) -> Optional[str]:
+        """
+        failed 모델을 제외한 다음 후보로 전환 (없으면 None)
+        """
+        self._failed.add(failed)
+        if failed in self.available:
+            # 재시작 후에도 같은 모델을 고르지 않도록 캐시에서 제거
+            self.available.remove(failed)
+            self._save_cache()
+        for name in self.available + [settings.gemini_model]:
+            if name not in self._failed:
+                logger.warning(f"🔄 모델 전환: {failed} → {name}")
+                self.current = name
+                return name
+        return None
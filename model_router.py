@@ -0,0 +1,190 @@
+"""
+Inspiration Bot - Gemini Model Router
+Per-model circuit breakers, latency-percentile hedging and the fallback model chain
+"""
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+from loguru import logger
+
+import metrics
+from model_registry import PRIORITY_MODELS
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+# 메트릭 값 (inspiration_gemini_circuit_state)
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# 스테이지별로 보관할 최근 성공 지연 시간 수
+LATENCY_WINDOW = 200
+# 일시적 장애로 보는 응답 상태 (다음 모델로 넘기고 서킷 실패로 집계)
+TRANSIENT_STATUSES = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "INTERNAL", "DEADLINE_EXCEEDED")
+
+
+def is_transient(error: BaseException) -> bool:
+    """429 / 5xx / 타임아웃 여부 (다른 모델로 재시도할 가치가 있는 실패)"""
+    if isinstance(error, (asyncio.TimeoutError, CircuitOpenError)):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, int) and (code == 429 or 500 <= code < 600):
+        return True
+    message = str(error)
+    return any(status in message for status in TRANSIENT_STATUSES)
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 요청을 허용하지 않음 (다른 모델로 넘길 수 있는 일시적 실패)"""
+
+
+class CircuitBreaker:
+    """
+    모델 1개의 서킷 브레이커
+
+    - closed: 정상. 연속 failure_threshold회 일시적 실패 시 open
+    - open: reset_seconds 동안 요청 차단 (폴백 체인으로 우회)
+    - half_open: 시험 요청 1건만 허용, 성공하면 closed / 실패하면 다시 open
+
+    available()은 상태를 바꾸지 않는 확인용이고, 실제 요청 직전에 begin()으로 시험 요청 자리를 차지합니다.
+    """
+
+    def __init__(self, model: str, failure_threshold: int, reset_seconds: float):
+        self.model = model
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self._publish()
+
+    def _publish(self):
+        metrics.GEMINI_CIRCUIT_STATE.labels(model=self.model).set(STATE_VALUES[self.state])
+        metrics.GEMINI_CIRCUIT_FAILURES.labels(model=self.model).set(self.failures)
+
+    def _set_state(self, state: str):
+        if state != self.state:
+            logger.warning(f"🔌 Gemini 서킷 {self.model}: {self.state} → {state}")
+            self.state = state
+        self._publish()
+
+    def _reset_elapsed(self) -> bool:
+        return time.monotonic() - self.opened_at >= self.reset_seconds
+
+    def available(self) -> bool:
+        """지금 요청을 보낼 수 있는 상태인지 (상태 변화 없음)"""
+        if self.state == OPEN:
+            return self._reset_elapsed()
+        if self.state == HALF_OPEN:
+            return not self._trial_in_flight
+        return True
+
+    def begin(self) -> bool:
+        """요청 직전 호출: 허용되면 True (half_open이면 시험 요청 자리를 차지함)"""
+        if self.state == OPEN and self._reset_elapsed():
+            self._set_state(HALF_OPEN)
+            self._trial_in_flight = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def release(self):
+        """결과 없이 끝난 요청(취소 등)의 시험 요청 자리 반환"""
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        self._set_state(CLOSED)
+
+    def record_failure(self, error: BaseException):
+        self._trial_in_flight = False
+        if not is_transient(error):
+            # 요청 자체의 문제(400 등)는 모델 상태와 무관
+            return
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+        else:
+            self._publish()
+
+    def snapshot(self) -> Dict:
+        return {"state": self.state, "failures": self.failures}
+
+
+class ModelRouter:
+    """
+    Gemini 호출 경로 결정
+
+    - chain(primary): 현재 모델 + 폴백 모델 중 서킷이 요청을 허용하는 순서 (확인만, 시험 요청 자리는 begin에서 차지)
+    - hedge_delay(stage): 최근 성공 지연 시간의 percentile (표본이 부족하면 None = 헤지 안 함)
+    """
+
+    def __init__(
+        self,
+        fallback_models: List[str],
+        failure_threshold: int,
+        reset_seconds: float,
+        hedge_percentile: float,
+        hedge_min_samples: int,
+    ):
+        # 설정이 없으면 우선순위 목록의 경량(lite) 모델을 폴백으로 사용
+        self.fallback_models = fallback_models or [m for m in PRIORITY_MODELS if "lite" in m]
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = max(1, hedge_min_samples)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def breaker(self, model: str) -> CircuitBreaker:
+        if model not in self._breakers:
+            self._breakers[model] = CircuitBreaker(model, self.failure_threshold, self.reset_seconds)
+        return self._breakers[model]
+
+    def chain(self, primary: str) -> List[str]:
+        """요청 가능한 모델 순서 (모두 차단 상태면 빈 목록)"""
+        models = [primary] + [m for m in self.fallback_models if m != primary]
+        return [m for m in models if self.breaker(m).available()]
+
+    def begin(self, model: str) -> bool:
+        return self.breaker(model).begin()
+
+    def release(self, model: str):
+        self.breaker(model).release()
+
+    def record_success(self, model: str, stage: str, seconds: float):
+        self.breaker(model).record_success()
+        window = self._latencies.setdefault(stage, deque(maxlen=LATENCY_WINDOW))
+        window.append(seconds)
+        delay = self.hedge_delay(stage)
+        if delay is not None:
+            metrics.GEMINI_HEDGE_DELAY.labels(stage=stage).set(delay)
+
+    def record_failure(self, model: str, error: BaseException):
+        self.breaker(model).record_failure(error)
+
+    def hedge_delay(self, stage: str) -> Optional[float]:
+        if not 0 < self.hedge_percentile < 1:
+            return None
+        window = self._latencies.get(stage)
+        if not window or len(window) < self.hedge_min_samples:
+            return None
+        ordered = sorted(window)
+        index = min(len(ordered) - 1, math.ceil(self.hedge_percentile * len(ordered)) - 1)
+        return ordered[index]
+
+    def snapshot(self) -> Dict:
+        """모니터링용 전체 상태"""
+        return {
+            "fallback_models": list(self.fallback_models),
+            "circuits": {model: b.snapshot() for model, b in self._breakers.items()},
+            "hedge_delay": {stage: self.hedge_delay(stage) for stage in self._latencies},
+        }
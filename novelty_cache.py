@@ -0,0 +1,99 @@
+"""
+Inspiration Bot - Novelty Verdict Cache
+Persistent TTL + LRU cache for search-grounded novelty verdicts
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from loguru import logger
+
+from title_index import normalize_title
+from transport import data_path
+
+CACHE_FILE = "novelty_cache.json"
+
+
+def fingerprint(title: str, summary: str) -> str:
+    """정규화 제목 + 요약 해시로 만든 후보 지문"""
+    summary_norm = re.sub(r"\s+", " ", summary.lower()).strip()
+    summary_hash = hashlib.sha256(summary_norm.encode("utf-8")).hexdigest()
+    raw = f"{normalize_title(title)}\n{summary_hash}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class NoveltyCache:
+    """
+    검색 기반 신규성 판정 결과 캐시
+
+    - 키: fingerprint(title, summary)
+    - 만료: ttl_seconds 경과 시 무효
+    - 용량: max_entries 초과 시 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.file_path = data_path(CACHE_FILE)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, dict]" = self._load_entries()
+
+    def _load_entries(self) -> "OrderedDict[str, dict]":
+        if not self.file_path.exists():
+            return OrderedDict()
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return OrderedDict((item["key"], item) for item in data.get("entries", []))
+        except Exception as e:
+            logger.error(f"신규성 캐시 로드 실패: {e}")
+            return OrderedDict()
+
+    def _save_entries(self):
+        tmp_path = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"entries": list(self._entries.values())}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            logger.error(f"신규성 캐시 저장 실패: {e}")
+
+    def get(self, key: str) -> Optional[Dict]:
+        """유효한 판정이 있으면 반환 (LRU 순서 갱신)"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and time.time() - item["stored_at"] > self.ttl_seconds:
+                del self._entries[key]
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item["verdict"]
+
+    def peek(self, key: str) -> Optional[Dict]:
+        """통계/LRU 순서를 건드리지 않고 유효한 판정만 조회 (사전 중복 검사용)"""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or time.time() - item["stored_at"] > self.ttl_seconds:
+                return None
+            return item["verdict"]
+
+    def put(self, key: str, verdict: Dict):
+        with self._lock:
+            self._entries[key] = {"key": key, "stored_at": time.time(), "verdict": verdict}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save_entries()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
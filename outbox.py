@@ -0,0 +1,166 @@
+"""
+Inspiration Bot - Durable Outbox
+Persistent outbound Telegram message queue (SQLite) with retry scheduling
+"""
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    event_id TEXT,
+    chat_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    parse_mode TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    chunks_sent INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_due ON outbox(status, next_attempt_at);
+"""
+
+PENDING = "pending"
+SENT = "sent"
+DEAD = "dead"
+
+
+def idempotency_key(event_id: str, chat_id: str) -> str:
+    """
+    발송 건(event_id)마다 채팅당 메시지 1건만 넣기 위한 키
+    본문은 키에 넣지 않으므로, 같은 날 일일 발송이 다시 실행돼 다른 아이디어가 생성돼도
+    처음 넣은 메시지만 남습니다. (분할 청크는 행 안에서 chunks_sent로 추적)
+    """
+    return f"{event_id}:{chat_id}"
+
+
+class Outbox:
+    """
+    발송 대기열 (SQLite, WAL 모드)
+
+    - enqueue: 같은 발송 건의 멱등 키가 이미 있으면 무시
+    - due: 발송 시각이 된 pending 메시지 (오래된 순)
+    - 발송 결과에 따라 mark_sent / reschedule / mark_dead
+    - 분할 메시지는 mark_progress로 보낸 청크 수를 남겨 재시도 시 이어서 발송
+    - event_results: 발송 건(event_id)별 채팅마다의 결과
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._migrate()
+
+    def _migrate(self):
+        """이전 버전 파일에 없는 컬럼 추가"""
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(outbox)")}
+        if "chunks_sent" not in columns:
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN chunks_sent INTEGER NOT NULL DEFAULT 0")
+        if "event_id" not in columns:
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN event_id TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_outbox_event ON outbox(event_id)")
+
+    def _execute(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        with self._lock:
+            return self.conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def enqueue(self, event_id: str, chat_id: str, text: str, parse_mode: Optional[str]) -> str:
+        """메시지를 대기열에 추가하고 멱등 키를 반환"""
+        key = idempotency_key(event_id, chat_id)
+        now = time.time()
+        cursor = self._execute(
+            "INSERT OR IGNORE INTO outbox "
+            "(idempotency_key, event_id, chat_id, text, parse_mode, next_attempt_at, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, event_id, chat_id, text, parse_mode, now, now),
+        )
+        if cursor.rowcount == 0:
+            logger.info(f"📮 이미 대기열에 있는 메시지: {key}")
+        return key
+
+    def due(self, limit: int = 50) -> List[Dict]:
+        rows = self._query(
+            "SELECT * FROM outbox WHERE status = ? AND next_attempt_at <= ? "
+            "ORDER BY id LIMIT ?",
+            (PENDING, time.time(), limit),
+        )
+        return [dict(row) for row in rows]
+
+    def mark_sent(self, row_id: int):
+        self._execute(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, sent_at = ?, last_error = NULL "
+            "WHERE id = ?",
+            (SENT, time.time(), row_id),
+        )
+
+    def mark_progress(self, row_id: int, chunks_sent: int):
+        """분할 메시지 중 앞에서부터 chunks_sent개 발송 완료"""
+        self._execute("UPDATE outbox SET chunks_sent = ? WHERE id = ?", (chunks_sent, row_id))
+
+    def reschedule(self, row_id: int, delay: float, error: str, count_attempt: bool = True):
+        """delay초 뒤에 다시 시도 (RetryAfter 대기는 시도 횟수에 넣지 않음)"""
+        self._execute(
+            "UPDATE outbox SET attempts = attempts + ?, next_attempt_at = ?, last_error = ? "
+            "WHERE id = ?",
+            (1 if count_attempt else 0, time.time() + delay, error[:500], row_id),
+        )
+
+    def mark_dead(self, row_id: int, error: str):
+        self._execute(
+            "UPDATE outbox SET status = ?, attempts = attempts + 1, last_error = ? WHERE id = ?",
+            (DEAD, error[:500], row_id),
+        )
+
+    def pending_count(self) -> int:
+        rows = self._query("SELECT COUNT(*) AS n FROM outbox WHERE status = ?", (PENDING,))
+        return rows[0]["n"]
+
+    def next_due_at(self) -> Optional[float]:
+        rows = self._query(
+            "SELECT MIN(next_attempt_at) AS at FROM outbox WHERE status = ?", (PENDING,)
+        )
+        return rows[0]["at"]
+
+    def get_statuses(self, keys: List[str]) -> Dict[str, str]:
+        """멱등 키별 상태 (pending | sent | dead)"""
+        if not keys:
+            return {}
+        placeholders = ", ".join("?" for _ in keys)
+        rows = self._query(
+            f"SELECT idempotency_key, status FROM outbox WHERE idempotency_key IN ({placeholders})",
+            tuple(keys),
+        )
+        return {row["idempotency_key"]: row["status"] for row in rows}
+
+    def has_event(self, event_id: str) -> bool:
+        """발송 건이 이미 대기열에 들어갔는지 (상태 무관)"""
+        return bool(self._query("SELECT 1 FROM outbox WHERE event_id = ? LIMIT 1", (event_id,)))
+
+    def event_results(self, event_id: str) -> List[Dict]:
+        """발송 건의 채팅별 상태 (chat_id, status, attempts, last_error)"""
+        rows = self._query(
+            "SELECT chat_id, status, attempts, last_error FROM outbox WHERE event_id = ? ORDER BY id",
+            (event_id,),
+        )
+        return [dict(row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,65 @@
+"""
+Inspiration Bot - Prompt Context Builder
+Selects the most relevant prior ideas that fit a fixed token budget
+"""
+import math
+from typing import Dict, List
+
+from loguru import logger
+
+from idea_summary_store import IdeaSummaryStore
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    토큰 수 추정 (ASCII 약 4자/토큰, 한글 등 비ASCII 약 1.5자/토큰)
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / 4 + other_chars / 1.5)
+
+
+def format_entry(entry: Dict[str, str]) -> str:
+    return f"- {entry['date']} | {entry['type']} | {entry['title']} | {entry['summary']}"
+
+
+class PromptContextBuilder:
+    """
+    기존 아이디어 요약 중 프롬프트에 넣을 항목을 토큰 예산 안에서 고릅니다.
+
+    최근 항목 일부를 먼저 넣고, 남은 예산은 질의(타겟 세그먼트 또는 검증 대상)와
+    요약 본문 유사도가 높은 순서로 채웁니다.
+    """
+
+    def __init__(self, summary_store: IdeaSummaryStore, token_budget: int, recent_count: int = 10):
+        self.summary_store = summary_store
+        self.token_budget = token_budget
+        self.recent_count = recent_count
+
+    def build(self, query: str) -> Dict:
+        """
+        Returns:
+            {"text": 컨텍스트 문자열, "tokens": 사용한 추정 토큰 수, "entries": 포함 항목 수}
+        """
+        recent = self.summary_store.get_recent_entries(self.recent_count)
+        ranked = self.summary_store.rank_entries(query)
+
+        lines: List[str] = []
+        seen = set()
+        used = 0
+        for entry in recent + [e for e, _ in ranked]:
+            key = (entry["date"], entry["title"])
+            if key in seen:
+                continue
+            seen.add(key)
+            line = format_entry(entry)
+            cost = estimate_tokens(line) + 1
+            if used + cost > self.token_budget:
+                continue
+            lines.append(line)
+            used += cost
+            if self.token_budget - used < 16:
+                break
+
+        logger.info(f"🧾 프롬프트 컨텍스트: {len(lines)}건, 약 {used} 토큰 (예산 {self.token_budget})")
+        return {"text": "\n".join(lines), "tokens": used, "entries": len(lines)}
@@ -0,0 +1,104 @@
+"""
+Inspiration Bot - Rate Limiter
+Async token buckets shaped after Telegram's bot flood limits
+"""
+import asyncio
+import time
+from typing import Dict
+
+
+class TokenBucket:
+    """
+    비동기 토큰 버킷 (rate: 초당 충전 토큰 수, capacity: 최대 버스트)
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1.0):
+        """토큰이 생길 때까지 대기 후 차감 (요청 순서대로 처리)"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    await asyncio.sleep(self.blocked_until - now)
+                    continue
+                self._refill(now)
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """amount만큼 발급 가능해질 때까지 남은 시간 (초, 0이면 즉시 가능)"""
+        now = time.monotonic()
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        wait = max(0.0, self.blocked_until - now)
+        if self.tokens < amount:
+            wait = max(wait, (amount - self.tokens) / self.rate)
+        return wait
+
+    def take(self, amount: float):
+        """대기 없이 차감 (추정치 보정으로 음수 잔량이 될 수 있음)"""
+        self._refill(time.monotonic())
+        self.tokens -= amount
+
+    def give(self, amount: float):
+        """차감했던 토큰 반환 (capacity 초과분은 버림)"""
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens + amount)
+
+    def block_for(self, seconds: float):
+        """RetryAfter 등으로 일정 시간 발급 중지"""
+        self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+        self.tokens = 0.0
+
+
+class TelegramRateLimiter:
+    """
+    텔레그램 발송 제한
+    - 전체: 초당 global_per_second건
+    - 개인 채팅: 채팅당 초당 1건
+    - 그룹/채널: 채팅당 분당 group_per_minute건
+    """
+
+    def __init__(
+        self,
+        global_per_second: float = 30.0,
+        private_per_second: float = 1.0,
+        group_per_minute: float = 20.0,
+    ):
+        # 버스트 없이 고르게 분배 (1초 창에서 global_per_second를 넘지 않도록)
+        self.global_bucket = TokenBucket(global_per_second, 1)
+        self.private_per_second = private_per_second
+        self.group_per_minute = group_per_minute
+        self._chat_buckets: Dict[str, TokenBucket] = {}
+
+    def _chat_bucket(self, chat_id: str, kind: str) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            if kind == "private":
+                bucket = TokenBucket(self.private_per_second, 1)
+            else:
+                bucket = TokenBucket(self.group_per_minute / 60.0, 1)
+            self._chat_buckets[chat_id] = bucket
+        return bucket
+
+    async def acquire(self, chat_id: str, kind: str):
+        # 채팅 한도를 먼저 통과한 요청만 전체 한도를 소비
+        await self._chat_bucket(chat_id, kind).acquire()
+        await self.global_bucket.acquire()
+
+    def retry_after(self, chat_id: str, kind: str, seconds: float):
+        """RetryAfter 응답 반영 (해당 채팅 발송 일시 중지)"""
+        self._chat_bucket(chat_id, kind).block_for(seconds)
@@ -0,0 +1,134 @@
+"""
+Inspiration Bot - Semantic Similarity Index
+Hashed character n-gram vectors in a sparse NumPy index for offline near-duplicate detection
+"""
+import re
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# 해시 차원 (희소 저장이라 메모리는 차원이 아니라 요약의 n-gram 수에 비례, uint16 인덱스 범위 이내)
+VECTOR_DIM = 16384
+NGRAM_SIZES = (2, 3)
+# 이 행 수만큼 모이면 하나의 블록으로 고정 (증가 시 기존 행 복사 없음)
+BLOCK_ROWS = 8192
+
+
+def _normalize_body(text: str) -> str:
+    cleaned = re.sub(r"[^\w가-힣\s]", " ", text.lower())
+    return re.sub(r"\s+", " ", cleaned).strip()
+
+
+def sparse_vector(text: str, dim: int = VECTOR_DIM) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    문자 n-gram을 해싱한 TF 벡터 (sublinear tf, L2 정규화)의 0이 아닌 (위치, 값)
+    crc32를 사용하므로 프로세스가 달라도 같은 벡터가 나옵니다.
+    """
+    body = _normalize_body(text)
+    counts: dict = {}
+    for n in NGRAM_SIZES:
+        for i in range(len(body) - n + 1):
+            gram = body[i:i + n]
+            if gram.isspace():
+                continue
+            bucket = zlib.crc32(gram.encode("utf-8")) % dim
+            counts[bucket] = counts.get(bucket, 0) + 1
+    indices = np.fromiter(counts.keys(), dtype=np.uint16, count=len(counts))
+    values = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+    norm = float(np.linalg.norm(values))
+    if norm > 0:
+        values /= norm
+    return indices, values
+
+
+def vectorize(text: str, dim: int = VECTOR_DIM) -> np.ndarray:
+    """sparse_vector의 밀집 표현 (후보 몇 개끼리 비교할 때 사용)"""
+    vec = np.zeros(dim, dtype=np.float32)
+    indices, values = sparse_vector(text, dim)
+    vec[indices] = values
+    return vec
+
+
+class _Block:
+    """고정된 행 묶음 (CSR: 행별 길이 + n-gram 위치 uint16 + 값 float16)"""
+
+    def __init__(self, rows: List[Tuple[np.ndarray, np.ndarray]]):
+        self.lengths = np.array([len(indices) for indices, _ in rows], dtype=np.int32)
+        self.indices = np.concatenate([indices for indices, _ in rows]) if rows else np.zeros(0, np.uint16)
+        self.values = (
+            np.concatenate([values for _, values in rows]).astype(np.float16)
+            if rows else np.zeros(0, np.float16)
+        )
+
+    def __len__(self) -> int:
+        return len(self.lengths)
+
+    def scores(self, query: np.ndarray) -> np.ndarray:
+        """밀집 질의 벡터와 각 행의 코사인 유사도"""
+        contributions = query[self.indices] * self.values.astype(np.float32)
+        rows = np.repeat(np.arange(len(self.lengths)), self.lengths)
+        return np.bincount(rows, weights=contributions, minlength=len(self.lengths)).astype(np.float32)
+
+
+class SemanticIndex:
+    """
+    요약 본문 근접 중복 검색용 벡터 인덱스 (증분 추가)
+
+    행 단위로 정규화된 희소 벡터를 BLOCK_ROWS행 블록에 쌓고 (요약 10만 건 ≈ 수십 MB),
+    질의는 블록마다 0이 아닌 항목만 곱해 코사인 유사도를 계산합니다.
+    """
+
+    def __init__(self, dim: int = VECTOR_DIM):
+        self.dim = dim
+        self._blocks: List[_Block] = []
+        self._open: List[Tuple[np.ndarray, np.ndarray]] = []
+        self._open_block: Optional[_Block] = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, text: str) -> int:
+        """벡터 1개 추가 후 행 번호 반환"""
+        return self.add_many([text])[0]
+
+    def add_many(self, texts: Iterable[str]) -> List[int]:
+        start = self._size
+        for text in texts:
+            self._open.append(sparse_vector(text, self.dim))
+            self._size += 1
+            if len(self._open) == BLOCK_ROWS:
+                self._blocks.append(_Block(self._open))
+                self._open = []
+        self._open_block = None
+        return list(range(start, self._size))
+
+    def _all_blocks(self) -> List[_Block]:
+        if self._open and self._open_block is None:
+            self._open_block = _Block(self._open)
+        return self._blocks + ([self._open_block] if self._open else [])
+
+    def similarities(self, texts: List[str]) -> np.ndarray:
+        """
+        질의 텍스트들 x 인덱스 전체의 코사인 유사도 행렬 (len(texts), len(self))
+        """
+        result = np.zeros((len(texts), self._size), dtype=np.float32)
+        if not texts or self._size == 0:
+            return result
+        blocks = self._all_blocks()
+        for row, text in enumerate(texts):
+            query = vectorize(text, self.dim)
+            start = 0
+            for block in blocks:
+                result[row, start:start + len(block)] = block.scores(query)
+                start += len(block)
+        return result
+
+    def most_similar(self, text: str) -> Optional[Tuple[int, float]]:
+        """가장 유사한 행 번호와 유사도 (인덱스가 비어 있으면 None)"""
+        if self._size == 0:
+            return None
+        scores = self.similarities([text])[0]
+        best = int(np.argmax(scores))
+        return best, float(scores[best])
@@ -0,0 +1,246 @@
+"""
+Inspiration Bot - SQLite Storage Backend
+History and summaries in one SQLite (WAL) database with indexed lookups
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config import settings
+from idea_history import HistoryStore, IdeaHistory
+from idea_summary_store import IdeaSummaryStore
+from storage import IdeaStorage
+from title_index import normalize_title
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    norm_title TEXT NOT NULL,
+    idea_type TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_norm_title ON history(norm_title);
+CREATE INDEX IF NOT EXISTS idx_history_created_at ON history(created_at, id);
+
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_date TEXT NOT NULL,
+    idea_type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    norm_title TEXT NOT NULL,
+    summary TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class SQLiteDatabase:
+    """스레드 간 공유하는 단일 SQLite 연결 (WAL 모드)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.RLock()
+        self.conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def get_meta(self, key: str) -> Optional[str]:
+        rows = self.query("SELECT value FROM meta WHERE key = ?", (key,))
+        return rows[0]["value"] if rows else None
+
+    def transaction(self):
+        return _Transaction(self)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ~ COMMIT/ROLLBACK 컨텍스트"""
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.db.lock.acquire()
+        self.db.conn.execute("BEGIN IMMEDIATE")
+        return self.db.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.db.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.db.lock.release()
+        return False
+
+
+def _set_meta(conn: sqlite3.Connection, key: str, value: str):
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, value),
+    )
+
+
+def _insert_history(conn: sqlite3.Connection, title: str, idea_type: str, created_at: str):
+    conn.execute(
+        "INSERT INTO history (title, norm_title, idea_type, created_at) VALUES (?, ?, ?, ?)",
+        (title, normalize_title(title), idea_type, created_at),
+    )
+    _set_meta(conn, "last_type", idea_type)
+
+
+def _trim_history(conn: sqlite3.Connection):
+    """최근 history_max_items건 밖의 히스토리 삭제 (마이그레이션 항목은 created_at이 비어 가장 오래된 것으로 취급)"""
+    conn.execute(
+        "DELETE FROM history WHERE id NOT IN "
+        "(SELECT id FROM history ORDER BY created_at DESC, id DESC LIMIT ?)",
+        (settings.history_max_items,),
+    )
+
+
+def _insert_summary(conn: sqlite3.Connection, created_date: str, idea_type: str, title: str, summary: str):
+    conn.execute(
+        "INSERT INTO summaries (created_date, idea_type, title, norm_title, summary) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (created_date, idea_type, title, normalize_title(title), summary),
+    )
+
+
+class SQLiteIdeaHistory(HistoryStore):
+    """
+    HistoryStore의 SQLite 구현
+    파일 히스토리처럼 최근 history_max_items건만 남깁니다. (created_at 인덱스 사용)
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+
+    def record_idea(self, title: str, idea_type: str):
+        with self.db.transaction() as conn:
+            _insert_history(conn, title, idea_type, datetime.now().isoformat(timespec="seconds"))
+            _trim_history(conn)
+
+    def is_duplicate(self, title: str) -> bool:
+        rows = self.db.query(
+            "SELECT 1 FROM history WHERE norm_title = ? LIMIT 1",
+            (normalize_title(title),),
+        )
+        return bool(rows)
+
+    def get_recent_titles(self, limit: int = 20) -> List[str]:
+        rows = self.db.query(
+            "SELECT title FROM history ORDER BY created_at DESC, id DESC LIMIT ?", (limit,)
+        )
+        return [row["title"] for row in reversed(rows)]
+
+
+class SQLiteIdeaSummaryStore(IdeaSummaryStore):
+    """
+    IdeaSummaryStore와 같은 인터페이스의 SQLite 구현
+
+    메모리 캐시는 그대로 사용하며, 파일 tail 대신 마지막으로 읽은 id 이후 행만 가져옵니다.
+    """
+
+    def __init__(self, db: SQLiteDatabase):
+        self.db = db
+        self.file_path = db.path
+        self._lock = threading.RLock()
+        self._reset_cache()
+
+    def _refresh(self):
+        # self._offset = 마지막으로 읽은 summaries.id
+        rows = self.db.query(
+            "SELECT id, created_date, idea_type, title, summary FROM summaries "
+            "WHERE id > ? ORDER BY id",
+            (self._offset,),
+        )
+        if not rows:
+            return
+        self._offset = rows[-1]["id"]
+        self._ingest([self._row_to_entry(row) for row in rows])
+
+    @staticmethod
+    def _row_to_entry(row: sqlite3.Row) -> Dict[str, str]:
+        return {
+            "date": row["created_date"],
+            "type": row["idea_type"],
+            "title": row["title"],
+            "summary": row["summary"],
+        }
+
+    def append_summary(self, title: str, idea_type: str, summary: str):
+        safe_title = title.replace("\n", " ").replace("|", "/").strip()
+        safe_summary = summary.replace("\n", " ").replace("|", "/").strip()
+        with self._lock:
+            with self.db.transaction() as conn:
+                _insert_summary(conn, datetime.now().strftime("%Y-%m-%d"), idea_type, safe_title, safe_summary)
+            logger.info(f"🗂️ 아이디어 요약 저장: {safe_title}")
+            self._refresh()
+
+
+class SQLiteIdeaStorage(IdeaStorage):
+    """
+    SQLite 백엔드: 히스토리 + 요약을 한 트랜잭션으로 기록
+    """
+
+    def __init__(self, path: Path):
+        self.db = SQLiteDatabase(path)
+        self.migrate_from_files()
+        self.history = SQLiteIdeaHistory(self.db)
+        self.summaries = SQLiteIdeaSummaryStore(self.db)
+        logger.info(f"🗄️ SQLite 저장소 사용: {path.name}")
+
+    def record(self, title: str, idea_type: str, summary: str):
+        safe_title = title.replace("\n", " ").replace("|", "/").strip()
+        safe_summary = summary.replace("\n", " ").replace("|", "/").strip()
+        now = datetime.now()
+        with self.db.transaction() as conn:
+            _insert_history(conn, title, idea_type, now.isoformat(timespec="seconds"))
+            _trim_history(conn)
+            _insert_summary(conn, now.strftime("%Y-%m-%d"), idea_type, safe_title, safe_summary)
+        logger.info(f"🗂️ 아이디어 기록 (SQLite): {safe_title}")
+        with self.summaries._lock:
+            self.summaries._refresh()
+
+    def migrate_from_files(self):
+        """
+        기존 idea_history.json / idea_summaries.txt 내용을 1회만 가져옵니다.
+        """
+        if self.db.get_meta("migrated_from_files"):
+            return
+
+        history = IdeaHistory()
+        summaries = IdeaSummaryStore()
+        history_items = history.data.get("history", [])
+        summary_entries = summaries.get_entries()
+
+        with self.db.transaction() as conn:
+            for item in history_items:
+                if item.get("title"):
+                    _insert_history(conn, item["title"], item.get("type", "software"), "")
+            _set_meta(conn, "last_type", history.data.get("last_type", "mixed"))
+            for e in summary_entries:
+                _insert_summary(conn, e["date"], e["type"], e["title"], e["summary"])
+            _set_meta(conn, "migrated_from_files", datetime.now().isoformat(timespec="seconds"))
+
+        logger.info(
+            f"🗄️ 파일 → SQLite 마이그레이션 완료 "
+            f"(히스토리 {len(history_items)}건, 요약 {len(summary_entries)}건)"
+        )
@@ -0,0 +1,33 @@
+"""
+Inspiration Bot - Storage Backends
+Bundles idea history + summary store behind one pluggable interface
+"""
+
+from config import settings
+from idea_history import IdeaHistory
+from idea_summary_store import IdeaSummaryStore
+from transport import data_path
+
+
+class IdeaStorage:
+    """
+    기본(파일) 백엔드: idea_history.json + idea_summaries.txt
+    """
+
+    def __init__(self):
+        self.history = IdeaHistory()
+        self.summaries = IdeaSummaryStore()
+
+    def record(self, title: str, idea_type: str, summary: str):
+        """발송할 아이디어를 히스토리와 요약에 함께 기록"""
+        self.history.record_idea(title, idea_type)
+        self.summaries.append_summary(title, idea_type, summary)
+
+
+def create_storage() -> IdeaStorage:
+    """settings.storage_backend에 맞는 저장소 생성 (file | sqlite)"""
+    if settings.storage_backend == "sqlite":
+        from sqlite_storage import SQLiteIdeaStorage
+
+        return SQLiteIdeaStorage(data_path(settings.sqlite_path))
+    return IdeaStorage()
@@ -0,0 +1,117 @@
+"""
+Inspiration Bot - Subscriber Registry
+Persists the chats and channels that receive the daily idea
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config import settings
+from transport import data_path
+
+SUBSCRIBERS_FILE = "subscribers.json"
+# 항목 출처: 설정(TELEGRAM_CHAT_ID / TELEGRAM_SUBSCRIBER_CHAT_IDS)에서 온 항목은 설정에서 빠지면 제거
+SOURCE_SETTINGS = "settings"
+SOURCE_MANUAL = "manual"
+
+
+def infer_chat_kind(chat_id: str) -> str:
+    """chat_id 형식으로 채팅 종류 추정 (음수 = 그룹/채널)"""
+    value = str(chat_id).strip()
+    if value.startswith("@") or value.startswith("-100"):
+        return "channel"
+    if value.startswith("-"):
+        return "group"
+    return "private"
+
+
+class SubscriberRegistry:
+    """
+    아이디어를 받을 채팅 목록 (subscribers.json)
+
+    settings.telegram_chat_id와 settings.telegram_subscriber_chat_ids는 항상 포함되고,
+    설정에서 온 항목은 설정에서 빠지면 다음 시작 시 제거됩니다. (add()로 추가한 항목은 유지)
+    """
+
+    def __init__(self):
+        self.file_path = data_path(SUBSCRIBERS_FILE)
+        self.subscribers: Dict[str, Dict[str, str]] = self._load_subscribers()
+        self._sync_from_settings()
+
+    def _load_subscribers(self) -> Dict[str, Dict[str, str]]:
+        if not self.file_path.exists():
+            return {}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {str(s["chat_id"]): s for s in data.get("subscribers", []) if s.get("chat_id")}
+        except Exception as e:
+            logger.error(f"구독자 목록 로드 실패: {e}")
+            return {}
+
+    def _save_subscribers(self):
+        tmp_path = self.file_path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"subscribers": list(self.subscribers.values())}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.file_path)
+        except Exception as e:
+            logger.error(f"구독자 목록 저장 실패: {e}")
+
+    def _sync_from_settings(self):
+        configured = {
+            chat_id.strip()
+            for chat_id in [settings.telegram_chat_id] + settings.telegram_subscriber_chat_ids.split(",")
+            if chat_id.strip()
+        }
+        changed = False
+        for chat_id in configured:
+            if chat_id not in self.subscribers:
+                self.subscribers[chat_id] = self._make_entry(chat_id, source=SOURCE_SETTINGS)
+                changed = True
+        # 출처가 없는 항목은 add() 이전 버전에서 설정으로만 추가된 것
+        for chat_id, entry in list(self.subscribers.items()):
+            if entry.get("source", SOURCE_SETTINGS) == SOURCE_SETTINGS and chat_id not in configured:
+                del self.subscribers[chat_id]
+                logger.info(f"📭 설정에서 빠진 구독자 제거: {chat_id}")
+                changed = True
+        if changed:
+            self._save_subscribers()
+
+    @staticmethod
+    def _make_entry(chat_id: str, kind: Optional[str] = None, source: str = SOURCE_MANUAL) -> Dict[str, str]:
+        return {
+            "chat_id": chat_id,
+            "kind": kind or infer_chat_kind(chat_id),
+            "source": source,
+            "added_at": datetime.now().isoformat(timespec="seconds"),
+        }
+
+    def add(self, chat_id: str, kind: Optional[str] = None) -> bool:
+        chat_id = str(chat_id).strip()
+        if not chat_id or chat_id in self.subscribers:
+            return False
+        self.subscribers[chat_id] = self._make_entry(chat_id, kind)
+        self._save_subscribers()
+        logger.info(f"📬 구독자 추가: {chat_id}")
+        return True
+
+    def remove(self, chat_id: str) -> bool:
+        if self.subscribers.pop(str(chat_id), None) is None:
+            return False
+        self._save_subscribers()
+        logger.info(f"📭 구독자 제거: {chat_id}")
+        return True
+
+    def get_kind(self, chat_id: str) -> str:
+        entry = self.subscribers.get(str(chat_id))
+        return entry["kind"] if entry else infer_chat_kind(chat_id)
+
+    def get_subscribers(self) -> List[Dict[str, str]]:
+        return list(self.subscribers.values())
+
+    def __len__(self) -> int:
+        return len(self.subscribers)
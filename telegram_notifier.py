@@ -3,18 +3,72 @@ Inspiration Bot - Telegram Notifier
 Sends creative ideas to Telegram
 """
 import asyncio
+import random
+import time
+import uuid
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Set
+import httpx
 import pytz
 from telegram import Bot
-from telegram.error import TelegramError
+from telegram.error import (
+    BadRequest,
+    Forbidden,
+    InvalidToken,
+    NetworkError,
+    RetryAfter,
+    TelegramError,
+    TimedOut,
+)
+from telegram.request import HTTPXRequest
 from loguru import logger
 
+import metrics
 from config import settings
+from markdown_renderer import html_to_text, render_html
+from message_chunker import split_message
+from outbox import DEAD, PENDING, SENT, Outbox
+from rate_limiter import TelegramRateLimiter
+from subscriber_registry import SubscriberRegistry
+from transport import REPLAY, data_path, describe_error, open_transport
 
 
-# Telegram 메시지 최대 길이
-MAX_MESSAGE_LENGTH = 4096
+# RetryAfter 응답 시 같은 메시지 재시도 횟수
+MAX_RETRY_AFTER = 3
+# 발송 대기열 워커가 한 번에 가져올 메시지 수 / 대기열이 비었을 때 확인 주기 (초)
+OUTBOX_BATCH = 50
+OUTBOX_IDLE_SECONDS = 60.0
+
+
+def retry_after_seconds(error: RetryAfter) -> float:
+    """RetryAfter.retry_after (int 또는 timedelta)를 초로 변환"""
+    value = error.retry_after
+    if hasattr(value, "total_seconds"):
+        return float(value.total_seconds())
+    return float(value)
+
+
+# 재생 시 기록된 예외 이름 -> 예외 클래스 (발송 실패 처리 분기가 같도록)
+REPLAY_ERRORS = {
+    "BadRequest": BadRequest,
+    "Forbidden": Forbidden,
+    "InvalidToken": InvalidToken,
+    "NetworkError": NetworkError,
+    "TimedOut": TimedOut,
+}
+
+
+def describe_telegram_error(error: Exception) -> Dict:
+    data = describe_error(error)
+    if isinstance(error, RetryAfter):
+        data["retry_after"] = retry_after_seconds(error)
+    return data
+
+
+def rebuild_telegram_error(data: Dict) -> Exception:
+    if data["type"] == "RetryAfter":
+        return RetryAfter(retry_after=int(data.get("retry_after") or 1))
+    return REPLAY_ERRORS.get(data["type"], TelegramError)(data["message"])
 
 
 class TelegramNotifier:
@@ -26,159 +80,386 @@ class TelegramNotifier:
         self.bot: Optional[Bot] = None
         self.chat_id = settings.telegram_chat_id
         self.timezone = pytz.timezone(settings.timezone)
+        self.subscribers = SubscriberRegistry()
+        self.rate_limiter = TelegramRateLimiter(
+            global_per_second=settings.telegram_global_rate,
+            private_per_second=settings.telegram_private_rate,
+            group_per_minute=settings.telegram_group_rate_per_minute,
+        )
+        self.outbox = Outbox(data_path(settings.outbox_path, seed=False))
+        self._outbox_wakeup = asyncio.Event()
+        self._outbox_task: Optional[asyncio.Task] = None
+        # 기록/재생 모드에서는 send_message 호출을 기록 파일로 대체
+        self.transport = open_transport("telegram")
     
     def get_now(self) -> datetime:
         """KST 현재 시간 반환"""
         return datetime.now(self.timezone)
     
+    def _build_request(self) -> HTTPXRequest:
+        """
+        발송용 HTTP 커넥션 풀 (팬아웃/분할 발송 동안 keep-alive 연결 재사용)
+        """
+        pool_size = settings.telegram_pool_size
+        return HTTPXRequest(
+            connection_pool_size=pool_size,
+            connect_timeout=settings.telegram_connect_timeout,
+            read_timeout=settings.telegram_read_timeout,
+            write_timeout=settings.telegram_write_timeout,
+            pool_timeout=settings.telegram_pool_timeout,
+            httpx_kwargs={
+                "limits": httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=settings.telegram_keepalive_seconds,
+                ),
+            },
+        )
+    
     async def start(self):
         """Initialize Telegram bot"""
         try:
-            self.bot = Bot(token=settings.telegram_bot_token)
-            logger.info("📱 Telegram 봇 초기화 완료")
+            self.bot = Bot(token=settings.telegram_bot_token, request=self._build_request())
         except Exception as e:
             logger.error(f"❌ Telegram 봇 초기화 실패: {e}")
             self.bot = None
+            return
+        
+        try:
+            if self.transport.mode == REPLAY:
+                logger.info("📼 재생 모드: Telegram 연결 확인 생략")
+            else:
+                await self.bot.initialize()
+            logger.info(f"📱 Telegram 봇 초기화 완료 (커넥션 풀 {settings.telegram_pool_size})")
+        except InvalidToken as e:
+            logger.error(f"❌ Telegram 봇 초기화 실패: {e}")
+            await self._shutdown_bot()
+            return
+        except Exception as e:
+            # 일시적인 네트워크 문제는 발송 시 재시도되므로 봇은 유지
+            logger.warning(f"⚠️ Telegram 봇 초기화 확인 실패, 발송 시 재시도: {e}")
+        
+        # 이전 실행에서 남은 대기 메시지도 이어서 발송
+        pending = self.outbox.pending_count()
+        if pending:
+            logger.info(f"📮 발송 대기열에 남은 메시지 {pending}건 재발송 예정")
+        self._outbox_task = asyncio.create_task(self._outbox_loop())
+    
+    async def _shutdown_bot(self):
+        """커넥션 풀 정리"""
+        if not self.bot:
+            return
+        try:
+            await self.bot.shutdown()
+        except Exception as e:
+            logger.warning(f"⚠️ Telegram 봇 종료 중 에러: {e}")
+        self.bot = None
     
     async def close(self):
         """Cleanup"""
-        pass
+        if self._outbox_task and not self._outbox_task.done():
+            self._outbox_task.cancel()
+            try:
+                await self._outbox_task
+            except asyncio.CancelledError:
+                pass
+        await self._shutdown_bot()
+        self.outbox.close()
+    
+    async def _send(self, text: str, parse_mode: Optional[str], chat_id: str):
+        """
+        단일 send_message 호출
+        발송 제한(토큰 버킷)을 통과한 뒤 보내고, RetryAfter는 대기 후 재시도합니다.
+        """
+        kind = self.subscribers.get_kind(chat_id)
+        for attempt in range(MAX_RETRY_AFTER + 1):
+            await self.rate_limiter.acquire(chat_id, kind)
+            started = time.perf_counter()
+            try:
+                await self.transport.call(
+                    "send",
+                    {"chat_id": chat_id, "parse_mode": parse_mode, "text": text},
+                    lambda: self.bot.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        parse_mode=parse_mode
+                    ),
+                    encode=lambda message: {"message_id": getattr(message, "message_id", None)},
+                    decode=lambda data: data,
+                    stored={"chat_id": chat_id, "parse_mode": parse_mode, "chars": len(text)},
+                    encode_error=describe_telegram_error,
+                    rebuild=rebuild_telegram_error,
+                )
+                return
+            except RetryAfter as e:
+                metrics.TELEGRAM_SEND_FAILURES.labels(error="RetryAfter").inc()
+                if attempt == MAX_RETRY_AFTER:
+                    raise
+                wait = retry_after_seconds(e)
+                logger.warning(f"⏳ 발송 제한 ({chat_id}): {wait:.0f}초 후 재시도")
+                self.rate_limiter.retry_after(chat_id, kind, wait)
+            except TelegramError as e:
+                metrics.TELEGRAM_SEND_FAILURES.labels(error=type(e).__name__).inc()
+                raise
+            finally:
+                metrics.TELEGRAM_SEND_LATENCY.observe(time.perf_counter() - started)
     
     async def send_message(
         self,
         message: str,
-        parse_mode: Optional[str] = "Markdown"
+        parse_mode: Optional[str] = "Markdown",
+        chat_id: Optional[str] = None
     ) -> bool:
-        """메시지 발송 (Markdown 실패시 HTML -> 일반 텍스트 fallback)"""
+        """메시지 발송 (Markdown은 HTML로 변환해 발송)"""
         if not self.bot:
             return False
         
         try:
-            # 메시지가 너무 길면 분할 발송
-            if len(message) > MAX_MESSAGE_LENGTH:
-                return await self._send_long_message(message, parse_mode)
-            
-            await self.bot.send_message(
-                chat_id=self.chat_id,
-                text=message,
-                parse_mode=parse_mode
-            )
+            await self._deliver(message, parse_mode, chat_id or self.chat_id)
             return True
         except TelegramError as e:
-            error_msg = str(e)
-            logger.warning(f"⚠️ Markdown 발송 실패, 일반 텍스트로 재시도: {error_msg}")
-            
-            # Markdown 파싱 에러시 일반 텍스트로 재시도
-            if "parse" in error_msg.lower() or "entities" in error_msg.lower():
-                try:
-                    # Markdown 기호 제거 후 재발송
-                    clean_message = self._clean_markdown(message)
-                    
-                    if len(clean_message) > MAX_MESSAGE_LENGTH:
-                        return await self._send_long_message(clean_message, None)
-                    
-                    await self.bot.send_message(
-                        chat_id=self.chat_id,
-                        text=clean_message,
-                        parse_mode=None
-                    )
-                    logger.info("✅ 일반 텍스트로 발송 성공")
-                    return True
-                except TelegramError as e2:
-                    logger.error(f"❌ 일반 텍스트 발송도 실패: {e2}")
-                    return False
-            
             logger.error(f"❌ Telegram 발송 실패: {e}")
             return False
     
-    async def _send_long_message(
+    async def _deliver(
         self,
         message: str,
-        parse_mode: Optional[str]
-    ) -> bool:
-        """긴 메시지를 분할 발송"""
-        # 구분선 기준으로 분할
-        parts = message.split("━━━━━━━━━━━━━━━")
-        
-        if len(parts) <= 1:
-            # 구분선이 없으면 글자 수 기준 분할
-            parts = [message[i:i+MAX_MESSAGE_LENGTH] 
-                     for i in range(0, len(message), MAX_MESSAGE_LENGTH)]
-        
-        success = True
-        current_chunk = ""
+        parse_mode: Optional[str],
+        chat_id: str
+    ):
+        """
+        메시지 1건 발송 (실패 시 TelegramError 발생)
+        """
+        chunks, parse_mode = self._plan_chunks(message, parse_mode)
+        for chunk in chunks:
+            await self._send_chunk(chunk, parse_mode, chat_id)
+    
+    def _plan_chunks(self, message: str, parse_mode: Optional[str]) -> tuple:
+        """
+        발송 전 청크 계획 (같은 메시지는 항상 같은 청크로 나뉨)
+        Markdown은 로컬에서 Telegram HTML로 변환해 파싱 에러 없이 보내고,
+        긴 메시지는 길이 제한에 맞춰 분할합니다.
         
-        for i, part in enumerate(parts):
-            separator = "━━━━━━━━━━━━━━━\n" if i > 0 else ""
-            candidate = current_chunk + separator + part
+        Returns:
+            (청크 목록, 실제 parse_mode)
+        """
+        if parse_mode == "Markdown":
+            message, parse_mode = render_html(message), "HTML"
+        chunks = split_message(message, parse_mode)
+        if len(chunks) > 1:
+            logger.info(f"✂️ 긴 메시지 {len(chunks)}개로 분할 발송")
+        return chunks, parse_mode
+    
+    async def _send_chunk(
+        self,
+        chunk: str,
+        parse_mode: Optional[str],
+        chat_id: str
+    ):
+        """청크 1개 발송 (그래도 파싱 에러가 나면 해당 청크만 일반 텍스트로 재시도)"""
+        try:
+            await self._send(chunk, parse_mode, chat_id)
+        except TelegramError as e:
+            error_msg = str(e)
+            if parse_mode != "HTML" or (
+                "parse" not in error_msg.lower() and "entities" not in error_msg.lower()
+            ):
+                raise
             
-            if len(candidate) > MAX_MESSAGE_LENGTH:
-                # 현재 청크 발송
-                if current_chunk.strip():
-                    try:
-                        await self.bot.send_message(
-                            chat_id=self.chat_id,
-                            text=current_chunk.strip(),
-                            parse_mode=parse_mode
-                        )
-                    except TelegramError:
-                        # Markdown 실패시 일반 텍스트로
-                        clean = self._clean_markdown(current_chunk.strip())
-                        try:
-                            await self.bot.send_message(
-                                chat_id=self.chat_id,
-                                text=clean,
-                                parse_mode=None
-                            )
-                        except TelegramError as e:
-                            logger.error(f"❌ 분할 발송 실패: {e}")
-                            success = False
-                    await asyncio.sleep(0.5)  # 스팸 방지
-                
-                current_chunk = separator + part
-            else:
-                current_chunk = candidate
+            logger.warning(f"⚠️ HTML 파싱 실패, 일반 텍스트로 재시도: {error_msg}")
+            await self._send(html_to_text(chunk), None, chat_id)
+            logger.info("✅ 일반 텍스트로 발송 성공")
+    
+    async def enqueue_idea(self, idea: str, event_id: Optional[str] = None) -> List[str]:
+        """
+        아이디어 메시지를 구독자별로 발송 대기열에 넣고 멱등 키 목록을 반환
         
-        # 마지막 청크 발송
-        if current_chunk.strip():
-            try:
-                await self.bot.send_message(
-                    chat_id=self.chat_id,
-                    text=current_chunk.strip(),
-                    parse_mode=parse_mode
-                )
-            except TelegramError:
-                clean = self._clean_markdown(current_chunk.strip())
-                try:
-                    await self.bot.send_message(
-                        chat_id=self.chat_id,
-                        text=clean,
-                        parse_mode=None
-                    )
-                except TelegramError as e:
-                    logger.error(f"❌ 마지막 분할 발송 실패: {e}")
-                    success = False
+        Args:
+            idea: 아이디어 텍스트
+            event_id: 발송 건 식별자 (같은 값으로 다시 넣으면 중복 무시, 없으면 새 발송 건)
+        """
+        subscribers = self.subscribers.get_subscribers()
+        if not subscribers:
+            logger.warning("📭 발송할 구독자가 없습니다")
+            return []
         
-        return success
+        event_id = event_id or uuid.uuid4().hex
+        keys = await asyncio.to_thread(
+            lambda: [self.outbox.enqueue(event_id, s["chat_id"], idea, "Markdown") for s in subscribers]
+        )
+        logger.info(f"📮 발송 대기열 추가: {len(keys)}건")
+        self._outbox_wakeup.set()
+        return keys
+    
+    async def has_event(self, event_id: str) -> bool:
+        """발송 건이 이미 대기열에 들어갔는지 (같은 날 일일 발송 재실행 확인용)"""
+        return await asyncio.to_thread(self.outbox.has_event, event_id)
     
-    @staticmethod
-    def _clean_markdown(text: str) -> str:
-        """Markdown 특수문자 제거하여 일반 텍스트로 변환"""
-        # 볼드/이탤릭 기호 제거
-        cleaned = text.replace("*", "").replace("_", "").replace("`", "")
-        # 링크 형식 [text](url) -> text (url)
-        import re
-        cleaned = re.sub(r'\[([^\]]+)\]\(([^)]+)\)', r'\1 (\2)', cleaned)
-        return cleaned
+    async def notify_admin(self, message: str) -> bool:
+        """
+        운영 알림(생성 오류 등)을 관리자 채팅(TELEGRAM_CHAT_ID)에만 발송 (대기열 경유, 일반 텍스트)
+        
+        Returns:
+            대기열에 들어가면 True
+        """
+        if not self.chat_id:
+            logger.warning("⚠️ 관리자 채팅이 설정되지 않아 운영 알림을 보내지 않습니다")
+            return False
+        try:
+            await asyncio.to_thread(
+                self.outbox.enqueue, f"admin:{uuid.uuid4().hex}", self.chat_id, message, None
+            )
+        except Exception as e:
+            logger.error(f"❌ 운영 알림 대기열 추가 실패: {e}")
+            return False
+        self._outbox_wakeup.set()
+        return True
     
-    async def send_idea(self, idea: str) -> bool:
+    async def send_idea(self, idea: str, event_id: Optional[str] = None) -> bool:
         """
-        아이디어 메시지 발송
+        아이디어 메시지를 모든 구독자에게 발송 (대기열 경유)
+        
+        실제 발송은 대기열 워커가 맡으므로 생성 흐름을 막지 않으며,
+        실패한 메시지는 재시작 이후에도 재시도됩니다.
         
         Args:
             idea: 생성된 아이디어 텍스트
+            event_id: 발송 건 식별자 (예: daily:2024-01-01, 없으면 새 발송 건)
+
+        Returns:
+            모든 구독자 분이 대기열에 들어가면 True
         """
-        return await self.send_message(idea, parse_mode="Markdown")
+        try:
+            keys = await self.enqueue_idea(idea, event_id)
+        except Exception as e:
+            logger.error(f"❌ 발송 대기열 추가 실패: {e}")
+            return False
+        return bool(keys)
+    
+    async def wait_delivered(self, keys: List[str], timeout: float) -> bool:
+        """
+        대기열 메시지가 모두 발송될 때까지 최대 timeout초 대기
+        
+        Returns:
+            모두 sent 상태가 되면 True (dead가 있거나 시간 초과 시 False)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            statuses = await asyncio.to_thread(self.outbox.get_statuses, keys)
+            if any(status == DEAD for status in statuses.values()):
+                return False
+            if keys and all(statuses.get(key) == SENT for key in keys):
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.5)
+    
+    async def _outbox_loop(self):
+        """
+        발송 대기열 워커: 발송 시각이 된 메시지를 보내고, 없으면 다음 시각까지 대기
+        """
+        while True:
+            self._outbox_wakeup.clear()
+            try:
+                rows = await asyncio.to_thread(self.outbox.due, OUTBOX_BATCH)
+                if rows:
+                    await self._deliver_rows(rows)
+                    continue
+                metrics.OUTBOX_PENDING.set(await asyncio.to_thread(self.outbox.pending_count))
+                next_at = await asyncio.to_thread(self.outbox.next_due_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ 발송 대기열 처리 에러: {e}")
+                next_at = None
+            
+            timeout = OUTBOX_IDLE_SECONDS
+            if next_at is not None:
+                timeout = min(timeout, max(0.0, next_at - time.time()))
+            try:
+                await asyncio.wait_for(self._outbox_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _deliver_rows(self, rows: List[Dict]):
+        """채팅별로는 순서대로, 채팅끼리는 동시에 발송"""
+        by_chat: Dict[str, List[Dict]] = {}
+        for row in rows:
+            by_chat.setdefault(row["chat_id"], []).append(row)
+        finished: Set[str] = set()
+        
+        async def deliver_chat(chat_rows: List[Dict]):
+            for row in chat_rows:
+                if await self._deliver_row(row) != "retry" and row.get("event_id"):
+                    finished.add(row["event_id"])
+        
+        await asyncio.gather(*[deliver_chat(chat_rows) for chat_rows in by_chat.values()])
+        for event_id in finished:
+            await self._report_event(event_id)
+    
+    async def _report_event(self, event_id: str):
+        """발송 건의 모든 채팅이 sent/dead가 되면 채팅별 결과를 한 번 기록"""
+        results = await asyncio.to_thread(self.outbox.event_results, event_id)
+        if any(r["status"] == PENDING for r in results):
+            return
+        failed = [r for r in results if r["status"] == DEAD]
+        for r in results:
+            metrics.OUTBOX_EVENT_RECIPIENTS.labels(result=r["status"]).inc()
+        summary = f"📊 발송 결과 {event_id}: {len(results) - len(failed)}/{len(results)} 성공"
+        if failed:
+            details = ", ".join(f"{r['chat_id']}({(r['last_error'] or '')[:80]})" for r in failed)
+            logger.warning(f"{summary} - 실패: {details}")
+        else:
+            logger.info(summary)
+    
+    async def _deliver_row(self, row: Dict) -> str:
+        """
+        대기열 메시지 1건 발송 후 결과에 따라 상태 갱신
+        분할 메시지는 청크마다 진행 상황을 기록해, 재시도 시 이미 보낸 청크는 건너뜁니다.
+        
+        Returns:
+            sent | retry | dead
+        """
+        row_id, chat_id = row["id"], row["chat_id"]
+        try:
+            chunks, parse_mode = self._plan_chunks(row["text"], row["parse_mode"])
+            if row["chunks_sent"]:
+                logger.info(f"✂️ {chat_id}: {row['chunks_sent']}/{len(chunks)}개 발송됨, 이어서 발송")
+            for index in range(row["chunks_sent"], len(chunks)):
+                await self._send_chunk(chunks[index], parse_mode, chat_id)
+                await asyncio.to_thread(self.outbox.mark_progress, row_id, index + 1)
+        except RetryAfter as e:
+            wait = retry_after_seconds(e)
+            logger.warning(f"⏳ 대기열 발송 제한 ({chat_id}): {wait:.0f}초 후 재시도")
+            await asyncio.to_thread(self.outbox.reschedule, row_id, wait, str(e), False)
+            metrics.OUTBOX_DELIVERIES.labels(result="retry").inc()
+            return "retry"
+        except (Forbidden, BadRequest) as e:
+            # 봇 차단/잘못된 채팅 등은 재시도해도 같은 결과
+            logger.error(f"❌ 대기열 발송 포기 ({chat_id}): {e}")
+            await asyncio.to_thread(self.outbox.mark_dead, row_id, str(e))
+            metrics.OUTBOX_DELIVERIES.labels(result="dead").inc()
+            return "dead"
+        except Exception as e:
+            attempts = row["attempts"] + 1
+            if attempts >= settings.outbox_max_attempts:
+                logger.error(f"❌ 대기열 발송 포기 ({chat_id}, {attempts}회 실패): {e}")
+                await asyncio.to_thread(self.outbox.mark_dead, row_id, str(e))
+                metrics.OUTBOX_DELIVERIES.labels(result="dead").inc()
+                return "dead"
+            delay = min(
+                settings.outbox_retry_max_seconds,
+                settings.outbox_retry_base_seconds * 2 ** (attempts - 1),
+            ) * random.uniform(0.8, 1.2)
+            logger.warning(f"🔁 대기열 발송 실패 ({chat_id}, {attempts}회): {delay:.0f}초 후 재시도 - {e}")
+            await asyncio.to_thread(self.outbox.reschedule, row_id, delay, str(e))
+            metrics.OUTBOX_DELIVERIES.labels(result="retry").inc()
+            return "retry"
+        
+        await asyncio.to_thread(self.outbox.mark_sent, row_id)
+        metrics.OUTBOX_DELIVERIES.labels(result="sent").inc()
+        logger.info(f"📨 대기열 발송 완료 ({chat_id})")
+        return "sent"
 
 
 # Test
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# 모듈이 봇 폴더에 평평하게 있으므로 테스트에서 바로 import
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
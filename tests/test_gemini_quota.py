@@ -0,0 +1,96 @@
+"""
+Inspiration Bot - Gemini Quota Tests
+Daily RPD/TPD limits enforced against per-date usage persisted across restarts
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import gemini_quota
+from gemini_quota import GeminiQuota, QuotaExhaustedError
+
+
+@pytest.fixture
+def quota_file(tmp_path, monkeypatch):
+    path = tmp_path / "gemini_quota.json"
+    monkeypatch.setattr(gemini_quota, "QUOTA_FILE", str(path))
+    return path
+
+
+def make_quota(rpd: int = 10, tpd: int = 10_000) -> GeminiQuota:
+    return GeminiQuota(rpm=0, tpm=0, rpd=rpd, tpd=tpd, timezone="Asia/Seoul")
+
+
+def usage(total: int) -> SimpleNamespace:
+    return SimpleNamespace(usage_metadata=SimpleNamespace(total_token_count=total, candidates_token_count=100))
+
+
+def test_requests_per_day_do_not_refill_within_the_day(quota_file):
+    quota = make_quota(rpd=10, tpd=0)
+
+    async def run():
+        allowed = 0
+        for _ in range(15):
+            try:
+                await quota.acquire("draft", 100)
+                allowed += 1
+            except QuotaExhaustedError:
+                pass
+        return allowed
+
+    assert asyncio.run(run()) == 10
+    assert quota.day_exhausted() == "requests"
+    assert not quota.has_headroom(100)
+
+
+def test_tokens_per_day_block_once_used_reaches_limit(quota_file):
+    quota = make_quota(rpd=0, tpd=1000)
+
+    async def run():
+        await quota.acquire("draft", 600)
+        await quota.settle("draft", 600, usage(700))
+        await quota.acquire("draft", 600)
+        await quota.settle("draft", 600, usage(400))
+        with pytest.raises(QuotaExhaustedError):
+            await quota.acquire("draft", 10)
+
+    asyncio.run(run())
+    assert json.loads(quota_file.read_text(encoding="utf-8"))["tokens"] == 1100
+
+
+def test_usage_survives_restart(quota_file):
+    quota = make_quota()
+
+    async def run():
+        await quota.acquire("draft", 1000)
+        await quota.settle("draft", 1000, usage(400))
+
+    asyncio.run(run())
+    data = json.loads(quota_file.read_text(encoding="utf-8"))
+    assert data["requests"] == 1
+    assert data["tokens"] == 400
+
+    quota_file.write_text(json.dumps({**data, "requests": 10}), encoding="utf-8")
+    restarted = make_quota()
+    assert restarted.day_exhausted() == "requests"
+    with pytest.raises(QuotaExhaustedError):
+        asyncio.run(restarted.acquire("draft", 100))
+
+
+def test_new_date_starts_from_zero(quota_file, monkeypatch):
+    quota_file.write_text(json.dumps({"date": "2000-01-01", "requests": 10, "tokens": 10_000}), encoding="utf-8")
+    quota = make_quota()
+    assert quota.day_exhausted() is None
+
+    asyncio.run(quota.acquire("draft", 100))
+    monkeypatch.setattr(quota, "_today", lambda: "2999-01-01")
+    assert quota.day_exhausted() is None
+    assert quota._usage == {"date": "2999-01-01", "requests": 0, "tokens": 0}
+
+
+def test_no_file_without_day_limits(quota_file):
+    quota = GeminiQuota(rpm=15, tpm=0, rpd=0, tpd=0, timezone="Asia/Seoul")
+    asyncio.run(quota.acquire("draft", 100))
+    assert not quota_file.exists()
@@ -0,0 +1,19 @@
+"""
+Inspiration Bot - Idea Generator Tests
+Budget fallback never sends a candidate that a remote check judged not novel
+"""
+from idea_generator import IdeaGenerator
+
+
+def rejected(title: str, stage: str) -> dict:
+    return {"idea": title, "title": title, "summary": title, "type": "software", "reason": "탈락", "stage": stage}
+
+
+def test_fallback_skips_candidates_judged_not_novel():
+    candidates = [rejected("A", "search"), rejected("B", "screen"), rejected("C", "semantic")]
+    assert IdeaGenerator._unverified_candidate(candidates) is None
+
+
+def test_fallback_uses_first_unverified_candidate():
+    candidates = [rejected("A", "search"), rejected("B", "budget"), rejected("C", "budget")]
+    assert IdeaGenerator._unverified_candidate(candidates)["title"] == "B"
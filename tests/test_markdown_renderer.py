@@ -0,0 +1,57 @@
+"""
+Inspiration Bot - Markdown Renderer Tests
+Paired emphasis becomes Telegram HTML, unpaired * and _ pass through as text
+"""
+from markdown_renderer import html_to_text, render_html, render_inline
+from message_chunker import MAX_MESSAGE_UTF16, split_message, utf16_len
+
+
+def test_paired_emphasis_and_code():
+    assert render_inline("**굵게** *굵게* __굵게__ _기울임_ ~~취소~~") == (
+        "<b>굵게</b> <b>굵게</b> <b>굵게</b> <i>기울임</i> <s>취소</s>"
+    )
+    assert render_inline("`a<b && *c*`") == "<code>a&lt;b &amp;&amp; *c*</code>"
+
+
+def test_unpaired_markers_pass_through():
+    assert render_inline("*별표 하나로 시작") == "*별표 하나로 시작"
+    assert render_inline("2*3 = 6") == "2*3 = 6"
+    assert render_inline("a * b * c") == "a * b * c"
+    assert render_inline("snake_case_name") == "snake_case_name"
+    assert render_inline("_밑줄 하나") == "_밑줄 하나"
+
+
+def test_html_is_escaped():
+    assert render_inline("<script> & 'q'") == "&lt;script&gt; &amp; 'q'"
+
+
+def test_links_headings_bullets_and_rules():
+    text = "# 제목 **강조**\n* 항목 [링크](https://example.com/a?b=1&c=2)\n---"
+    assert render_html(text).split("\n") == [
+        "<b>제목 강조</b>",
+        '• 항목 <a href="https://example.com/a?b=1&amp;c=2">링크</a>',
+        "━━━━━━━━━━━━━━━",
+    ]
+
+
+def test_code_fence_keeps_markers_literal():
+    rendered = render_html("```python\nx = a*b_c\n```")
+    assert rendered == '<pre><code class="language-python">x = a*b_c</code></pre>'
+
+
+def test_unclosed_fence_is_plain_text():
+    assert render_html("```\n*굵게*") == "```\n<b>굵게</b>"
+
+
+def test_html_to_text_round_trip():
+    assert html_to_text(render_html("**굵게** a<b & _기울임_")) == "굵게 a<b & 기울임"
+
+
+def test_long_rendered_message_splits_within_limit():
+    paragraph = "**굵은 제목** 설명 _기울임_ 😀 " * 40
+    rendered = render_html("\n\n".join([paragraph] * 20))
+    chunks = split_message(rendered, "HTML")
+
+    assert len(chunks) > 1
+    assert all(utf16_len(html_to_text(chunk)) <= MAX_MESSAGE_UTF16 for chunk in chunks)
+    assert all(chunk.count("<b>") == chunk.count("</b>") for chunk in chunks)
@@ -0,0 +1,92 @@
+"""
+Inspiration Bot - Message Chunker Tests
+Telegram 4096 UTF-16 limit, surrogate pairs, entities reopened across chunk boundaries
+"""
+import re
+
+from markdown_renderer import html_to_text
+from message_chunker import MAX_MESSAGE_UTF16, split_message, utf16_len
+
+TAG = re.compile(r"</?([a-z]+)[^>]*>")
+
+
+def balanced(chunk: str) -> bool:
+    """HTML 청크의 태그가 모두 짝이 맞는지"""
+    stack = []
+    for match in TAG.finditer(chunk):
+        if match.group(0).startswith("</"):
+            if not stack or stack.pop() != match.group(1):
+                return False
+        else:
+            stack.append(match.group(1))
+    return not stack
+
+
+def test_short_message_is_not_split():
+    assert split_message("  짧은 메시지 😀  ") == ["짧은 메시지 😀"]
+
+
+def test_surrogate_pairs_count_as_two_units():
+    # 이모지는 UTF-16 2유닛이라 글자 수로는 한도 안이어도 나눠야 함
+    text = " ".join(["😀👍🏽가나"] * 2000)
+    assert len(text) < 3 * MAX_MESSAGE_UTF16 and utf16_len(text) > 2 * MAX_MESSAGE_UTF16
+
+    chunks = split_message(text)
+
+    assert len(chunks) > 2
+    assert all(utf16_len(chunk) <= MAX_MESSAGE_UTF16 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_exact_limit_is_one_chunk_and_one_more_unit_splits():
+    text = "😀" * (MAX_MESSAGE_UTF16 // 2)
+    assert split_message(text) == [text]
+    assert len(split_message(text + " 가")) == 2
+
+
+def test_long_word_without_spaces_is_hard_split_at_code_points():
+    text = "😀" * 5000
+    chunks = split_message(text)
+
+    assert all(utf16_len(chunk) <= MAX_MESSAGE_UTF16 for chunk in chunks)
+    assert "".join(chunks) == text
+
+
+def test_html_entities_close_and_reopen_across_chunks():
+    text = "<b>a <i>" + "굵은 기울임😀 " * 1500 + "</i></b> 끝"
+    chunks = split_message(text, "HTML")
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert balanced(chunk)
+        assert utf16_len(html_to_text(chunk)) <= MAX_MESSAGE_UTF16
+    assert all(chunk.startswith("<b><i>") for chunk in chunks[1:])
+    assert chunks[-1].endswith("</i></b> 끝")
+
+
+def test_html_pre_block_is_reopened_and_keeps_lines():
+    lines = [f"line {i} 😀" for i in range(1500)]
+    chunks = split_message("<pre>" + "\n".join(lines) + "</pre>", "HTML")
+
+    assert len(chunks) > 1
+    assert all(chunk.startswith("<pre>") and chunk.endswith("</pre>") for chunk in chunks)
+    body = "".join(chunk[len("<pre>"):-len("</pre>")] for chunk in chunks)
+    assert body.split("\n") == lines
+
+
+def test_markdown_entity_reopened_across_chunks():
+    text = "*" + " ".join(["굵게"] * 3000) + "*"
+    chunks = split_message(text, "Markdown")
+
+    assert len(chunks) > 1
+    assert all(chunk.startswith("*") and chunk.endswith("*") for chunk in chunks)
+    # 표기(*)를 뺀 실제 표시 길이 기준
+    assert all(utf16_len(chunk) - 2 <= MAX_MESSAGE_UTF16 for chunk in chunks)
+
+
+def test_paragraph_boundary_preferred():
+    first = ("첫 문단 " * 300).strip()
+    second = ("둘째 문단 " * 300).strip()
+    chunks = split_message(f"{first}\n\n{second}\n\n{second}")
+
+    assert chunks == [f"{first}\n\n{second}", second]
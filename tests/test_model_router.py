@@ -0,0 +1,129 @@
+"""
+Inspiration Bot - Model Router Tests
+Circuit breaker state transitions and fallback chain eligibility
+"""
+import asyncio
+
+import pytest
+
+import model_router
+from model_router import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ModelRouter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class StatusError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"{code}")
+        self.code = code
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(model_router.time, "monotonic", fake)
+    return fake
+
+
+def trip(breaker: CircuitBreaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.begin()
+        breaker.record_failure(StatusError(503))
+    assert breaker.state == OPEN
+
+
+def test_opens_after_consecutive_transient_failures(clock):
+    breaker = CircuitBreaker("main", failure_threshold=3, reset_seconds=60)
+    for _ in range(2):
+        breaker.begin()
+        breaker.record_failure(asyncio.TimeoutError())
+    assert breaker.state == CLOSED
+    breaker.begin()
+    breaker.record_failure(StatusError(429))
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    assert not breaker.begin()
+
+
+def test_non_transient_failure_does_not_count(clock):
+    breaker = CircuitBreaker("main", failure_threshold=1, reset_seconds=60)
+    breaker.begin()
+    breaker.record_failure(StatusError(400))
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_half_open_trial_success_closes(clock):
+    breaker = CircuitBreaker("main", failure_threshold=2, reset_seconds=60)
+    trip(breaker)
+    clock.now += 60
+    assert breaker.available()
+    assert breaker.begin()
+    assert breaker.state == HALF_OPEN
+    # 시험 요청은 1건만
+    assert not breaker.available()
+    assert not breaker.begin()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+    assert breaker.begin()
+
+
+def test_half_open_trial_failure_reopens(clock):
+    breaker = CircuitBreaker("main", failure_threshold=2, reset_seconds=60)
+    trip(breaker)
+    clock.now += 60
+    assert breaker.begin()
+    breaker.record_failure(StatusError(503))
+    assert breaker.state == OPEN
+    assert not breaker.available()
+    clock.now += 60
+    assert breaker.begin()
+    assert breaker.state == HALF_OPEN
+
+
+def test_released_trial_can_be_retried(clock):
+    breaker = CircuitBreaker("main", failure_threshold=1, reset_seconds=60)
+    trip(breaker)
+    clock.now += 60
+    assert breaker.begin()
+    breaker.release()
+    assert breaker.state == HALF_OPEN
+    assert breaker.available()
+    assert breaker.begin()
+
+
+def test_chain_does_not_consume_half_open_trials(clock):
+    router = ModelRouter(["lite-a", "lite-b"], failure_threshold=1, reset_seconds=60,
+                         hedge_percentile=0.95, hedge_min_samples=20)
+    for model in ("main", "lite-a", "lite-b"):
+        trip(router.breaker(model))
+    assert router.chain("main") == []
+
+    clock.now += 60
+    assert router.chain("main") == ["main", "lite-a", "lite-b"]
+    # 실제로 요청한 main만 시험 요청 자리를 차지
+    assert router.begin("main")
+    router.record_success("main", "generate", 0.5)
+    assert router.chain("main") == ["main", "lite-a", "lite-b"]
+
+    router.record_failure("main", StatusError(503))
+    assert router.chain("main") == ["lite-a", "lite-b"]
+    assert router.begin("lite-a")
+    assert router.breaker("lite-a").state == HALF_OPEN
+    assert router.chain("main") == ["lite-b"]
+
+
+def test_hedge_delay_needs_min_samples(clock):
+    router = ModelRouter([], failure_threshold=1, reset_seconds=60, hedge_percentile=0.5, hedge_min_samples=3)
+    router.record_success("main", "generate", 1.0)
+    router.record_success("main", "generate", 2.0)
+    assert router.hedge_delay("generate") is None
+    router.record_success("main", "generate", 3.0)
+    assert router.hedge_delay("generate") == 2.0
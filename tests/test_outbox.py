@@ -0,0 +1,60 @@
+"""
+Inspiration Bot - Outbox Tests
+Idempotency per send event and chat, per-event results, schema migration
+"""
+import sqlite3
+
+from outbox import DEAD, PENDING, SENT, Outbox
+
+
+def test_same_event_is_enqueued_once_per_chat_even_with_new_text(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    first = outbox.enqueue("daily:2026-10-17", "1", "첫 아이디어", "Markdown")
+    again = outbox.enqueue("daily:2026-10-17", "1", "다시 생성된 아이디어", "Markdown")
+
+    assert first == again
+    assert outbox.pending_count() == 1
+    assert outbox.due()[0]["text"] == "첫 아이디어"
+    assert outbox.has_event("daily:2026-10-17")
+    assert not outbox.has_event("daily:2026-10-18")
+
+
+def test_next_day_with_same_text_is_a_new_message(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    outbox.enqueue("daily:2026-10-17", "1", "같은 문구", None)
+    outbox.mark_sent(outbox.due()[0]["id"])
+    outbox.enqueue("daily:2026-10-18", "1", "같은 문구", None)
+
+    assert outbox.pending_count() == 1
+
+
+def test_event_results_per_chat(tmp_path):
+    outbox = Outbox(tmp_path / "outbox.db")
+    for chat_id in ("1", "2", "3"):
+        outbox.enqueue("daily:2026-10-17", chat_id, "아이디어", None)
+    rows = {row["chat_id"]: row["id"] for row in outbox.due()}
+    outbox.mark_sent(rows["1"])
+    outbox.mark_dead(rows["2"], "Forbidden: bot was blocked by the user")
+
+    results = {r["chat_id"]: r for r in outbox.event_results("daily:2026-10-17")}
+    assert [results[c]["status"] for c in ("1", "2", "3")] == [SENT, DEAD, PENDING]
+    assert results["2"]["last_error"].startswith("Forbidden")
+
+
+def test_migrates_files_without_progress_and_event_columns(tmp_path):
+    path = tmp_path / "outbox.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, idempotency_key TEXT NOT NULL UNIQUE, "
+        "chat_id TEXT NOT NULL, text TEXT NOT NULL, parse_mode TEXT, status TEXT NOT NULL DEFAULT 'pending', "
+        "attempts INTEGER NOT NULL DEFAULT 0, next_attempt_at REAL NOT NULL, last_error TEXT, "
+        "created_at REAL NOT NULL, sent_at REAL)"
+    )
+    conn.commit()
+    conn.close()
+
+    outbox = Outbox(path)
+    outbox.enqueue("daily:2026-10-17", "1", "아이디어", None)
+    outbox.mark_progress(outbox.due()[0]["id"], 2)
+    assert outbox.due()[0]["chunks_sent"] == 2
+    assert outbox.event_results("daily:2026-10-17")[0]["chat_id"] == "1"
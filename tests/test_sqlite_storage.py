@@ -0,0 +1,34 @@
+"""
+Inspiration Bot - SQLite Storage Tests
+History backend implements the shared interface and keeps the newest entries
+"""
+from config import settings
+from idea_history import HistoryStore, IdeaHistory
+from sqlite_storage import SQLiteDatabase, SQLiteIdeaHistory
+
+
+def test_sqlite_history_does_not_inherit_file_internals(tmp_path):
+    history = SQLiteIdeaHistory(SQLiteDatabase(tmp_path / "ideas.db"))
+
+    assert isinstance(history, HistoryStore)
+    assert not isinstance(history, IdeaHistory)
+    assert not hasattr(history, "_compact")
+    assert history.get_next_type() == "software"
+
+
+def test_recent_titles_and_retention(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "history_max_items", 3)
+    history = SQLiteIdeaHistory(SQLiteDatabase(tmp_path / "ideas.db"))
+    for i in range(5):
+        history.record_idea(f"아이디어 {i}", "software")
+
+    assert history.get_recent_titles(limit=2) == ["아이디어 3", "아이디어 4"]
+    assert history.get_recent_titles() == ["아이디어 2", "아이디어 3", "아이디어 4"]
+    assert history.is_duplicate("아이디어 4")
+    assert not history.is_duplicate("아이디어 0")
+
+
+def test_history_date_index_is_used(tmp_path):
+    db = SQLiteDatabase(tmp_path / "ideas.db")
+    plan = db.query("EXPLAIN QUERY PLAN SELECT title FROM history ORDER BY created_at DESC, id DESC LIMIT 5")
+    assert any("idx_history_created_at" in row["detail"] for row in plan)
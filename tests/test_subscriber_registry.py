@@ -0,0 +1,53 @@
+"""
+Inspiration Bot - Subscriber Registry Tests
+Chats configured in settings follow the settings; manually added chats stay
+"""
+import json
+
+import pytest
+
+import subscriber_registry
+from config import settings
+from subscriber_registry import SubscriberRegistry
+
+
+@pytest.fixture
+def subscribers_file(tmp_path, monkeypatch):
+    path = tmp_path / "subscribers.json"
+    monkeypatch.setattr(subscriber_registry, "SUBSCRIBERS_FILE", str(path))
+    monkeypatch.setattr(settings, "telegram_chat_id", "111")
+    monkeypatch.setattr(settings, "telegram_subscriber_chat_ids", "-100222")
+    return path
+
+
+def chat_ids(registry: SubscriberRegistry) -> set:
+    return {s["chat_id"] for s in registry.get_subscribers()}
+
+
+def test_changed_chat_id_drops_the_old_chat(subscribers_file, monkeypatch):
+    assert chat_ids(SubscriberRegistry()) == {"111", "-100222"}
+
+    monkeypatch.setattr(settings, "telegram_chat_id", "333")
+    monkeypatch.setattr(settings, "telegram_subscriber_chat_ids", "")
+    registry = SubscriberRegistry()
+
+    assert chat_ids(registry) == {"333"}
+    saved = json.loads(subscribers_file.read_text(encoding="utf-8"))
+    assert [s["chat_id"] for s in saved["subscribers"]] == ["333"]
+
+
+def test_manually_added_chat_is_kept(subscribers_file, monkeypatch):
+    registry = SubscriberRegistry()
+    assert registry.add("444")
+
+    monkeypatch.setattr(settings, "telegram_subscriber_chat_ids", "")
+    assert chat_ids(SubscriberRegistry()) == {"111", "444"}
+
+
+def test_entries_without_source_came_from_settings(subscribers_file):
+    subscribers_file.write_text(json.dumps({"subscribers": [
+        {"chat_id": "111", "kind": "private"},
+        {"chat_id": "0", "kind": "private"},
+    ]}), encoding="utf-8")
+
+    assert chat_ids(SubscriberRegistry()) == {"111", "-100222"}
@@ -0,0 +1,33 @@
+"""
+Inspiration Bot - Transport Tests
+Replay mode keeps every data file out of the bot directory
+"""
+from pathlib import Path
+
+import transport
+from config import settings
+from transport import close_cassette, data_path
+
+ROOT = Path(transport.__file__).parent
+
+
+def test_live_mode_uses_bot_directory(monkeypatch):
+    monkeypatch.setattr(settings, "transport_mode", "live")
+    assert data_path("idea_summaries.txt") == ROOT / "idea_summaries.txt"
+
+
+def test_replay_mode_uses_seeded_temporary_copies(monkeypatch):
+    monkeypatch.setattr(settings, "transport_mode", "replay")
+    try:
+        summaries = data_path("idea_summaries.txt")
+        budget = data_path("gemini_budget.json", seed=False)
+
+        assert summaries.parent != ROOT and budget.parent == summaries.parent
+        assert summaries.read_bytes() == (ROOT / "idea_summaries.txt").read_bytes()
+        assert not budget.exists()
+
+        summaries.write_text("replayed\n", encoding="utf-8")
+        assert (ROOT / "idea_summaries.txt").read_text(encoding="utf-8") != "replayed\n"
+    finally:
+        close_cassette()
+    assert not summaries.parent.exists()
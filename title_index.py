@@ -0,0 +1,106 @@
+"""
+Inspiration Bot - Title Similarity Index
+Character bigram inverted index for fast near-duplicate title lookup
+"""
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set
+
+# 기존 _is_too_similar와 동일한 기준
+SIMILARITY_THRESHOLD = 0.82
+NGRAM_SIZE = 2
+
+
+def normalize_title(value: str) -> str:
+    """공백/특수문자를 제거한 소문자 제목"""
+    cleaned = re.sub(r"\s+", "", value.lower())
+    return re.sub(r"[^\w가-힣]", "", cleaned)
+
+
+def title_similarity(norm_a: str, norm_b: str) -> float:
+    """정규화된 두 제목의 SequenceMatcher 유사도"""
+    if norm_a == norm_b:
+        return 1.0
+    return SequenceMatcher(None, norm_a, norm_b).ratio()
+
+
+def _ngrams(norm: str) -> Set[str]:
+    return {norm[i:i + NGRAM_SIZE] for i in range(len(norm) - NGRAM_SIZE + 1)}
+
+
+class TitleIndex:
+    """
+    제목 근접 중복 검색용 인덱스 (증분 추가)
+
+    정규화 제목의 문자 bigram 역색인으로 후보를 추린 뒤,
+    길이 상한 -> quick_ratio 상한 -> 정확한 ratio 순으로 검사합니다.
+    """
+
+    def __init__(self, threshold: float = SIMILARITY_THRESHOLD):
+        self.threshold = threshold
+        self._titles: List[str] = []
+        self._norms: List[str] = []
+        self._by_norm: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        # bigram이 없는 1글자 제목은 별도 보관
+        self._short_ids: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __contains__(self, title: str) -> bool:
+        return normalize_title(title) in self._by_norm
+
+    def add(self, title: str) -> bool:
+        """제목 추가 (이미 있거나 비어 있으면 False)"""
+        norm = normalize_title(title)
+        if not norm or norm in self._by_norm:
+            return False
+
+        doc_id = len(self._titles)
+        self._titles.append(title)
+        self._norms.append(norm)
+        self._by_norm[norm] = doc_id
+
+        grams = _ngrams(norm)
+        if not grams:
+            self._short_ids.append(doc_id)
+        for gram in grams:
+            self._postings.setdefault(gram, []).append(doc_id)
+        return True
+
+    def add_many(self, titles: Iterable[str]) -> int:
+        return sum(1 for title in titles if self.add(title))
+
+    def find_similar(self, title: str) -> Optional[str]:
+        """
+        threshold 이상으로 유사한 기존 제목을 반환 (없으면 None)
+        """
+        norm = normalize_title(title)
+        if not norm:
+            return None
+
+        exact = self._by_norm.get(norm)
+        if exact is not None:
+            return self._titles[exact]
+
+        shared: Counter = Counter()
+        for gram in _ngrams(norm):
+            for doc_id in self._postings.get(gram, ()):
+                shared[doc_id] += 1
+        shortlist = [doc_id for doc_id, _ in shared.most_common()] + self._short_ids
+
+        len_a = len(norm)
+        for doc_id in shortlist:
+            other = self._norms[doc_id]
+            len_b = len(other)
+            # ratio = 2M / (len_a + len_b) 이므로 길이 차이만으로 상한 계산 가능
+            if 2.0 * min(len_a, len_b) / (len_a + len_b) < self.threshold:
+                continue
+            matcher = SequenceMatcher(None, norm, other)
+            if matcher.quick_ratio() < self.threshold:
+                continue
+            if matcher.ratio() >= self.threshold:
+                return self._titles[doc_id]
+        return None
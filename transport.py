@@ -0,0 +1,288 @@
+"""
+Inspiration Bot - Record/Replay Transport
+Records Gemini and Telegram request/response pairs to a JSONL cassette and replays them offline
+"""
+import asyncio
+import atexit
+import gzip
+import hashlib
+import json
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config import settings
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+MODES = (LIVE, RECORD, REPLAY)
+
+# Gemini usage_metadata 중 기록할 필드
+USAGE_FIELDS = ("prompt_token_count", "candidates_token_count", "total_token_count")
+
+
+class ReplayMissError(RuntimeError):
+    """재생할 기록이 더 이상 없음 (기록 당시보다 호출이 많음)"""
+
+
+class ReplayedError(Exception):
+    """기록된 예외를 재현 (code/message 유지)"""
+
+    def __init__(self, type_name: str, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.type_name = type_name
+        self.code = code
+
+
+def request_key(request: Dict) -> str:
+    """요청 내용 해시 (재생 시 같은 요청의 기록을 우선 매칭)"""
+    raw = json.dumps(request, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def describe_error(error: Exception) -> Dict:
+    code = getattr(error, "code", None)
+    return {
+        "type": type(error).__name__,
+        "message": str(error),
+        "code": code if isinstance(code, int) else None,
+    }
+
+
+def rebuild_error(data: Dict) -> Exception:
+    """기록된 예외 정보 -> 예외 (타임아웃은 asyncio.TimeoutError로)"""
+    if data["type"] == "TimeoutError":
+        return asyncio.TimeoutError()
+    return ReplayedError(data["type"], data["message"], data.get("code"))
+
+
+class Cassette:
+    """
+    기록 파일 (한 줄에 요청/응답 1쌍, 이름이 .gz로 끝나면 gzip)
+
+    - record: 호출이 끝날 때마다 한 줄씩 추가 (재시작해도 이어서 기록)
+    - replay: 채널/종류별로 기록 순서대로 꺼내되, 같은 요청 해시가 있으면 그 기록을 우선
+    """
+
+    def __init__(self, path: Path, mode: str):
+        self.path = path
+        self.mode = mode
+        self._lock = threading.Lock()
+        self._file = None
+        self._queues: Dict[Tuple[str, str], List[Dict]] = {}
+        if mode == RECORD:
+            self._file = self._open("at")
+        elif mode == REPLAY:
+            self._load()
+
+    def _open(self, file_mode: str):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, file_mode, encoding="utf-8")
+        return open(self.path, file_mode, encoding="utf-8")
+
+    def _load(self):
+        if not self.path.exists():
+            logger.error(f"❌ 재생할 기록 파일 없음: {self.path}")
+            return
+        count = 0
+        with self._open("rt") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                self._queues.setdefault((entry["ch"], entry["kind"]), []).append(entry)
+                count += 1
+        logger.info(f"📼 기록 {count}건 로드: {self.path.name}")
+
+    def append(self, entry: Dict):
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def take(self, channel: str, kind: str, key: str) -> Optional[Dict]:
+        with self._lock:
+            queue = self._queues.get((channel, kind))
+            if not queue:
+                return None
+            for index, entry in enumerate(queue):
+                if entry["key"] == key:
+                    return queue.pop(index)
+            # 프롬프트가 달라졌으면 (날짜/무작위 타겟 등) 기록 순서대로 사용
+            return queue.pop(0)
+
+    def remaining(self) -> int:
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Transport:
+    """
+    외부 호출 1종(채널)을 감싸는 기록/재생 계층
+
+    live는 그대로 호출, record는 호출 결과(또는 예외)와 지연 시간을 기록,
+    replay는 네트워크 없이 기록된 결과를 돌려주고 기록된 지연을 replay_speed 배속으로 재현합니다.
+    """
+
+    def __init__(self, channel: str, mode: str, cassette: Optional[Cassette], speed: float):
+        self.channel = channel
+        self.mode = mode
+        self.cassette = cassette
+        self.speed = speed
+
+    async def call(
+        self,
+        kind: str,
+        request: Dict,
+        send: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Dict],
+        decode: Callable[[Dict], Any],
+        stored: Optional[Dict] = None,
+        encode_error: Callable[[Exception], Dict] = describe_error,
+        rebuild: Callable[[Dict], Exception] = rebuild_error,
+    ) -> Any:
+        """
+        Args:
+            kind: 호출 종류 (예: generate, validate, send)
+            request: 요청 해시를 만들 내용
+            send: 실제 호출 (live/record에서만 실행)
+            encode / decode: 응답 <-> 기록용 dict
+            stored: 기록 파일에 남길 요청 정보 (기본: request 전체)
+        """
+        if self.mode == LIVE:
+            return await send()
+
+        key = request_key(request)
+        if self.mode == REPLAY:
+            return await self._replay(kind, key, decode, rebuild)
+
+        started = time.perf_counter()
+        entry = {"ch": self.channel, "kind": kind, "key": key, "req": request if stored is None else stored}
+        try:
+            result = await send()
+        except Exception as e:
+            entry.update(ms=round((time.perf_counter() - started) * 1000, 1), error=encode_error(e))
+            await asyncio.to_thread(self.cassette.append, entry)
+            raise
+        entry.update(ms=round((time.perf_counter() - started) * 1000, 1), res=encode(result))
+        await asyncio.to_thread(self.cassette.append, entry)
+        return result
+
+    async def _replay(self, kind: str, key: str, decode, rebuild) -> Any:
+        entry = self.cassette.take(self.channel, kind, key) if self.cassette else None
+        if entry is None:
+            raise ReplayMissError(f"재생할 {self.channel}/{kind} 기록이 없습니다")
+        if self.speed > 0:
+            await asyncio.sleep(entry["ms"] / 1000 / self.speed)
+        if "error" in entry:
+            raise rebuild(entry["error"])
+        return decode(entry["res"])
+
+
+# 프로세스 안의 Gemini/Telegram 채널이 같은 기록 파일을 공유
+_cassette: Optional[Cassette] = None
+# 재생 모드 데이터 파일 디렉터리 (실행마다 새 임시 디렉터리)
+_replay_dir: Optional[Path] = None
+
+
+def transport_mode() -> str:
+    mode = settings.transport_mode.lower()
+    return mode if mode in MODES else LIVE
+
+
+def data_path(name: str, seed: bool = True) -> Path:
+    """
+    봇 데이터 파일 경로 (기록/캐시/대기열/예산 등)
+
+    재생 모드는 봇 디렉터리 대신 실행마다 새 임시 디렉터리를 쓰므로, 재생한 아이디어나
+    호출 수가 실제 데이터에 남지 않습니다. seed=True면 처음 접근할 때 실제 파일을 복사해
+    기존 기록 기준으로 중복 검사가 동작하고, seed=False(대기열, 예산)는 빈 상태로 시작합니다.
+    """
+    global _replay_dir
+    base = Path(__file__).parent
+    if transport_mode() != REPLAY:
+        return base / name
+    if _replay_dir is None:
+        _replay_dir = Path(tempfile.mkdtemp(prefix="inspiration_replay_"))
+        # 정상 종료(close_cassette)를 거치지 않아도 지워지도록
+        atexit.register(shutil.rmtree, _replay_dir, True)
+        logger.info(f"📼 재생 모드 데이터 디렉터리: {_replay_dir}")
+    target = _replay_dir / name
+    if seed and not target.exists():
+        for suffix in ("", "-wal"):
+            source = base / f"{name}{suffix}"
+            if source.is_file():
+                shutil.copy2(source, _replay_dir / f"{name}{suffix}")
+    return target
+
+
+def open_transport(channel: str) -> Transport:
+    """설정(TRANSPORT_MODE, CASSETTE_PATH, REPLAY_SPEED)에 맞는 채널 Transport"""
+    global _cassette
+    mode = transport_mode()
+    if mode != settings.transport_mode.lower():
+        logger.warning(f"⚠️ 알 수 없는 TRANSPORT_MODE '{settings.transport_mode}', live로 동작")
+    if mode != LIVE and _cassette is None:
+        _cassette = Cassette(Path(__file__).parent / settings.cassette_path, mode)
+        logger.info(f"📼 외부 호출 {mode} 모드: {settings.cassette_path}")
+    return Transport(channel, mode, _cassette, settings.replay_speed)
+
+
+def close_cassette():
+    """기록 파일을 닫고, 재생 모드 임시 데이터 디렉터리를 지움"""
+    global _cassette, _replay_dir
+    if _cassette is not None:
+        if _cassette.mode == REPLAY and _cassette.remaining():
+            logger.info(f"📼 재생되지 않은 기록 {_cassette.remaining()}건")
+        _cassette.close()
+        _cassette = None
+    if _replay_dir is not None:
+        shutil.rmtree(_replay_dir, ignore_errors=True)
+        _replay_dir = None
+
+
+# --- Gemini 응답 변환 (SDK 타입을 import하지 않고 속성만 사용) ---
+
+def gemini_request(contents: str, config) -> Dict:
+    """기록/매칭용 Gemini 요청 (모델은 404 전환으로 바뀔 수 있어 제외)"""
+    schema = getattr(config, "response_schema", None)
+    return {
+        "contents": contents,
+        "temperature": getattr(config, "temperature", None),
+        "mime": getattr(config, "response_mime_type", None),
+        "schema": getattr(schema, "__name__", None) or (str(schema) if schema is not None else None),
+        "search": bool(getattr(config, "tools", None)),
+    }
+
+
+def encode_gemini(response) -> Dict:
+    usage = getattr(response, "usage_metadata", None)
+    return {
+        "text": response.text,
+        "usage": {field: getattr(usage, field, None) for field in USAGE_FIELDS} if usage else None,
+    }
+
+
+def decode_gemini(data: Dict):
+    """재생 응답 (parsed는 없으므로 호출부가 text를 스키마로 검증)"""
+    usage = data.get("usage")
+    return SimpleNamespace(
+        text=data["text"],
+        parsed=None,
+        usage_metadata=SimpleNamespace(**usage) if usage else None,
+    )